@@ -0,0 +1,117 @@
+"""
+Decoding throughput of each `decode` mode, in rows per second.
+
+Decodes a synthetic `GET /sheet/{sheet}` page (shaped like a full `Item` row, related rows included) with every installed JSON
+library and turns it into models with each mode. No network access is needed.
+
+    python benchmarks/bench_decode.py --rows 500 --repeat 20
+"""
+import argparse
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+from pyxivapi.lib.models import SheetResponse
+from pyxivapi.lib.rows import Row
+from pyxivapi.utils import decode
+
+class BenchCategory(Row, sheet="ItemUICategory"):
+    Name: str
+
+class BenchItem(Row, sheet="Item"):
+    """Typed row for the `typed` mode, which is sent only these fields (as selected by `BenchItem.projection()`)."""
+    Name: str
+    LevelEquip: int
+    Icon: Dict[str, Any]
+    ItemUICategory: Optional[BenchCategory]
+
+def related(sheet: str, row_id: int) -> Dict[str, Any]:
+    return { "value": row_id, "sheet": sheet, "row_id": row_id, "fields": { "Name": f"{sheet} {row_id}", "Icon": { "id": row_id, "path": f"ui/icon/{row_id:06}.tex" } } }
+
+def payload(rows: int) -> bytes:
+    data = {
+        "schema": "exdschema@2:rev:latest",
+        "rows": [
+            {
+                "row_id": i,
+                "fields": {
+                    "Name": f"Item {i}", "Singular": f"item {i}", "Plural": f"items {i}", "Description": "An item. " * 8,
+                    "Icon": { "id": i, "path": f"ui/icon/{i:06}.tex", "path_hr1": f"ui/icon/{i:06}_hr1.tex" },
+                    "LevelItem": related("ItemLevel", i % 700), "LevelEquip": i % 100, "Rarity": i % 4,
+                    "ItemUICategory": related("ItemUICategory", i % 100), "ClassJobCategory": related("ClassJobCategory", i % 200),
+                    "BaseParam": [related("BaseParam", j) for j in range(6)], "BaseParamValue": list(range(6)),
+                    "PriceMid": i * 3, "PriceLow": i, "IsUntradable": bool(i % 2), "IsUnique": False, "StackSize": 999,
+                },
+            }
+            for i in range(rows)
+        ],
+    }
+    return json.dumps(data).encode()
+
+def project(fields: Dict[str, Any], row: Type[Row]) -> Dict[str, Any]:
+    """Fields of a row as the API returns them when only those of `row` are selected."""
+    links = row.links()
+    projected = {}
+    for column in row.columns:
+        value = fields[column]
+        if column in links:
+            value = { **value, "fields": project(value["fields"], links[column][0]) }
+        projected[column] = value
+    return projected
+
+def typed_payload(rows: int) -> bytes:
+    """`payload` as returned for `BenchItem` rows."""
+    data = json.loads(payload(rows))
+    for row in data["rows"]:
+        row["fields"] = project(row["fields"], BenchItem)
+    return json.dumps(data).encode()
+
+def loaders() -> List[Tuple[str, Callable[[bytes], Any]]]:
+    found: List[Tuple[str, Callable[[bytes], Any]]] = [("json", json.loads)]
+    try:
+        import orjson
+        found.append(("orjson", orjson.loads))
+    except ImportError:
+        pass
+    try:
+        import msgspec
+        found.append(("msgspec", msgspec.json.decode))
+    except ImportError:
+        pass
+    return found
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500, help="rows per page")
+    parser.add_argument("--repeat", type=int, default=20, help="pages decoded per measurement")
+    args = parser.parse_args()
+
+    body = payload(args.rows)
+    print(f"page: {args.rows} rows, {len(body) / 1024:.0f} KiB")
+    print(f"{'loader':<10}{'mode':<12}{'decode rows/sec':>18}{'+ read rows/sec':>18}")
+    for name, loads in loaders():
+        for mode in ("validated", "lazy", "raw"):
+            options = { "decode": mode }
+            results = []
+            # Measured once decoding only, then reading every row as well (which is when lazy models validate)
+            for read in (False, True):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    page = decode(SheetResponse, loads(body), options)
+                    if read:
+                        for _ in (page["rows"] if mode == "raw" else page.rows):
+                            pass
+                results.append(args.rows * args.repeat / (time.perf_counter() - start))
+            print(f"{name:<10}{mode:<12}{results[0]:>18,.0f}{results[1]:>18,.0f}")
+
+        # Typed rows are decoded straight from the (smaller) projected page, and are fully read once decoded
+        typed = typed_payload(args.rows)
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            rows = [BenchItem.from_row(row) for row in loads(typed)["rows"]]
+        result = args.rows * args.repeat / (time.perf_counter() - start)
+        print(f"{name:<10}{'typed':<12}{result:>18,.0f}{result:>18,.0f}")
+    print(f"typed page: {len(typed_payload(args.rows)) / 1024:.0f} KiB")
+
+if __name__ == "__main__":
+    main()
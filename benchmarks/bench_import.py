@@ -0,0 +1,55 @@
+"""
+Import and client construction time, as paid by short-lived processes (CLI runs, serverless functions).
+
+Each step is timed in a fresh interpreter, since modules are only imported once per process. No network access is needed.
+
+    python benchmarks/bench_import.py --repeat 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from typing import Dict, List
+
+STEPS = """
+import time
+timings = {}
+start = time.perf_counter()
+import pyxivapi
+timings["import pyxivapi"] = time.perf_counter() - start
+start = time.perf_counter()
+from pyxivapi import XIVAPI
+timings["from pyxivapi import XIVAPI"] = time.perf_counter() - start
+start = time.perf_counter()
+client = XIVAPI()
+timings["first XIVAPI()"] = time.perf_counter() - start
+start = time.perf_counter()
+for _ in range(100):
+    XIVAPI()
+timings["later XIVAPI()"] = (time.perf_counter() - start) / 100
+start = time.perf_counter()
+client.items, client.sheet("Action"), client.sheets()
+timings["first endpoint access"] = time.perf_counter() - start
+print(json.dumps(timings))
+"""
+
+def measure(repeat: int) -> Dict[str, List[float]]:
+    runs: Dict[str, List[float]] = {}
+    for _ in range(repeat):
+        output = subprocess.check_output([sys.executable, "-W", "ignore", "-c", f"import json\n{STEPS}"], text=True)
+        for step, seconds in json.loads(output).items():
+            runs.setdefault(step, []).append(seconds)
+    return runs
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="fresh interpreters to time the steps in")
+    args = parser.parse_args()
+
+    print(f"{'step':<30}{'median ms':>12}{'min ms':>12}")
+    for step, timings in measure(args.repeat).items():
+        print(f"{step:<30}{statistics.median(timings) * 1000:>12.2f}{min(timings) * 1000:>12.2f}")
+
+if __name__ == "__main__":
+    main()
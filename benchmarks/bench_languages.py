@@ -0,0 +1,60 @@
+"""
+Memory held by a sheet in every language, as one copy per language versus merged `MultilingualRow`s.
+
+Uses the synthetic `Item` page of `bench_decode`, with its strings translated per language. No network access is needed.
+
+    python benchmarks/bench_languages.py --rows 2000
+"""
+import argparse
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+from bench_decode import payload
+from pyxivapi.lib.languages import LANGUAGES, combine
+from pyxivapi.lib.models import RowResult
+
+def translated(value: Any, language: str) -> Any:
+    if isinstance(value, str) and not value.startswith("ui/"):
+        return f"{value} [{language}]"
+    if isinstance(value, dict):
+        return { key: translated(item, language) for key, item in value.items() }
+    if isinstance(value, list):
+        return [translated(item, language) for item in value]
+    return value
+
+def pages(rows: int) -> Dict[str, bytes]:
+    data = json.loads(payload(rows))
+    return { language: json.dumps({ **data, "rows": [translated(row, language) for row in data["rows"]] }).encode() for language in LANGUAGES }
+
+def held(build: Callable[[], Any]) -> float:
+    """KiB still allocated by the value `build` returns."""
+    tracemalloc.start()
+    try:
+        value = build()
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del value
+    return size / 1024
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="rows per language")
+    args = parser.parse_args()
+    bodies = pages(args.rows)
+
+    def separate() -> Dict[str, List[Dict[str, Any]]]:
+        return { language: json.loads(body)["rows"] for language, body in bodies.items() }
+
+    def merged() -> List[Any]:
+        rows = { language: [RowResult.model_construct(**row) for row in json.loads(body)["rows"]] for language, body in bodies.items() }
+        return combine(LANGUAGES, rows)
+
+    one, many = held(separate), held(merged)
+    print(f"{args.rows} rows in {len(LANGUAGES)} languages")
+    print(f"{'one copy per language':<26}{one:>12,.0f} KiB")
+    print(f"{'merged rows':<26}{many:>12,.0f} KiB ({many / one:.0%})")
+
+if __name__ == "__main__":
+    main()
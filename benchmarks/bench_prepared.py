@@ -0,0 +1,52 @@
+"""
+Client CPU time per request, for regular and prepared row lookups and searches.
+
+Responses are served from memory by a `MockSession`, so only the work done by the client is measured. No network access is needed.
+
+    python benchmarks/bench_prepared.py --calls 20000
+"""
+import argparse
+import json
+import time
+import warnings
+from typing import Callable
+
+warnings.simplefilter("ignore")
+
+from pyxivapi import XIVAPI
+from pyxivapi.lib.transports import MockSession
+
+ROW = { "schema": "bench", "row_id": 1, "fields": { "Name": "Gil" } }
+RESULTS = { "schema": "bench", "results": [{ "score": 1, "sheet": "Item", "row_id": 1, "fields": { "Name": "Gil" } }] }
+
+def per_call(calls: int, call: Callable[[int], object]) -> float:
+    start = time.process_time()
+    for i in range(calls):
+        call(i)
+    return (time.process_time() - start) / calls
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=20000, help="requests timed for each case")
+    args = parser.parse_args()
+
+    # Every row and search is answered with the same small, pre-encoded body
+    json_headers = { "content-type": "application/json" }
+    routes = { f"/api/sheet/Item/{i}": (200, json_headers, json.dumps(ROW).encode()) for i in range(args.calls) }
+    routes["/api/search"] = (200, json_headers, json.dumps(RESULTS).encode())
+    client = XIVAPI(session=MockSession(routes), language="en", decode="raw")
+
+    get = client.items.prepare_get(fields=["Name", "Icon"])
+    search = client.prepare_search("Name~{term}", sheets="Item", fields=["Name"], limit=10)
+    cases = {
+        "Sheet.get": lambda i: client.items.get(i, { "fields": ["Name", "Icon"] }),
+        "prepare_get()": get,
+        "XIVAPI.search": lambda i: client.search({ "query": f'Name~"term{i}"', "sheets": "Item", "fields": ["Name"], "limit": 10 }),
+        "prepare_search()": lambda i: search(term=f"term{i}"),
+    }
+    print(f"{'case':<20}{'us per call':>14}")
+    for name, call in cases.items():
+        print(f"{name:<20}{per_call(args.calls, call) * 1e6:>14.1f}")
+
+if __name__ == "__main__":
+    main()
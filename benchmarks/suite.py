@@ -0,0 +1,186 @@
+"""
+Client-side performance suite, run against a local `FakeXIVAPI` server so that results only reflect the client.
+
+Measures request throughput, pagination throughput, per-row decode cost, memory per 10k rows, import time and how throughput
+scales with concurrent callers. Results can be saved as JSON and compared with those of another commit, failing when a metric
+regressed by more than the threshold:
+
+    python benchmarks/suite.py --output before.json
+    git checkout my-branch
+    python benchmarks/suite.py --compare before.json --threshold 0.1
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Tuple
+
+from bench_decode import BenchItem, payload, typed_payload
+from pyxivapi import XIVAPI
+from pyxivapi.lib.models import SheetResponse
+from pyxivapi.testing import FakeXIVAPI
+from pyxivapi.utils import decode, loads
+
+# Name, unit and whether higher values are better, for every metric reported
+METRICS: Dict[str, Tuple[str, bool]] = {
+    "requests_per_sec": ("req/s", True),
+    "paginated_rows_per_sec": ("rows/s", True),
+    "decode_validated_us_per_row": ("µs/row", False),
+    "decode_lazy_us_per_row": ("µs/row", False),
+    "decode_raw_us_per_row": ("µs/row", False),
+    "decode_typed_us_per_row": ("µs/row", False),
+    "memory_per_10k_rows_kib": ("KiB", False),
+    "memory_per_10k_typed_rows_kib": ("KiB", False),
+    "import_ms": ("ms", False),
+}
+
+def best(repeat: int, run: Callable[[], float]) -> float:
+    """Best of `repeat` timings of `run`, which returns the seconds it took, to smooth over noise from the machine."""
+    return min(run() for _ in range(repeat))
+
+def timed(call: Callable[[], Any]) -> float:
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+def requests_per_sec(client: XIVAPI, requests: int, repeat: int) -> float:
+    return requests / best(repeat, lambda: timed(lambda: [client.items.get(i % 250) for i in range(requests)]))
+
+def paginated_rows_per_sec(client: XIVAPI, rows: int, repeat: int) -> float:
+    return rows / best(repeat, lambda: timed(lambda: sum(1 for _ in client.sheets().iter_rows("Bench", page_size=500))))
+
+def concurrent_requests_per_sec(client: XIVAPI, workers: int, requests: int, repeat: int) -> float:
+    def run() -> float:
+        with ThreadPoolExecutor(workers) as pool:
+            return timed(lambda: list(pool.map(lambda i: client.items.get(i % 250), range(requests))))
+    return requests / best(repeat, run)
+
+def decode_us_per_row(mode: str, rows: int, repeat: int) -> float:
+    body = payload(rows)
+    options = { "decode": mode }
+
+    def run() -> None:
+        page = decode(SheetResponse, loads(body), options)
+        # Rows are read, so that lazy models pay for the validation they defer
+        for _ in (page["rows"] if mode == "raw" else page.rows):
+            pass
+    return best(repeat, lambda: timed(run)) / rows * 1e6
+
+def decode_typed_us_per_row(rows: int, repeat: int) -> float:
+    body = typed_payload(rows)
+    return best(repeat, lambda: timed(lambda: [BenchItem.from_row(row) for row in loads(body)["rows"]])) / rows * 1e6
+
+def memory_per_10k_typed_rows_kib() -> float:
+    body = typed_payload(10_000)
+    tracemalloc.start()
+    try:
+        rows = [BenchItem.from_row(row) for row in loads(body)["rows"]]
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del rows
+    return size / 1024
+
+def memory_per_10k_rows_kib() -> float:
+    body = payload(10_000)
+    tracemalloc.start()
+    try:
+        page = decode(SheetResponse, loads(body), { "decode": "validated" })
+        size, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del page
+    return size / 1024
+
+def import_ms(repeat: int) -> float:
+    # A fresh interpreter per measurement, since modules are only imported once per process
+    code = "import time; start = time.perf_counter(); import pyxivapi; print(time.perf_counter() - start)"
+    timings = [float(subprocess.check_output([sys.executable, "-c", code])) for _ in range(repeat)]
+    return statistics.median(timings) * 1000
+
+def commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    results: Dict[str, float] = {}
+    server = FakeXIVAPI(sheets={ "Item": 250, "Bench": args.rows }, latency=args.latency, row_size=args.row_size, record_requests=False)
+    with server.serve():
+        with XIVAPI(pool_size=max(args.workers), max_concurrency=max(args.workers), retries=0) as client:
+            # Warms the connection pool up before measuring
+            client.items.get(0)
+            results["requests_per_sec"] = requests_per_sec(client, args.requests, args.repeat)
+            results["paginated_rows_per_sec"] = paginated_rows_per_sec(client, args.rows, args.repeat)
+            # Scaling is measured against a server with latency, as callers would otherwise only contend for the GIL
+            server.latency = args.scaling_latency
+            for workers in args.workers:
+                name = f"concurrent_{workers}_requests_per_sec"
+                METRICS[name] = ("req/s", True)
+                results[name] = concurrent_requests_per_sec(client, workers, args.requests, args.repeat)
+    for mode in ("validated", "lazy", "raw"):
+        results[f"decode_{mode}_us_per_row"] = decode_us_per_row(mode, 500, args.repeat)
+    results["decode_typed_us_per_row"] = decode_typed_us_per_row(500, args.repeat)
+    results["memory_per_10k_rows_kib"] = memory_per_10k_rows_kib()
+    results["memory_per_10k_typed_rows_kib"] = memory_per_10k_typed_rows_kib()
+    results["import_ms"] = import_ms(args.repeat)
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": { "requests": args.requests, "rows": args.rows, "latency": args.latency, "scaling_latency": args.scaling_latency, "row_size": args.row_size },
+        "results": results,
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Print how each metric changed since `baseline`, returning the metrics that regressed by more than `threshold`."""
+    regressions: List[str] = []
+    print(f"\ncompared with {baseline['commit']}:")
+    for name, value in current["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        _, higher_is_better = METRICS.get(name, ("", True))
+        change = (value - before) / before
+        worse = -change if higher_is_better else change
+        flag = " REGRESSION" if worse > threshold else ""
+        print(f"  {name:<36}{before:>14,.2f} -> {value:>14,.2f} ({change:+.1%}){flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=500, help="requests sent per throughput measurement")
+    parser.add_argument("--rows", type=int, default=20_000, help="rows of the sheet paginated through")
+    parser.add_argument("--row-size", type=int, default=256, help="bytes of padding in each served row")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds the fake server waits before every response")
+    parser.add_argument("--scaling-latency", type=float, default=0.01, help="server latency while measuring concurrent scaling")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16], help="concurrent callers to measure scaling with")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, of which the best is kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of a previous run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change counted as a regression when comparing")
+    args = parser.parse_args()
+
+    report = run(args)
+    print(f"commit {report['commit']}, Python {report['python']}")
+    for name, value in report["results"].items():
+        print(f"  {name:<36}{value:>14,.2f} {METRICS[name][0]}")
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.compare:
+        with open(args.compare) as file:
+            if compare(json.load(file), report, args.threshold):
+                return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,14 @@
-from .client import XIVAPI
-from .utils import CustomError
+from typing import TYPE_CHECKING, Any
+from .errors import CustomError, DeadlineExceeded, CircuitOpenError
 
-__all__ = ["XIVAPI", "CustomError"]
+if TYPE_CHECKING:
+    from .client import XIVAPI, AsyncXIVAPI
+
+__all__ = ["XIVAPI", "AsyncXIVAPI", "CustomError", "DeadlineExceeded", "CircuitOpenError"]
+
+def __getattr__(name: str) -> Any:
+    # The clients pull in pydantic and the HTTP stack, so they are only imported once first used
+    if name in ("XIVAPI", "AsyncXIVAPI"):
+        from . import client
+        return getattr(client, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,321 @@
+"""
+Command line interface, installed as `pyxivapi`.
+
+    pyxivapi export sheets Item Action -o export/ --format jsonl --version 7.0 --language en
+    pyxivapi export assets ui/icon/051000/051474_hr1.tex -o icons/ --format png
+    pyxivapi sync Item Action -o sync/ --language en --mirrors mirrors/
+    pyxivapi serve --port 8080 --cache xivapi.sqlite --mirrors mirrors/
+
+Exports are checkpointed into the output directory, so running an interrupted command again resumes it. Syncs keep row hashes
+in their output directory, and write the rows changed by each new version as deltas next to them. `serve` runs a caching proxy
+of the API, shared by every client pointed at it.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence, TextIO
+from .client import XIVAPI
+from .lib.cache import DiskCache, MemoryCache
+from .lib.crawl import Crawler, WorkUnit, DEFAULT_CRAWL_PAGE_SIZE
+from .lib.export import Checkpoint, WRITERS
+from .lib.mirror import Mirror
+from .lib.models import ListResponse, RowResult
+from .lib.proxy import CachingProxy
+from .lib.session import DEFAULT_POOL_SIZE
+from .lib.sync import HashStore, SheetDelta, Sync
+from .lib.versions import Versions
+from .lib import pagination
+from .utils import as_model
+from .errors import CustomError
+
+class Progress:
+    """Reports throughput, and an ETA once one can be estimated, to `stream` at most every `interval` seconds."""
+    def __init__(self, total: int, unit: str, counted: str, stream: TextIO = sys.stderr, interval: float = 1.0, quiet: bool = False) -> None:
+        self.total = total
+        self.unit = unit
+        self.counted = counted
+        self.completed = 0
+        self.items = 0
+        self.bytes = 0
+        self.stream = stream
+        self.interval = interval
+        self.quiet = quiet
+        self.started = time.monotonic()
+        self._reported = 0.0
+
+    def update(self, items: int = 0, size: int = 0, completed: int = 0) -> None:
+        self.items += items
+        self.bytes += size
+        self.completed += completed
+        now = time.monotonic()
+        if not self.quiet and now - self._reported >= self.interval:
+            self._reported = now
+            self.stream.write(f"\r[pyxivapi] {self.line()}")
+            self.stream.flush()
+
+    def line(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        line = f"{self.completed}/{self.total} {self.unit}, {self.items:,} {self.counted} ({self.items / elapsed:,.0f}/s)"
+        if self.bytes:
+            line += f", {self.bytes / 2**20:,.1f} MiB"
+        if 0 < self.completed < self.total:
+            remaining = elapsed / self.completed * (self.total - self.completed)
+            line += f", ETA {time.strftime('%H:%M:%S', time.gmtime(remaining))}"
+        return line
+
+def _client(args: argparse.Namespace, checkpoint: Checkpoint) -> XIVAPI:
+    """Client pinned to the export's version and language, resolved once and recorded in the checkpoint."""
+    options: Dict[str, Any] = { "pool_size": args.workers, "max_concurrency": args.workers }
+    if args.rate_limit:
+        options["rate_limit"] = args.rate_limit
+    client = XIVAPI(**options)
+
+    requested = args.version or checkpoint.state.get("version") or "latest"
+    version, _ = DiskCache.resolve(requested, Versions(**client.options).raw())
+    language = args.language if args.language is not None else checkpoint.state.get("language", "")
+    for key, value in (("version", version), ("language", language)):
+        if checkpoint.state.get(key, value) != value:
+            raise CustomError(f"{checkpoint.path} is for {key} {checkpoint.state[key]!r}, not {value!r}; pass --restart to start over")
+    checkpoint.state.update(version=version, language=language)
+
+    client.options["version"] = version
+    if language:
+        client.options["language"] = language
+    return client
+
+def export_sheets(args: argparse.Namespace, checkpoint: Checkpoint, client: XIVAPI) -> Dict[str, Any]:
+    sheets = args.sheets or [sheet.name for sheet in as_model(ListResponse, client.sheets().all()).sheets]
+    pending = [sheet for sheet in sheets if not checkpoint.sheet(sheet)["done"]]
+    progress = Progress(len(sheets), "sheets", "rows", quiet=args.quiet)
+    progress.completed = len(sheets) - len(pending)
+
+    writer = WRITERS[args.format](args.output)
+    for sheet in pending:
+        writer.resume(sheet, checkpoint.sheet(sheet)["position"])
+
+    def sink(sheet: str, rows: List[RowResult]) -> None:
+        position = writer.write(sheet, rows)
+        state = checkpoint.sheet(sheet)
+        state.update(after=pagination.after(rows[-1]), position=position, rows=state["rows"] + len(rows))
+        checkpoint.save()
+        progress.update(items=len(rows))
+
+    def done(unit: WorkUnit) -> None:
+        checkpoint.sheet(unit.sheet)["done"] = True
+        checkpoint.save()
+        progress.update(completed=1)
+
+    params = { "fields": args.fields } if args.fields else None
+    crawler = Crawler(workers=args.workers, page_size=args.page_size, processes=args.processes, **client.options)
+    try:
+        stats = crawler.run(sink, [WorkUnit(sheet, checkpoint.sheet(sheet)["after"]) for sheet in pending], params, done)
+    finally:
+        writer.close()
+    return { "exported": f"{stats['rows']:,} rows of {len(sheets)} sheets", "bytes": stats["bytes"] }
+
+def export_assets(args: argparse.Namespace, checkpoint: Checkpoint, client: XIVAPI) -> Dict[str, Any]:
+    paths = list(args.paths)
+    if args.from_file:
+        with open(args.from_file) as file:
+            paths += [line.strip() for line in file if line.strip()]
+    completed = set(checkpoint.state["assets"])
+    pending = [path for path in dict.fromkeys(paths) if path not in completed]
+    # Game paths are relative; anything resolving outside the output directory is refused before downloading
+    output = os.path.abspath(args.output)
+    targets = { path: os.path.abspath(os.path.join(output, f"{os.path.splitext(path)[0]}.{args.format}")) for path in pending }
+    outside = [path for path, target in targets.items() if os.path.commonpath((output, target)) != output]
+    if outside:
+        raise CustomError(f"Asset path {outside[0]!r} would be written outside {args.output}")
+    progress = Progress(len(paths), "assets", "assets", quiet=args.quiet)
+    progress.completed = len(paths) - len(pending)
+    lock = threading.Lock()
+    written = 0
+
+    def download(path: str) -> None:
+        nonlocal written
+        target = targets[path]
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        size = client.assets().download({ "path": path, "format": args.format }, target)
+        with lock:
+            written += size
+            checkpoint.asset(path)
+            progress.update(items=1, size=size, completed=1)
+
+    try:
+        with ThreadPoolExecutor(args.workers) as pool:
+            list(pool.map(download, pending))
+    finally:
+        checkpoint.save()
+    return { "exported": f"{len(pending):,} of {len(paths)} assets", "bytes": written }
+
+def sync(args: argparse.Namespace) -> int:
+    """Sync sheets to the latest (or given) version, writing a delta per changed sheet and applying it to any mirror of the sheet."""
+    options: Dict[str, Any] = { "pool_size": args.workers, "max_concurrency": args.workers }
+    if args.rate_limit:
+        options["rate_limit"] = args.rate_limit
+    if args.version:
+        options["version"] = args.version
+    if args.language:
+        options["language"] = args.language
+    started = time.monotonic()
+    client = XIVAPI(**options)
+    store = HashStore(os.path.join(args.output, "hashes.sqlite"))
+    progress = Progress(0, "sheets", "changed rows", quiet=args.quiet)
+
+    def done(delta: SheetDelta) -> None:
+        if delta:
+            folder = os.path.join(args.output, delta.version)
+            os.makedirs(folder, exist_ok=True)
+            delta.write(os.path.join(folder, f"{delta.sheet}.jsonl"))
+        if args.mirrors:
+            mirror = os.path.join(args.mirrors, f"{delta.sheet}.xivm")
+            if delta.previous is None or (delta and os.path.exists(mirror)):
+                os.makedirs(args.mirrors, exist_ok=True)
+                delta.apply(mirror)
+        progress.update(items=len(delta.added) + len(delta.changed) + len(delta.removed), completed=1)
+
+    try:
+        syncer = Sync(store, workers=args.workers, page_size=args.page_size, params={ "fields": args.fields } if args.fields else None, **client.options)
+        version = syncer.latest()
+        pending = syncer.stale(args.sheets or None, version)
+        progress.total = len(pending)
+        deltas = syncer.run(pending, version, done)
+    except KeyboardInterrupt:
+        print("\n[pyxivapi] Interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+    except CustomError as e:
+        print(f"\n[pyxivapi] Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        store.close()
+        client.close()
+
+    if not args.quiet and deltas:
+        print(file=sys.stderr)
+    for delta in deltas.values():
+        print(f"[pyxivapi] {delta.summary()}", file=sys.stderr)
+    changed = sum(1 for delta in deltas.values() if delta)
+    print(f"[pyxivapi] Synced {len(deltas)} sheets to version {version} in {time.monotonic() - started:,.1f}s: {changed} changed", file=sys.stderr)
+    return 0
+
+def serve(args: argparse.Namespace) -> int:
+    """Run a caching proxy of the API until interrupted."""
+    options: Dict[str, Any] = {
+        "pool_size": args.workers, "max_concurrency": args.workers,
+        "memory_cache": MemoryCache(max_entries=args.memory_entries, max_bytes=args.memory_mb * 2**20, ttl=args.ttl),
+    }
+    if args.rate_limit:
+        options["rate_limit"] = args.rate_limit
+    if args.cache:
+        options["cache"] = DiskCache(args.cache)
+    mirrors = [Mirror(os.path.join(args.mirrors, name)) for name in sorted(os.listdir(args.mirrors)) if name.endswith(".xivm")] if args.mirrors else []
+
+    proxy = CachingProxy(mirrors, host=args.host, port=args.port, **options)
+    print(f"[pyxivapi] Serving {proxy.endpoint} ({len(mirrors)} mirrors)", file=sys.stderr)
+    try:
+        proxy.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        proxy.server_close()
+        proxy.client.close()
+        for mirror in mirrors:
+            mirror.close()
+    print(f"\n[pyxivapi] Stopped: {proxy.stats()}", file=sys.stderr)
+    return 0
+
+def parser() -> argparse.ArgumentParser:
+    root = argparse.ArgumentParser(prog="pyxivapi", description="Tools for the XIVAPI v2 API.")
+    commands = root.add_subparsers(dest="command", required=True)
+    export = commands.add_parser("export", help="export sheets or assets, resuming interrupted exports")
+    kinds = export.add_subparsers(dest="kind", required=True)
+
+    def common(command: argparse.ArgumentParser) -> None:
+        command.add_argument("-o", "--output", required=True, help="output directory, also holding the checkpoint")
+        command.add_argument("--version", help="game version to pin the export to (default: latest, resolved once)")
+        command.add_argument("--language", help="language to export (default: the API default)")
+        command.add_argument("--workers", type=int, default=DEFAULT_POOL_SIZE, help="number of concurrent requests")
+        command.add_argument("--rate-limit", type=float, help="maximum requests per second")
+        command.add_argument("--restart", action="store_true", help="discard any checkpoint and start over")
+        command.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+
+    sheets = kinds.add_parser("sheets", help="export sheet rows")
+    sheets.add_argument("sheets", nargs="*", help="sheets to export (default: every sheet)")
+    sheets.add_argument("--format", choices=sorted(WRITERS), default="jsonl")
+    sheets.add_argument("--fields", help="comma-separated fields to export (default: every field)")
+    sheets.add_argument("--page-size", type=int, default=DEFAULT_CRAWL_PAGE_SIZE, help="rows requested per page")
+    sheets.add_argument("--processes", type=int, default=0, help="decode pages in this many worker processes")
+    common(sheets)
+
+    assets = kinds.add_parser("assets", help="download assets")
+    assets.add_argument("paths", nargs="*", help="game paths of the assets to export")
+    assets.add_argument("--from-file", help="file listing further asset paths, one per line")
+    assets.add_argument("--format", default="png", help="format to convert the assets to")
+    common(assets)
+
+    synced = commands.add_parser("sync", help="sync sheets to a new version, writing only the rows that changed")
+    synced.add_argument("sheets", nargs="*", help="sheets to sync (default: every sheet)")
+    synced.add_argument("-o", "--output", required=True, help="output directory, holding the row hashes and a folder of deltas per version")
+    synced.add_argument("--mirrors", help="directory of sheet mirrors (`{sheet}.xivm`) to apply the deltas to, created on a first sync")
+    synced.add_argument("--version", help="game version to sync to (default: latest)")
+    synced.add_argument("--language", help="language to sync (default: the API default)")
+    synced.add_argument("--fields", help="comma-separated fields to sync (default: every field)")
+    synced.add_argument("--page-size", type=int, default=DEFAULT_CRAWL_PAGE_SIZE, help="rows requested per page")
+    synced.add_argument("--workers", type=int, default=DEFAULT_POOL_SIZE, help="number of concurrent requests")
+    synced.add_argument("--rate-limit", type=float, help="maximum requests per second")
+    synced.add_argument("-q", "--quiet", action="store_true", help="do not report progress")
+
+    served = commands.add_parser("serve", help="run a caching proxy of the API, shared by every client pointed at it")
+    served.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    served.add_argument("--port", type=int, default=8080, help="port to listen on")
+    served.add_argument("--cache", help="persistent cache file shared by every request (default: memory only)")
+    served.add_argument("--mirrors", help="directory of sheet mirrors (`*.xivm`) to answer sheet requests from")
+    served.add_argument("--memory-entries", type=int, default=4096, help="responses kept in memory")
+    served.add_argument("--memory-mb", type=int, default=256, help="total size of the responses kept in memory, in MiB")
+    served.add_argument("--ttl", type=float, default=300.0, help="seconds responses are kept in memory")
+    served.add_argument("--workers", type=int, default=DEFAULT_POOL_SIZE, help="number of concurrent upstream requests")
+    served.add_argument("--rate-limit", type=float, help="maximum upstream requests per second")
+    return root
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parser().parse_args(argv)
+    if args.command == "serve":
+        return serve(args)
+    os.makedirs(args.output, exist_ok=True)
+    if args.command == "sync":
+        return sync(args)
+    checkpoint = Checkpoint(os.path.join(args.output, "checkpoint.json"))
+    if args.restart:
+        checkpoint.reset()
+
+    started = time.monotonic()
+    client: Optional[XIVAPI] = None
+    try:
+        client = _client(args, checkpoint)
+        checkpoint.save()
+        summary = (export_sheets if args.kind == "sheets" else export_assets)(args, checkpoint, client)
+    except KeyboardInterrupt:
+        print("\n[pyxivapi] Interrupted, run the same command again to resume", file=sys.stderr)
+        return 130
+    except CustomError as e:
+        print(f"\n[pyxivapi] Error: {e.message}", file=sys.stderr)
+        return 1
+    finally:
+        if client is not None:
+            client.close()
+
+    stats = client.scheduler.stats()
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(
+        f"[pyxivapi] Exported {summary['exported']} at version {checkpoint.state['version']} in {time.monotonic() - started:,.1f}s: "
+        f"{summary['bytes'] / 2**20:,.1f} MiB, {stats['requests']:,} requests, {stats['retries']:,} retries",
+        file=sys.stderr,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
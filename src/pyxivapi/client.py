@@ -1,27 +1,118 @@
-from typing import Any, Dict, Unpack
-from .lib.models import (SearchQuery, VersionQuery, RowReaderQuery, SearchResponse, XIVAPIOptions)
-from .lib.sheets import Sheet, Sheets
-from .lib.assets import Assets
-from .lib.versions import Versions
-from .utils import request, CustomError
-    
+import asyncio
+import contextvars
+import heapq
+from concurrent.futures import Future, ThreadPoolExecutor
+from itertools import islice
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Hashable, Iterator, List, Optional, Sequence, Set, Type, TypeVar, Unpack, cast, overload
+from .lib.models import (SearchQuery, VersionQuery, RowReaderQuery, SearchResponse, SearchResult, SearchHit, VersionsResponse, ListResponse, SchemaSpecifier, XIVAPIOptions)
+from .lib import pagination
+from .lib.sheets import Sheet, Sheets, AsyncSheet, AsyncSheets
+from .lib.assets import Assets, AsyncAssets
+from .lib.versions import Versions, AsyncVersions
+from .lib.prepared import PreparedSearch, AsyncPreparedSearch, query_model
+from .lib.rows import Row, TypedSheet, AsyncTypedSheet
+from .lib.session import AsyncSession, connect
+from .lib.scheduler import Scheduler
+from .utils import request, async_request, decode, as_model, Decoded
+from .errors import CustomError
+
+if TYPE_CHECKING:
+    from .lib.query import SearchBackend
+
+E = TypeVar("E")
+R = TypeVar("R", bound=Row)
+
 class XIVAPI:
-    """Python wrapper for the XIVAPI v2 API."""
+    """
+    Python wrapper for the XIVAPI v2 API.
+    
+    Every endpoint object handed out by a client shares its pooled session and request scheduler; call `close()` (or use the client as a context manager) to release the connections.
+    Endpoint objects are created on first use and reused afterwards; any sheet can be reached with `sheet("Action")`, or as an attribute (`xiv.Action`).
+    """
     def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
         self.options = XIVAPIOptions(**options)
-    
-        # Typed endpoints
-        self.achievements = Sheet("Achievement", **self.options)
-        self.minions = Sheet("Companion", **self.options)
-        self.mounts = Sheet("Mount", **self.options)
-        self.items = Sheet("Item", **self.options)
+        if "session" not in self.options:
+            self.options["session"] = connect(**self.options)
+        if "scheduler" not in self.options:
+            self.options["scheduler"] = Scheduler(**self.options)
+        self.session = self.options["session"]
+        self.scheduler = self.options["scheduler"]
+        self._endpoints: Dict[Hashable, Any] = {}
+        self._sheet_names: Optional[Set[str]] = None
+
+    def _endpoint(self, key: Hashable, create: Callable[[], E]) -> E:
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints.setdefault(key, create())
+        # Endpoints are keyed on what creates them, so the one found is of the type `create` returns
+        return cast(E, endpoint)
+
+    @overload
+    def sheet(self, sheet: SchemaSpecifier) -> Sheet: ...
+    @overload
+    def sheet(self, sheet: Type[R]) -> TypedSheet[R]: ...
+    def sheet(self, sheet: SchemaSpecifier | Type[Row]) -> Sheet | TypedSheet[Any]:
+        """
+        Typed endpoint for `sheet`, created on first use and reused afterwards.
+        Given a `Row` class rather than a sheet name, rows are decoded into that class, and only its fields are requested.
+        """
+        if isinstance(sheet, type):
+            row = sheet
+            return self._endpoint(row, lambda: TypedSheet(row, **self.options))
+        return self._endpoint(sheet, lambda: Sheet(sheet, **self.options))
+
+    def sheet_names(self) -> Set[str]:
+        """Names of every sheet known to the API, listed once per client."""
+        if self._sheet_names is None:
+            self._sheet_names = { sheet.name for sheet in as_model(ListResponse, self.sheets().all()).sheets }
+        return self._sheet_names
+
+    def __getattr__(self, name: str) -> Sheet:
+        # Only reached for missing attributes; sheet names are capitalised, unlike every attribute of the client
+        if name[:1].isupper() and name in self.sheet_names():
+            return self.sheet(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    # Typed endpoints
+    @property
+    def achievements(self) -> Sheet:
+        return self.sheet("Achievement")
+
+    @property
+    def minions(self) -> Sheet:
+        return self.sheet("Companion")
+
+    @property
+    def mounts(self) -> Sheet:
+        return self.sheet("Mount")
+
+    @property
+    def items(self) -> Sheet:
+        return self.sheet("Item")
+
+    # Raw endpoints
+    def assets(self) -> Assets:
+        return self._endpoint("/asset", lambda: Assets(**self.options))
+
+    def sheets(self) -> Sheets:
+        return self._endpoint("/sheet", lambda: Sheets(**self.options))
+
+    def versions(self) -> List[str]:
+        """List the names of every game version known to the API."""
+        versions = self._endpoint("/version", lambda: Versions(**self.options))
+        return [v.names[0] for v in as_model(VersionsResponse, versions.all()).versions]
+
+    def close(self) -> None:
+        """Close the pooled session shared by this client and its endpoints."""
+        self.session.close()
         
-        # Raw endpoints
-        self.assets = lambda: Assets()
-        self.sheets = lambda: Sheets(**self.options)
-        self.versions = lambda: [v.names[0] for v in Versions().all().versions]
+    def __enter__(self) -> "XIVAPI":
+        return self
+    
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
         
-    def search(self, params: Dict[str, Any] | SearchQuery | VersionQuery | RowReaderQuery) -> SearchResponse:
+    def search(self, params: Dict[str, Any] | SearchQuery | VersionQuery | RowReaderQuery) -> Decoded[SearchResponse]:
         """
         Fetch information about rows matching the provided search query (`GET /search`).
         
@@ -29,7 +120,246 @@ class XIVAPI:
         """
         if isinstance(params, dict):
             params = SearchQuery(**params)
+        backend: Optional["SearchBackend"] = self.options.get("search_backend")
+        if backend is not None:
+            return backend.search(params if isinstance(params, SearchQuery) else SearchQuery(**params.model_dump(exclude_none=True)))
         data, errors = request(path="/search", params=params.model_dump(exclude_none=True), options=self.options)
         if errors:
             raise CustomError(errors[0]["message"])
-        return SearchResponse(**data)
+        return decode(SearchResponse, data, self.options)
+    
+    def iter_search(self, params: Dict[str, Any] | SearchQuery, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> Iterator[SearchResult]:
+        """
+        Lazily iterate every result matching the provided search query, following the `next` cursor of each page.
+        
+        Results are requested `page_size` at a time, and up to `prefetch` pages are fetched in a background thread while the caller
+        processes the current one (`0` disables prefetching).
+        """
+        if isinstance(params, dict):
+            params = SearchQuery(**params)
+        query = params.model_copy(update={ "limit": page_size })
+        
+        def pages() -> Iterator[List[SearchResult]]:
+            nonlocal query
+            while True:
+                page = as_model(SearchResponse, self.search(query))
+                if page.results:
+                    yield page.results
+                if not page.next:
+                    return
+                query = query.model_copy(update={ "cursor": page.next, "query": None, "sheets": None })
+                
+        for results in pagination.prefetch(pages(), prefetch):
+            yield from results
+
+    def search_many(self, queries: Sequence[Dict[str, Any] | SearchQuery], top_k: Optional[int] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE) -> Iterator[SearchHit]:
+        """
+        Run several search queries (e.g. per sheet, language or version) and iterate their results merged by descending score.
+        
+        The first page of every query is fetched concurrently. After that, a query's next page is only fetched once the merge
+        has used up its current one, so the best `top_k` results only cost the pages needed to rank them.
+        """
+        searches = [SearchQuery(**query) if isinstance(query, dict) else query for query in queries]
+        limit = min(page_size, top_k) if top_k else page_size
+        
+        def results(query: SearchQuery, index: int, first: "Future[Decoded[SearchResponse]]") -> Iterator[SearchHit]:
+            page = as_model(SearchResponse, first.result())
+            while True:
+                for result in page.results:
+                    yield SearchHit(result.score, index, result)
+                if not page.next:
+                    return
+                query = query.model_copy(update={ "cursor": page.next, "query": None, "sheets": None })
+                page = as_model(SearchResponse, self.search(query))
+        
+        # Nothing is sent when no results are wanted
+        if not searches or (top_k is not None and top_k <= 0):
+            return
+        with ThreadPoolExecutor(len(searches)) as pool:
+            # Each first page is fetched in a copy of the caller's context, so context-scoped settings still apply to it
+            searches = [query.model_copy(update={ "limit": limit }) for query in searches]
+            firsts = [pool.submit(contextvars.copy_context().run, self.search, query) for query in searches]
+            streams = [results(query, index, first) for index, (query, first) in enumerate(zip(searches, firsts))]
+            yield from islice(heapq.merge(*streams, key=lambda hit: -hit.score), top_k)
+    
+    def prepare_search(self, query_template: str, params: Optional[Dict[str, Any] | SearchQuery] = None, **query: Any) -> PreparedSearch:
+        """
+        Prepare a search with a fixed query template and parameters (`params`, or keyword arguments such as `sheets=` and `fields=`).
+        The returned query is called with a value for each `{name}` of the template, e.g. `prepare_search('Name~{term}', sheets="Item")(term="gil")`.
+        
+        See: `PreparedSearch`
+        """
+        return PreparedSearch(query_template, query_model(SearchQuery, params, query), self.options)
+
+
+class AsyncXIVAPI:
+    """
+    Asynchronous Python wrapper for the XIVAPI v2 API, mirroring `XIVAPI`.
+
+    Every endpoint object handed out by a client shares one `httpx` connection pool, with at most `max_concurrency` requests in flight.
+    Call `await close()` (or use the client as an async context manager) to release the connections.
+    Attribute access to sheets (`xiv.Action`) accepts any capitalised name until `sheet_names()` has been awaited, after which only listed sheets are.
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+        if "session" not in self.options:
+            self.options["session"] = AsyncSession(**self.options)
+        if "scheduler" not in self.options:
+            self.options["scheduler"] = Scheduler(**self.options)
+        self.session = self.options["session"]
+        self.scheduler = self.options["scheduler"]
+        self._endpoints: Dict[Hashable, Any] = {}
+        self._sheet_names: Optional[Set[str]] = None
+
+    def _endpoint(self, key: Hashable, create: Callable[[], E]) -> E:
+        endpoint = self._endpoints.get(key)
+        if endpoint is None:
+            endpoint = self._endpoints.setdefault(key, create())
+        # Endpoints are keyed on what creates them, so the one found is of the type `create` returns
+        return cast(E, endpoint)
+
+    @overload
+    def sheet(self, sheet: SchemaSpecifier) -> AsyncSheet: ...
+    @overload
+    def sheet(self, sheet: Type[R]) -> AsyncTypedSheet[R]: ...
+    def sheet(self, sheet: SchemaSpecifier | Type[Row]) -> AsyncSheet | AsyncTypedSheet[Any]:
+        """
+        Typed endpoint for `sheet`, created on first use and reused afterwards.
+        Given a `Row` class rather than a sheet name, rows are decoded into that class, and only its fields are requested.
+        """
+        if isinstance(sheet, type):
+            row = sheet
+            return self._endpoint(row, lambda: AsyncTypedSheet(row, **self.options))
+        return self._endpoint(sheet, lambda: AsyncSheet(sheet, **self.options))
+
+    async def sheet_names(self) -> Set[str]:
+        """Names of every sheet known to the API, listed once per client."""
+        if self._sheet_names is None:
+            self._sheet_names = { sheet.name for sheet in as_model(ListResponse, await self.sheets().all()).sheets }
+        return self._sheet_names
+
+    def __getattr__(self, name: str) -> AsyncSheet:
+        # Sheets cannot be listed without awaiting, so names are only checked once `sheet_names()` has been
+        if name[:1].isupper() and (self._sheet_names is None or name in self._sheet_names):
+            return self.sheet(name)
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    # Typed endpoints
+    @property
+    def achievements(self) -> AsyncSheet:
+        return self.sheet("Achievement")
+
+    @property
+    def minions(self) -> AsyncSheet:
+        return self.sheet("Companion")
+
+    @property
+    def mounts(self) -> AsyncSheet:
+        return self.sheet("Mount")
+
+    @property
+    def items(self) -> AsyncSheet:
+        return self.sheet("Item")
+
+    # Raw endpoints
+    def assets(self) -> AsyncAssets:
+        return self._endpoint("/asset", lambda: AsyncAssets(**self.options))
+
+    def sheets(self) -> AsyncSheets:
+        return self._endpoint("/sheet", lambda: AsyncSheets(**self.options))
+
+    async def versions(self) -> List[str]:
+        """List the names of every game version known to the API."""
+        versions = self._endpoint("/version", lambda: AsyncVersions(**self.options))
+        return [v.names[0] for v in as_model(VersionsResponse, await versions.all()).versions]
+
+    async def close(self) -> None:
+        """Close the connection pool shared by this client and its endpoints."""
+        await self.session.close()
+
+    async def __aenter__(self) -> "AsyncXIVAPI":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def search(self, params: Dict[str, Any] | SearchQuery | VersionQuery | RowReaderQuery) -> Decoded[SearchResponse]:
+        """
+        Fetch information about rows matching the provided search query (`GET /search`).
+
+        See: https://v2.xivapi.com/api/docs#tag/search/get/search
+        """
+        if isinstance(params, dict):
+            params = SearchQuery(**params)
+        backend: Optional["SearchBackend"] = self.options.get("search_backend")
+        if backend is not None:
+            # Local backends scan whole sheets, which must not block the event loop
+            return await asyncio.to_thread(backend.search, params if isinstance(params, SearchQuery) else SearchQuery(**params.model_dump(exclude_none=True)))
+        data, errors = await async_request(path="/search", params=params.model_dump(exclude_none=True), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(SearchResponse, data, self.options)
+
+    async def iter_search(self, params: Dict[str, Any] | SearchQuery, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> AsyncIterator[SearchResult]:
+        """
+        Lazily iterate every result matching the provided search query, following the `next` cursor of each page.
+
+        Results are requested `page_size` at a time, and up to `prefetch` pages are fetched in a background task while the caller
+        processes the current one (`0` disables prefetching).
+        """
+        if isinstance(params, dict):
+            params = SearchQuery(**params)
+        query = params.model_copy(update={ "limit": page_size })
+
+        async def pages() -> AsyncIterator[List[SearchResult]]:
+            nonlocal query
+            while True:
+                page = as_model(SearchResponse, await self.search(query))
+                if page.results:
+                    yield page.results
+                if not page.next:
+                    return
+                query = query.model_copy(update={ "cursor": page.next, "query": None, "sheets": None })
+
+        async for results in pagination.async_prefetch(pages(), prefetch):
+            for result in results:
+                yield result
+
+    async def search_many(self, queries: Sequence[Dict[str, Any] | SearchQuery], top_k: Optional[int] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE) -> AsyncIterator[SearchHit]:
+        """
+        Run several search queries (e.g. per sheet, language or version) and iterate their results merged by descending score.
+
+        The first page of every query is fetched concurrently. After that, a query's next page is only fetched once the merge
+        has used up its current one, so the best `top_k` results only cost the pages needed to rank them.
+        """
+        limit = min(page_size, top_k) if top_k else page_size
+
+        async def results(query: SearchQuery, index: int) -> AsyncIterator[SearchHit]:
+            query = query.model_copy(update={ "limit": limit })
+            while True:
+                page = as_model(SearchResponse, await self.search(query))
+                for result in page.results:
+                    yield SearchHit(result.score, index, result)
+                if not page.next:
+                    return
+                query = query.model_copy(update={ "cursor": page.next, "query": None, "sheets": None })
+
+        streams = [results(SearchQuery(**query) if isinstance(query, dict) else query, index) for index, query in enumerate(queries)]
+        if not streams or (top_k is not None and top_k <= 0):
+            return
+        count = 0
+        # Stops as soon as `top_k` results are yielded, before the merge advances (and maybe pages) past the last of them
+        async for hit in pagination.async_merge(streams, key=lambda hit: -hit.score):
+            yield hit
+            count += 1
+            if count == top_k:
+                return
+
+    def prepare_search(self, query_template: str, params: Optional[Dict[str, Any] | SearchQuery] = None, **query: Any) -> AsyncPreparedSearch:
+        """
+        Prepare a search with a fixed query template and parameters (`params`, or keyword arguments such as `sheets=` and `fields=`).
+        The returned query is awaited with a value for each `{name}` of the template, e.g. `await prepare_search('Name~{term}', sheets="Item")(term="gil")`.
+
+        See: `AsyncPreparedSearch`
+        """
+        return AsyncPreparedSearch(query_template, query_model(SearchQuery, params, query), self.options)
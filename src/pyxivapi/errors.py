@@ -0,0 +1,17 @@
+from typing import Optional
+
+class CustomError(Exception):
+    def __init__(self, message: str, name: Optional[str] = None):
+        super().__init__(message)
+        self.name = name or "XIVAPIError"
+        self.message = message
+
+class DeadlineExceeded(CustomError, TimeoutError):
+    """Raised when a request cannot complete before its deadline."""
+    def __init__(self, message: str) -> None:
+        super().__init__(message, "DeadlineExceeded")
+
+class CircuitOpenError(CustomError):
+    """Raised instead of sending a request while the client's circuit breaker is open."""
+    def __init__(self, message: str) -> None:
+        super().__init__(message, "CircuitOpenError")
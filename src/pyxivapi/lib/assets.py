@@ -1,6 +1,79 @@
-from typing import Dict, Any
-from .models import AssetQuery, MapPath, VersionQuery
-from ..utils import request, CustomError
+import asyncio
+import os
+from typing import Dict, Any, BinaryIO, Tuple, Unpack
+from .models import AssetQuery, MapPath, VersionQuery, XIVAPIOptions
+from .cache import AssetStore, DiskCache
+from .session import DEFAULT_CHUNK_SIZE
+from .versions import Versions, AsyncVersions
+from ..utils import request, async_request, stream, async_stream
+from ..errors import CustomError
+
+# Where streamed assets can be written: a file path, an open binary file, or a caller-supplied buffer
+Target = str | os.PathLike[str] | BinaryIO | bytearray | memoryview
+
+class Sink:
+    """
+    Destination of a streamed asset. Paths are written to a temporary file that replaces them once complete, `bytearray` buffers
+    are extended and `memoryview` buffers are filled from the start; anything else is treated as a writable binary file.
+    """
+    def __init__(self, target: Target) -> None:
+        self.target = target
+        self.written = 0
+        self._temporary = None
+        if isinstance(target, (str, os.PathLike)):
+            self._temporary = f"{os.fspath(target)}.part"
+            self._file: Any = open(self._temporary, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if isinstance(self.target, (str, os.PathLike)):
+            self._file.write(chunk)
+        elif isinstance(self.target, bytearray):
+            self.target.extend(chunk)
+        elif isinstance(self.target, memoryview):
+            end = self.written + len(chunk)
+            if end > len(self.target):
+                raise CustomError(f"Asset does not fit in the supplied {len(self.target)} byte buffer")
+            self.target[self.written:end] = chunk
+        else:
+            self.target.write(chunk)
+        self.written += len(chunk)
+
+    def close(self, complete: bool = True) -> None:
+        if self._temporary is not None:
+            self._file.close()
+            if complete:
+                os.replace(self._temporary, self.target)  # type: ignore[arg-type]
+            else:
+                os.remove(self._temporary)
+
+def _map_request(params: MapPath | VersionQuery | Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """Request path and query for a map, from `MapPath` + `VersionQuery` + `{"format": ...}` values."""
+    params = params.model_dump(exclude_none=True) if not isinstance(params, dict) else {k: v for k, v in params.items()}
+    try:
+        path = f"/asset/map/{params.pop('territory')}/{params.pop('index')}"
+    except KeyError as e:
+        raise CustomError(f"Map {e.args[0]} is required")
+    return path, params
+
+def _asset_request(params: AssetQuery | Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    if isinstance(params, dict):
+        params = AssetQuery(**params)
+    return "/asset", params.model_dump(exclude_none=True)
+
+def _key(path: str, params: Dict[str, Any]) -> Tuple[str, str]:
+    """Asset path and format an asset is stored under."""
+    return str(params.get("path", path.removeprefix("/asset/"))), str(params.get("format", ""))
+
+def _body(data: Dict[str, Any]) -> bytes:
+    """Binary body of an asset response; assets are never JSON, so anything else is reported as an error."""
+    body = data.get("data")
+    if not isinstance(body, bytes):
+        raise CustomError("Expected binary asset data, got a JSON response")
+    return body
+
+def _read(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return file.read()
 
 class Assets:
     """
@@ -8,18 +81,22 @@ class Assets:
     
     See https://v2.xivapi.com/api/docs#tag/assets
     """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+        
     def get(self, params: AssetQuery) -> bytes:
         """
         Read an asset from the game at the specified path, converting it into a usable format (`GET /asset`).
         
         See: https://v2.xivapi.com/api/docs#tag/assets/get/asset
         """
-        if isinstance(params, dict):
-            params = AssetQuery(**params)
-        data, errors = request(path="/asset", params=params.model_dump(exclude_none=True))
+        path, query = _asset_request(params)
+        if self.options.get("asset_store") is not None:
+            return _read(self._stored(path, query))
+        data, errors = request(path=path, params=query, options=self.options, defaults=("version",))
         if errors:
             raise CustomError(errors[0]["message"])
-        return data.get("data", data)
+        return _body(data)
     
     def map(self, params: MapPath | VersionQuery | Dict[str, Any]) -> bytes:
         """
@@ -27,10 +104,151 @@ class Assets:
 
         See: https://v2.xivapi.com/api/docs#tag/assets/get/asset/map/{territory}/{index}
         """
-        if isinstance(params, dict):
-            # MapPath + VersionQuery + {"format": ...}
-            params = {k: v for k, v in params.items()}
-        data, errors = request(path="/asset",params=params)
+        path, query = _map_request(params)
+        if self.options.get("asset_store") is not None:
+            return _read(self._stored(path, query))
+        data, errors = request(path=path, params=query, options=self.options, defaults=("version",))
         if errors:
             raise CustomError(errors[0]["message"])
-        return data.get("data", data)
\ No newline at end of file
+        return _body(data)
+
+    def download(self, params: AssetQuery | Dict[str, Any], target: Target, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Stream an asset into `target` (a file path, an open binary file or a buffer) in chunks, without buffering the whole of it.
+        Returns the number of bytes written.
+        """
+        return self._download(*_asset_request(params), target, chunk_size)
+
+    def download_map(self, params: MapPath | VersionQuery | Dict[str, Any], target: Target, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Stream a map into `target` in chunks, like `download`. Returns the number of bytes written."""
+        return self._download(*_map_request(params), target, chunk_size)
+
+    def _download(self, path: str, query: Dict[str, Any], target: Target, chunk_size: int) -> int:
+        sink = Sink(target)
+        try:
+            if self.options.get("asset_store") is not None:
+                with open(self._stored(path, query), "rb") as file:
+                    while chunk := file.read(chunk_size):
+                        sink.write(chunk)
+            else:
+                with stream(path=path, params=query, options=self.options, defaults=("version",), chunk_size=chunk_size) as (_, _, chunks):
+                    for chunk in chunks:
+                        sink.write(chunk)
+        except BaseException:
+            sink.close(complete=False)
+            raise
+        sink.close()
+        return sink.written
+
+    def _stored(self, path: str, query: Dict[str, Any]) -> str:
+        """File path of an asset in the asset store, streaming it into the store first if needed."""
+        store: AssetStore = self.options["asset_store"]
+        versions = store.versions()
+        if versions is None:
+            versions = Versions(**self.options).raw()
+            store.update_versions(versions)
+        version, _ = DiskCache.resolve(query.get("version") or self.options.get("version") or "latest", versions)
+        asset, format = _key(path, query)
+        found = store.get(asset, format, version)
+        if found is not None:
+            return found
+
+        # A copy stored for another version is revalidated rather than downloaded again
+        previous = store.previous(asset, format)
+        headers = { "If-None-Match": previous[1] } if previous else None
+        with stream(path=path, params={ **query, "version": version }, options=self.options, defaults=(), headers=headers) as (status, response_headers, chunks):
+            if status == 304 and previous:
+                return store.link(asset, format, version, *previous)
+            return store.put(asset, format, version, chunks, response_headers.get("etag"))
+
+class AsyncAssets:
+    """
+    Asynchronous counterpart of `Assets`.
+
+    See https://v2.xivapi.com/api/docs#tag/assets
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+
+    async def get(self, params: AssetQuery) -> bytes:
+        """
+        Read an asset from the game at the specified path, converting it into a usable format (`GET /asset`).
+
+        See: https://v2.xivapi.com/api/docs#tag/assets/get/asset
+        """
+        path, query = _asset_request(params)
+        if self.options.get("asset_store") is not None:
+            return await asyncio.to_thread(_read, await self._stored(path, query))
+        data, errors = await async_request(path=path, params=query, options=self.options, defaults=("version",))
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return _body(data)
+
+    async def map(self, params: MapPath | VersionQuery | Dict[str, Any]) -> bytes:
+        """
+        Retrieve the specified map, composing it from split source files if necessary (`GET /asset/map`).
+
+        See: https://v2.xivapi.com/api/docs#tag/assets/get/asset/map/{territory}/{index}
+        """
+        path, query = _map_request(params)
+        if self.options.get("asset_store") is not None:
+            return await asyncio.to_thread(_read, await self._stored(path, query))
+        data, errors = await async_request(path=path, params=query, options=self.options, defaults=("version",))
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return _body(data)
+
+    async def download(self, params: AssetQuery | Dict[str, Any], target: Target, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Stream an asset into `target` in chunks, like `Assets.download`. Returns the number of bytes written."""
+        return await self._download(*_asset_request(params), target, chunk_size)
+
+    async def download_map(self, params: MapPath | VersionQuery | Dict[str, Any], target: Target, chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """Stream a map into `target` in chunks, like `Assets.download`. Returns the number of bytes written."""
+        return await self._download(*_map_request(params), target, chunk_size)
+
+    async def _download(self, path: str, query: Dict[str, Any], target: Target, chunk_size: int) -> int:
+        sink = Sink(target)
+        try:
+            if self.options.get("asset_store") is not None:
+                # Stored files are read off the event loop, like any other blocking file access
+                file = await asyncio.to_thread(open, await self._stored(path, query), "rb")
+                try:
+                    while chunk := await asyncio.to_thread(file.read, chunk_size):
+                        sink.write(chunk)
+                finally:
+                    file.close()
+            else:
+                async with async_stream(path=path, params=query, options=self.options, defaults=("version",), chunk_size=chunk_size) as (_, _, chunks):
+                    async for chunk in chunks:
+                        sink.write(chunk)
+        except BaseException:
+            sink.close(complete=False)
+            raise
+        sink.close()
+        return sink.written
+
+    async def _stored(self, path: str, query: Dict[str, Any]) -> str:
+        store: AssetStore = self.options["asset_store"]
+        versions = store.versions()
+        if versions is None:
+            versions = await AsyncVersions(**self.options).raw()
+            store.update_versions(versions)
+        version, _ = DiskCache.resolve(query.get("version") or self.options.get("version") or "latest", versions)
+        asset, format = _key(path, query)
+        found = store.get(asset, format, version)
+        if found is not None:
+            return found
+
+        previous = store.previous(asset, format)
+        headers = { "If-None-Match": previous[1] } if previous else None
+        async with async_stream(path=path, params={ **query, "version": version }, options=self.options, defaults=(), headers=headers) as (status, response_headers, chunks):
+            if status == 304 and previous:
+                return store.link(asset, format, version, *previous)
+            pending = store.open()
+            try:
+                async for chunk in chunks:
+                    pending.write(chunk)
+            except BaseException:
+                pending.discard()
+                raise
+            return pending.commit(asset, format, version, response_headers.get("etag"))
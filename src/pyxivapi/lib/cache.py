@@ -0,0 +1,421 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Mapping, Optional, Tuple
+
+# Raw response as stored by the caches: (status code, headers, body)
+CachedResponse = Tuple[int, Dict[str, str], bytes]
+
+# How `MemoryCache.fetch_outcome` obtained a response: from the cache, from an identical request in flight, or by loading it
+HIT, COALESCED, MISS = "hit", "coalesced", "miss"
+OUTCOMES = (HIT, COALESCED, MISS)
+
+class DiskCache:
+    """
+    Persistent single-file (SQLite) cache for sheet, search and version responses.
+
+    Entries are keyed on the request path, its normalised parameters (language included) and the concrete game version they were served for.
+    Aliases such as `latest` are resolved through the versions list before keying: entries for pinned versions never expire, while entries
+    read through an alias are dropped as soon as the versions list changes. The least recently used entries are evicted once the store
+    grows past `max_bytes`. The versions list itself is trusted for `version_ttl` seconds before it is fetched again.
+
+    See: https://v2.xivapi.com/docs/guides/pinning/#game-versions
+    """
+    def __init__(self, path: str, max_bytes: int = 512 * 1024 * 1024, version_ttl: float = 300.0) -> None:
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version_ttl = version_ttl
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY, pinned INTEGER NOT NULL, status INTEGER NOT NULL,
+                content_type TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL, etag TEXT
+            )
+        """)
+        # Entity tags are kept so that responses served again carry the tag they were first served with; older stores lack them
+        if "etag" not in { column[1] for column in self._db.execute("PRAGMA table_info(entries)") }:
+            self._db.execute("ALTER TABLE entries ADD COLUMN etag TEXT")
+        self._db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+        self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+        self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    @staticmethod
+    def accepts(path: str) -> bool:
+        """Whether responses for `path` are immutable for a given game version, and so may be cached."""
+        return path.startswith("/sheet") or path.startswith("/search") or path == "/version"
+
+    def versions(self) -> Optional[Dict[str, Any]]:
+        """The stored versions list, or `None` if it is missing or older than `version_ttl`."""
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'versions'").fetchone()
+        if row is None:
+            return None
+        stored = json.loads(row[0])
+        if time.time() - stored["fetched"] > self.version_ttl:
+            return None
+        data: Dict[str, Any] = stored["data"]
+        return data
+
+    def update_versions(self, data: Dict[str, Any]) -> None:
+        """Store a freshly fetched versions list, invalidating every alias-resolved entry if it changed."""
+        fingerprint = hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()
+        with self._lock:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'versions'").fetchone()
+            if row is not None and json.loads(row[0])["fingerprint"] != fingerprint:
+                self._db.execute("DELETE FROM entries WHERE pinned = 0")
+                self._size = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            value = json.dumps({ "fingerprint": fingerprint, "fetched": time.time(), "data": data })
+            self._db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('versions', ?)", (value,))
+
+    @staticmethod
+    def resolve(version: str, versions: Dict[str, Any]) -> Tuple[str, bool]:
+        """
+        Resolve a version name to its canonical name, and whether it was pinned (rather than an alias like `latest`).
+        Names missing from the versions list are not pinned, so what they are cached under expires with the list.
+        """
+        for metadata in versions.get("versions", []):
+            names = metadata.get("names", [])
+            if version in names:
+                return names[0], version == names[0]
+        return version, False
+
+    def key(self, path: str, params: Mapping[str, Any], versions: Dict[str, Any]) -> Tuple[str, bool]:
+        """Build the cache key for a request, returning it along with whether it targets a pinned version."""
+        normalized = {k: str(v) for k, v in params.items()}
+        version, pinned = self.resolve(normalized.pop("version", "latest"), versions)
+        normalized.setdefault("language", "")
+        raw = json.dumps([path, sorted(normalized.items()), version])
+        return hashlib.sha256(raw.encode()).hexdigest(), pinned
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._db.execute("SELECT status, content_type, body, etag FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (time.time(), key))
+        headers = { "content-type": row[1] }
+        if row[3] is not None:
+            headers["etag"] = row[3]
+        return row[0], headers, row[2]
+
+    def set(self, key: str, pinned: bool, response: CachedResponse) -> None:
+        status, headers, body = response
+        with self._lock:
+            previous = self._db.execute("SELECT size FROM entries WHERE key = ?", (key,)).fetchone()
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, pinned, status, content_type, body, size, accessed, etag) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, int(pinned), status, headers.get("content-type", ""), body, len(body), time.time(), headers.get("etag")),
+            )
+            self._size += len(body) - (previous[0] if previous else 0)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Drop least recently used entries until the store is back under 90% of its budget
+        target = self.max_bytes * 0.9
+        for key, size in self._db.execute("SELECT key, size FROM entries ORDER BY accessed").fetchall():
+            if self._size <= target:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= size
+
+    def clear(self) -> None:
+        """Remove every cached entry."""
+        with self._lock:
+            self._db.execute("DELETE FROM entries")
+            self._db.execute("DELETE FROM meta")
+            self._size = 0
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class _Flight:
+    """A request currently in flight, which concurrent callers for the same key wait on."""
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[CachedResponse] = None
+        self.error: Optional[BaseException] = None
+
+class MemoryCache:
+    """
+    In-process LRU cache for raw responses, bounded by entry count and total body size, with a time-to-live.
+
+    Concurrent requests for the same normalised URL are coalesced: the first caller sends the request and every other caller waits for
+    its response instead of sending an identical one. `stats()` reports hit, miss and coalesced counters for tuning.
+    """
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, ttl: float = 300.0) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.size = 0
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Tuple[float, CachedResponse]] = OrderedDict()
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[Tuple[asyncio.AbstractEventLoop, str], "asyncio.Future[CachedResponse]"] = {}
+
+    @staticmethod
+    def _sizeof(key: str, response: CachedResponse) -> int:
+        return len(key) + len(response[2])
+
+    def _lookup(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() > entry[0]:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _remove(self, key: str) -> None:
+        _, response = self._entries.pop(key)
+        self.size -= self._sizeof(key, response)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            return self._lookup(key)
+
+    def set(self, key: str, response: CachedResponse) -> None:
+        size = self._sizeof(key, response)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, response)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def fetch(self, key: str, load: Callable[[], CachedResponse]) -> CachedResponse:
+        """Return the cached response for `key`, calling `load` at most once across concurrent callers on a miss."""
+        return self.fetch_outcome(key, load)[0]
+
+    def fetch_outcome(self, key: str, load: Callable[[], CachedResponse]) -> Tuple[CachedResponse, str]:
+        """`fetch`, along with how the response was obtained: one of `OUTCOMES`, as counted by `stats()`."""
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self.hits += 1
+                return response, HIT
+            flight = self._flights.get(key)
+            leader = flight is None
+            if flight is None:
+                self.misses += 1
+                flight = self._flights[key] = _Flight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            assert flight.response is not None
+            return flight.response, COALESCED
+
+        try:
+            flight.response = load()
+            if flight.response[0] == 200:
+                self.set(key, flight.response)
+            return flight.response, MISS
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def async_fetch(self, key: str, load: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        """
+        Asynchronous counterpart of `fetch`, coalescing concurrent tasks on the running event loop. Flights are kept per loop, as
+        tasks cannot wait on futures of another loop.
+        """
+        return (await self.async_fetch_outcome(key, load))[0]
+
+    async def async_fetch_outcome(self, key: str, load: Callable[[], Awaitable[CachedResponse]]) -> Tuple[CachedResponse, str]:
+        """Asynchronous counterpart of `fetch_outcome`."""
+        loop = asyncio.get_running_loop()
+        flight = (loop, key)
+        with self._lock:
+            response = self._lookup(key)
+            if response is not None:
+                self.hits += 1
+                return response, HIT
+            future = self._async_flights.get(flight)
+            if future is not None:
+                self.coalesced += 1
+            else:
+                self.misses += 1
+                self._async_flights[flight] = loop.create_future()
+        if future is not None:
+            return await asyncio.shield(future), COALESCED
+
+        future = self._async_flights[flight]
+        try:
+            response = await load()
+            if response[0] == 200:
+                self.set(key, response)
+            future.set_result(response)
+            return response, MISS
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieve the exception so it is not reported as never retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            with self._lock:
+                del self._async_flights[flight]
+
+    def stats(self) -> Dict[str, int]:
+        """Counters describing how effective the cache is."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self.size,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached entry (requests in flight are unaffected)."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+class PendingAsset:
+    """An asset being written to an `AssetStore`, hashed as its chunks arrive."""
+    def __init__(self, store: "AssetStore") -> None:
+        self._store = store
+        self._hash = hashlib.sha256()
+        self._temporary = os.path.join(store.path, "objects", f".{os.getpid()}-{threading.get_ident()}-{id(self)}.part")
+        self._file = open(self._temporary, "wb")
+        self.size = 0
+
+    def write(self, chunk: bytes) -> None:
+        self._hash.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def discard(self) -> None:
+        self._file.close()
+        os.remove(self._temporary)
+
+    def commit(self, asset: str, format: str, version: str, etag: Optional[str] = None) -> str:
+        """Move the written content into the store (unless identical content is already there) and index it. Returns its file path."""
+        self._file.close()
+        digest = self._hash.hexdigest()
+        target = self._store.object_path(digest)
+        if os.path.exists(target):
+            os.remove(self._temporary)
+        else:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            os.replace(self._temporary, target)
+        return self._store.link(asset, format, version, digest, etag)
+
+class AssetStore:
+    """
+    Persistent on-disk store for assets (icons, textures, maps), written to while they are streamed.
+
+    Assets are indexed by path, format and the concrete game version they were served for, while their content is stored once per
+    SHA-256 digest: an icon that is unchanged across patches takes up space once, however many versions reference it. When an asset
+    is requested for a version not yet indexed, the copy held for another version is revalidated with its `ETag`, so unchanged content
+    is not downloaded again when the API supports conditional requests. The versions list used to resolve aliases such as `latest` is
+    trusted for `version_ttl` seconds.
+    """
+    def __init__(self, path: str, version_ttl: float = 300.0) -> None:
+        self.path = path
+        self.version_ttl = version_ttl
+        os.makedirs(os.path.join(path, "objects"), exist_ok=True)
+        self._lock = threading.Lock()
+        self._versions: Optional[Tuple[float, Dict[str, Any]]] = None
+        self._db = sqlite3.connect(os.path.join(path, "index.sqlite"), check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS assets (
+                asset TEXT NOT NULL, format TEXT NOT NULL, version TEXT NOT NULL, digest TEXT NOT NULL, etag TEXT,
+                stored REAL NOT NULL, PRIMARY KEY (asset, format, version)
+            )
+        """)
+
+    def versions(self) -> Optional[Dict[str, Any]]:
+        """The versions list last fetched, or `None` if it is missing or older than `version_ttl`."""
+        if self._versions is None or time.time() - self._versions[0] > self.version_ttl:
+            return None
+        return self._versions[1]
+
+    def update_versions(self, data: Dict[str, Any]) -> None:
+        self._versions = (time.time(), data)
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.path, "objects", digest[:2], digest)
+
+    def get(self, asset: str, format: str, version: str) -> Optional[str]:
+        """File path of the stored asset for a concrete version, if present."""
+        with self._lock:
+            row = self._db.execute("SELECT digest FROM assets WHERE asset = ? AND format = ? AND version = ?", (asset, format, version)).fetchone()
+        if row is None or not os.path.exists(self.object_path(row[0])):
+            return None
+        return self.object_path(row[0])
+
+    def previous(self, asset: str, format: str) -> Optional[Tuple[str, str]]:
+        """Digest and `ETag` of the most recently stored copy of an asset for any version, to revalidate it with."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT digest, etag FROM assets WHERE asset = ? AND format = ? AND etag IS NOT NULL ORDER BY stored DESC LIMIT 1",
+                (asset, format),
+            ).fetchone()
+        return None if row is None else (row[0], row[1])
+
+    def link(self, asset: str, format: str, version: str, digest: str, etag: Optional[str] = None) -> str:
+        """Index already stored content under another version. Returns its file path."""
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO assets (asset, format, version, digest, etag, stored) VALUES (?, ?, ?, ?, ?, ?)",
+                (asset, format, version, digest, etag, time.time()),
+            )
+        return self.object_path(digest)
+
+    def open(self) -> PendingAsset:
+        """Start writing a new asset; call `commit` once every chunk is written, or `discard` to abandon it."""
+        return PendingAsset(self)
+
+    def put(self, asset: str, format: str, version: str, chunks: Iterable[bytes], etag: Optional[str] = None) -> str:
+        """Store an asset from its chunks. Returns its file path."""
+        pending = self.open()
+        try:
+            for chunk in chunks:
+                pending.write(chunk)
+        except BaseException:
+            pending.discard()
+            raise
+        return pending.commit(asset, format, version, etag)
+
+    def stats(self) -> Dict[str, int]:
+        """Number of indexed assets, and number and total size of the distinct objects backing them."""
+        with self._lock:
+            assets, objects = self._db.execute("SELECT COUNT(*), COUNT(DISTINCT digest) FROM assets").fetchone()
+            digests = [row[0] for row in self._db.execute("SELECT DISTINCT digest FROM assets")]
+        size = sum(os.path.getsize(self.object_path(d)) for d in digests if os.path.exists(self.object_path(d)))
+        return { "assets": assets, "objects": objects, "bytes": size }
+
+    def close(self) -> None:
+        self._db.close()
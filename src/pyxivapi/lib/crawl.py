@@ -0,0 +1,199 @@
+import asyncio
+import contextvars
+import inspect
+import threading
+import time
+from concurrent.futures import FIRST_EXCEPTION, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Unpack
+from .models import ListResponse, RowResult, SchemaSpecifier, SheetQuery, SheetResponse, XIVAPIOptions
+from .session import DEFAULT_POOL_SIZE
+from .sheets import Sheets, AsyncSheets
+from . import pagination
+from ..utils import raw_request, async_raw_request, loads, parse, decode, as_model
+from ..errors import CustomError
+
+# Number of rows requested per page by the crawlers, unless overridden
+DEFAULT_CRAWL_PAGE_SIZE = 500
+
+# Receives every page of rows crawled, along with the sheet it belongs to
+Sink = Callable[[SchemaSpecifier, List[RowResult]], Any]
+
+class WorkUnit(NamedTuple):
+    """A sheet to crawl, or the range of its rows after the `after` row specifier and before the `until` row ID (both exclusive)."""
+    sheet: SchemaSpecifier
+    after: Optional[str] = None
+    until: Optional[int] = None
+
+def split(sheet: SchemaSpecifier, boundaries: Iterable[int]) -> List[WorkUnit]:
+    """Split a sheet into work units at the given row IDs, so that its ranges are crawled in parallel."""
+    units: List[WorkUnit] = []
+    after: Optional[str] = None
+    for boundary in sorted(set(boundaries)):
+        units.append(WorkUnit(sheet, after, boundary))
+        after = str(boundary - 1)
+    units.append(WorkUnit(sheet, after, None))
+    return units
+
+def _units(units: Iterable[SchemaSpecifier | WorkUnit | Tuple[Any, ...]]) -> List[WorkUnit]:
+    return [unit if isinstance(unit, WorkUnit) else WorkUnit(*unit) if isinstance(unit, tuple) else WorkUnit(unit) for unit in units]
+
+def _query(unit: WorkUnit, params: Optional[SheetQuery | Dict[str, Any]], page_size: int) -> Dict[str, Any]:
+    query = params.model_dump(exclude_none=True) if isinstance(params, SheetQuery) else dict(params or {})
+    query["limit"] = page_size
+    if unit.after is not None:
+        query["after"] = unit.after
+    return query
+
+def _page(unit: WorkUnit, rows: List[RowResult]) -> Tuple[List[RowResult], bool]:
+    """Rows of a page that belong to `unit`, and whether the unit has more rows after them."""
+    if not rows:
+        return rows, False
+    if unit.until is not None and rows[-1].row_id >= unit.until:
+        return [row for row in rows if row.row_id < unit.until], False
+    return rows, True
+
+def decode_page(body: bytes) -> List[RowResult]:
+    """Decode and validate a raw `GET /sheet/{sheet}` page. Runs in the crawlers' worker processes."""
+    return SheetResponse.model_validate_json(body).rows
+
+class Crawler:
+    """
+    Bulk fetch engine for many sheets, or ranges of their rows.
+
+    Work units are paginated `page_size` rows at a time and spread over `workers` threads, sharing the client's session, scheduler
+    and caches. Each page is handed to a caller-supplied sink as soon as it is decoded; sink calls are serialised, so the sink
+    need not be thread-safe. With `processes` set, JSON decoding and validation move to a process pool so they run on every core.
+    Large sheets can be crawled in parallel by splitting them into row ranges with `split`.
+    """
+    def __init__(self, workers: Optional[int] = None, page_size: int = DEFAULT_CRAWL_PAGE_SIZE, processes: int = 0, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+        self.workers = workers or self.options.get("pool_size", DEFAULT_POOL_SIZE)
+        self.page_size = page_size
+        self.processes = processes
+
+    def run(self, sink: Sink, units: Optional[Iterable[SchemaSpecifier | WorkUnit | Tuple[Any, ...]]] = None, params: Optional[SheetQuery | Dict[str, Any]] = None, done: Optional[Callable[[WorkUnit], Any]] = None) -> Dict[str, Any]:
+        """
+        Crawl every row of `units` (every sheet when omitted) into `sink`, returning counters for the crawl. `done` is called
+        (serialised with the sink) as each unit completes. The first error raised by a unit stops the crawl and is raised once the
+        units in progress have stopped.
+        """
+        if units is None:
+            units = [sheet.name for sheet in as_model(ListResponse, Sheets(**self.options).all()).sheets]
+        work = _units(units)
+        stats = { "units": len(work), "pages": 0, "rows": 0, "bytes": 0 }
+        lock = threading.Lock()
+        stop = threading.Event()
+        started = time.monotonic()
+        processes = ProcessPoolExecutor(self.processes) if self.processes > 0 else None
+
+        def crawl(unit: WorkUnit) -> None:
+            query = _query(unit, params, self.page_size)
+            while not stop.is_set():
+                status, headers, body = raw_request(path=f"/sheet/{unit.sheet}", params=dict(query), options=self.options)
+                if status >= 400:
+                    _, errors = parse(status, headers, body)
+                    assert errors is not None
+                    raise CustomError(errors[0]["message"])
+                if processes is not None:
+                    rows = processes.submit(decode_page, body).result()
+                else:
+                    rows = as_model(SheetResponse, decode(SheetResponse, loads(body), self.options)).rows
+                page, more = _page(unit, rows)
+                with lock:
+                    stats["pages"] += 1
+                    stats["rows"] += len(page)
+                    stats["bytes"] += len(body)
+                    if page:
+                        sink(unit.sheet, page)
+                if not more:
+                    if done is not None:
+                        with lock:
+                            done(unit)
+                    return
+                query["after"] = pagination.after(rows[-1])
+
+        try:
+            with ThreadPoolExecutor(min(self.workers, len(work)) or 1) as pool:
+                # Each unit runs in a copy of the caller's context, so context-scoped settings (e.g. deadlines) still apply to it
+                futures = [pool.submit(contextvars.copy_context().run, crawl, unit) for unit in work]
+                finished, _ = wait(futures, return_when=FIRST_EXCEPTION)
+                failures = [error for future in finished if (error := future.exception()) is not None]
+                if failures:
+                    stop.set()
+                    for future in futures:
+                        future.cancel()
+                    raise failures[0]
+        finally:
+            if processes is not None:
+                processes.shutdown()
+        return { **stats, "seconds": time.monotonic() - started }
+
+class AsyncCrawler:
+    """
+    Asynchronous counterpart of `Crawler`, running work units on `workers` concurrent tasks.
+    The sink may be a coroutine function; with `processes` set, pages are decoded in a process pool.
+    """
+    def __init__(self, workers: Optional[int] = None, page_size: int = DEFAULT_CRAWL_PAGE_SIZE, processes: int = 0, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+        self.workers = workers or self.options.get("pool_size", DEFAULT_POOL_SIZE)
+        self.page_size = page_size
+        self.processes = processes
+
+    async def run(self, sink: Callable[[SchemaSpecifier, List[RowResult]], Any | Awaitable[Any]], units: Optional[Iterable[SchemaSpecifier | WorkUnit | Tuple[Any, ...]]] = None, params: Optional[SheetQuery | Dict[str, Any]] = None, done: Optional[Callable[[WorkUnit], Any]] = None) -> Dict[str, Any]:
+        """Crawl every row of `units` (every sheet when omitted) into `sink`, returning counters for the crawl. See `Crawler.run`."""
+        if units is None:
+            units = [sheet.name for sheet in as_model(ListResponse, await AsyncSheets(**self.options).all()).sheets]
+        work: "asyncio.Queue[WorkUnit]" = asyncio.Queue()
+        for unit in _units(units):
+            work.put_nowait(unit)
+        stats = { "units": work.qsize(), "pages": 0, "rows": 0, "bytes": 0 }
+        lock = asyncio.Lock()
+        started = time.monotonic()
+        processes = ProcessPoolExecutor(self.processes) if self.processes > 0 else None
+        loop = asyncio.get_running_loop()
+
+        async def crawl(unit: WorkUnit) -> None:
+            query = _query(unit, params, self.page_size)
+            while True:
+                status, headers, body = await async_raw_request(path=f"/sheet/{unit.sheet}", params=dict(query), options=self.options)
+                if status >= 400:
+                    _, errors = parse(status, headers, body)
+                    assert errors is not None
+                    raise CustomError(errors[0]["message"])
+                if processes is not None:
+                    rows = await loop.run_in_executor(processes, decode_page, body)
+                else:
+                    rows = as_model(SheetResponse, decode(SheetResponse, loads(body), self.options)).rows
+                page, more = _page(unit, rows)
+                async with lock:
+                    stats["pages"] += 1
+                    stats["rows"] += len(page)
+                    stats["bytes"] += len(body)
+                    if page:
+                        result = sink(unit.sheet, page)
+                        if inspect.isawaitable(result):
+                            await result
+                if not more:
+                    if done is not None:
+                        async with lock:
+                            result = done(unit)
+                            if inspect.isawaitable(result):
+                                await result
+                    return
+                query["after"] = pagination.after(rows[-1])
+
+        async def worker() -> None:
+            while not work.empty():
+                await crawl(work.get_nowait())
+
+        try:
+            tasks = [asyncio.ensure_future(worker()) for _ in range(min(self.workers, work.qsize()) or 1)]
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                for task in tasks:
+                    task.cancel()
+        finally:
+            if processes is not None:
+                processes.shutdown()
+        return { **stats, "seconds": time.monotonic() - started }
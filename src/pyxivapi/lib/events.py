@@ -0,0 +1,230 @@
+import bisect
+import itertools
+import os
+import re
+import threading
+import time
+import warnings
+from collections import defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+# Kinds of events emitted while requests are made; hooks registered for "*" receive all of them
+KINDS = ("request", "response", "retry", "cache_hit", "coalesced", "error", "decode", "validate")
+
+# Upper bounds (in seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Identifies the events belonging to one request
+_ids = itertools.count(1)
+
+class Event(NamedTuple):
+    """
+    Something that happened while making a request. Which fields are set depends on `kind`:
+
+    - `request`: before a request is sent (`url`, `endpoint`, `sheet`)
+    - `response`: once its response arrived (`status`, `latency`, `bytes`)
+    - `retry`: before a failed attempt is retried (`attempt`, `status`, `delay`)
+    - `cache_hit`: a response served by the `memory` or `disk` cache, without a request
+    - `coalesced`: a response shared with an identical request already in flight (`cache="memory"`), without a request of its own
+    - `error`: a request that raised (`error`), or was answered with an error status
+    - `decode`: a JSON body parsed (`decode_time`, `bytes`)
+    - `validate`: decoded data turned into a response model (`model`, `validation_time`)
+    """
+    kind: str
+    id: int = 0
+    url: Optional[str] = None
+    endpoint: Optional[str] = None
+    sheet: Optional[str] = None
+    status: Optional[int] = None
+    latency: Optional[float] = None
+    bytes: Optional[int] = None
+    attempt: Optional[int] = None
+    delay: Optional[float] = None
+    cache: Optional[str] = None
+    error: Optional[BaseException] = None
+    decode_time: Optional[float] = None
+    validation_time: Optional[float] = None
+    model: Optional[str] = None
+    time: float = 0.0
+
+_ROUTES = (
+    (re.compile(r"^/sheet/([^/]+)/[^/]+$"), "/sheet/{sheet}/{row}"),
+    (re.compile(r"^/sheet/([^/]+)$"), "/sheet/{sheet}"),
+    (re.compile(r"^/asset/map/.+$"), "/asset/map/{territory}/{index}"),
+)
+
+def route(path: str) -> Tuple[str, Optional[str]]:
+    """Endpoint template a request path belongs to (e.g. `/sheet/{sheet}/{row}`), and the sheet it reads if any."""
+    for pattern, endpoint in _ROUTES:
+        match = pattern.match(path)
+        if match is not None:
+            return endpoint, match.group(1) if match.groups() else None
+    return path, None
+
+def next_id() -> int:
+    return next(_ids)
+
+class Hooks:
+    """
+    Registry of callbacks receiving `Event`s, shared by a client and its endpoints through the `hooks` option.
+    Handlers run synchronously in the thread making the request, so they should be cheap; errors they raise are turned into warnings.
+    """
+    def __init__(self) -> None:
+        self._handlers: Dict[str, List[Callable[[Event], Any]]] = defaultdict(list)
+
+    def on(self, kind: str, handler: Optional[Callable[[Event], Any]] = None) -> Any:
+        """Register `handler` for events of `kind` (or `*` for every event). Can also be used as a decorator."""
+        if kind != "*" and kind not in KINDS:
+            raise ValueError(f"Unknown event kind {kind!r}, expected one of {', '.join(KINDS)} or *")
+        if handler is None:
+            return lambda handler: self.on(kind, handler)
+        self._handlers[kind].append(handler)
+        return handler
+
+    def off(self, kind: str, handler: Callable[[Event], Any]) -> None:
+        self._handlers[kind].remove(handler)
+
+    def emit(self, event: Event) -> None:
+        for handler in (*self._handlers.get(event.kind, ()), *self._handlers.get("*", ())):
+            try:
+                handler(event)
+            except Exception as e:
+                warnings.warn(f"pyxivapi {event.kind} hook {handler!r} raised {e!r}", RuntimeWarning)
+
+def _labels(labels: Tuple[Tuple[str, Any], ...]) -> str:
+    if not labels:
+        return ""
+    escaped = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"' for name, value in labels)
+    return "{" + ",".join(escaped) + "}"
+
+class Metrics:
+    """
+    Aggregates events into per-endpoint (and per-sheet) counters and latency histograms. Register it for every event
+    (`hooks.on("*", metrics)`) and read it with `snapshot()`, or expose `prometheus()` from a metrics endpoint.
+    """
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, Tuple[Tuple[str, Any], ...]], float] = defaultdict(float)
+        self._histograms: Dict[Tuple[Tuple[str, Any], ...], List[float]] = {}
+
+    def __call__(self, event: Event) -> None:
+        labels = (("endpoint", event.endpoint or ""), ("sheet", event.sheet or ""))
+        with self._lock:
+            if event.kind == "response":
+                self._counters[("xivapi_requests_total", (*labels, ("status", event.status)))] += 1
+                self._counters[("xivapi_response_bytes_total", labels)] += event.bytes or 0
+                if event.latency is not None:
+                    self._observe(labels, event.latency)
+            elif event.kind == "retry":
+                self._counters[("xivapi_retries_total", labels)] += 1
+            elif event.kind == "cache_hit":
+                self._counters[("xivapi_cache_hits_total", (*labels, ("cache", event.cache)))] += 1
+            elif event.kind == "coalesced":
+                self._counters[("xivapi_coalesced_total", labels)] += 1
+            elif event.kind == "error":
+                error = type(event.error).__name__ if event.error is not None else str(event.status)
+                self._counters[("xivapi_errors_total", (*labels, ("error", error)))] += 1
+            elif event.kind == "decode":
+                self._counters[("xivapi_decode_seconds_total", labels)] += event.decode_time or 0.0
+            elif event.kind == "validate":
+                self._counters[("xivapi_validation_seconds_total", (("model", event.model),))] += event.validation_time or 0.0
+
+    def _observe(self, labels: Tuple[Tuple[str, Any], ...], latency: float) -> None:
+        # Per-bucket counts, then the sum and count of observations
+        histogram = self._histograms.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+        index = bisect.bisect_left(self.buckets, latency)
+        if index < len(self.buckets):
+            histogram[index] += 1
+        histogram[-2] += latency
+        histogram[-1] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Counters keyed by name and labels, and latency histograms (cumulative bucket counts, sum and count) per endpoint and sheet."""
+        with self._lock:
+            counters = { f"{name}{_labels(labels)}": value for (name, labels), value in self._counters.items() }
+            histograms = {}
+            for labels, values in self._histograms.items():
+                cumulative = list(itertools.accumulate(values[:len(self.buckets)]))
+                histograms[_labels(labels)] = { "buckets": dict(zip(self.buckets, cumulative)), "sum": values[-2], "count": values[-1] }
+        return { "counters": counters, "latency": histograms }
+
+    def prometheus(self) -> str:
+        """Every metric in the Prometheus text exposition format."""
+        lines: List[str] = []
+        with self._lock:
+            names = sorted({ name for name, _ in self._counters })
+            for name in names:
+                lines.append(f"# TYPE {name} counter")
+                for (other, labels), value in sorted(self._counters.items(), key=lambda item: str(item[0])):
+                    if other == name:
+                        lines.append(f"{name}{_labels(labels)} {value:g}")
+            if self._histograms:
+                lines.append("# TYPE xivapi_request_duration_seconds histogram")
+            for labels, values in sorted(self._histograms.items()):
+                for bound, count in zip((*self.buckets, "+Inf"), (*itertools.accumulate(values[:len(self.buckets)]), values[-1])):
+                    lines.append(f"xivapi_request_duration_seconds_bucket{_labels((*labels, ('le', bound)))} {count:g}")
+                lines.append(f"xivapi_request_duration_seconds_sum{_labels(labels)} {values[-2]:g}")
+                lines.append(f"xivapi_request_duration_seconds_count{_labels(labels)} {values[-1]:g}")
+        return "\n".join(lines) + "\n"
+
+class Tracer:
+    """
+    Turns request, response and error events into OpenTelemetry-style spans (names, trace and span IDs, nanosecond timestamps,
+    semantic-convention attributes and a status), keeping the last `max_spans`. Completed spans are also passed to `export`,
+    e.g. to forward them to an OpenTelemetry exporter.
+    """
+    def __init__(self, max_spans: int = 1024, export: Optional[Callable[[Dict[str, Any]], Any]] = None) -> None:
+        self.export = export
+        self._spans: Deque[Dict[str, Any]] = deque(maxlen=max_spans)
+        self._open: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Event) -> None:
+        span: Optional[Dict[str, Any]]
+        if event.kind == "request":
+            span = {
+                "name": f"GET {event.endpoint}",
+                "trace_id": os.urandom(16).hex(),
+                "span_id": os.urandom(8).hex(),
+                "kind": "CLIENT",
+                "start_time_unix_nano": int(event.time * 1e9),
+                "end_time_unix_nano": None,
+                "attributes": { "http.request.method": "GET", "url.full": event.url, "xivapi.endpoint": event.endpoint },
+                "events": [],
+                "status": { "code": "UNSET" },
+            }
+            if event.sheet is not None:
+                span["attributes"]["xivapi.sheet"] = event.sheet
+            with self._lock:
+                self._open[event.id] = span
+            return
+
+        with self._lock:
+            span = self._open.get(event.id)
+            if span is None:
+                return
+            if event.kind == "retry":
+                span["events"].append({ "name": "retry", "time_unix_nano": time.time_ns(), "attributes": { "attempt": event.attempt, "http.response.status_code": event.status } })
+                return
+            if event.kind not in ("response", "error"):
+                return
+            del self._open[event.id]
+        span["end_time_unix_nano"] = time.time_ns()
+        if event.kind == "response":
+            span["attributes"]["http.response.status_code"] = event.status
+            if event.bytes is not None:
+                span["attributes"]["http.response.body.size"] = event.bytes
+            span["status"] = { "code": "ERROR" if event.status is not None and event.status >= 400 else "OK" }
+        else:
+            span["attributes"]["error.type"] = type(event.error).__name__ if event.error is not None else str(event.status)
+            span["status"] = { "code": "ERROR", "message": str(event.error or event.status) }
+        with self._lock:
+            self._spans.append(span)
+        if self.export is not None:
+            self.export(span)
+
+    def spans(self) -> List[Dict[str, Any]]:
+        """Completed spans, oldest first."""
+        with self._lock:
+            return list(self._spans)
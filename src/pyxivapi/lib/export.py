@@ -0,0 +1,151 @@
+import glob
+import json
+import os
+import sqlite3
+from typing import Any, Callable, Dict, IO, List, Optional, Protocol
+from .models import RowResult, SchemaSpecifier
+from ..errors import CustomError
+
+def _record(row: RowResult) -> Dict[str, Any]:
+    return { "row_id": row.row_id, "subrow_id": row.subrow_id, "fields": row.fields }
+
+class Checkpoint:
+    """
+    Progress of an export, kept as JSON next to its output and replaced atomically on every save: the pinned version and language,
+    the last row exported (and writer position) per sheet, and the assets already downloaded. Downloaded assets are appended to a
+    journal (`{path}.assets`) as they complete instead, and folded into the checkpoint by the next save.
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.journal = f"{path}.assets"
+        self.state: Dict[str, Any] = { "sheets": {}, "assets": [] }
+        if os.path.exists(path):
+            with open(path) as file:
+                self.state = json.load(file)
+        if os.path.exists(self.journal):
+            with open(self.journal) as file:
+                self.state["assets"] += [line.rstrip("\n") for line in file if line.endswith("\n")]
+
+    def sheet(self, sheet: SchemaSpecifier) -> Dict[str, Any]:
+        sheets: Dict[str, Dict[str, Any]] = self.state["sheets"]
+        return sheets.setdefault(sheet, { "after": None, "position": None, "rows": 0, "done": False })
+
+    def asset(self, path: str) -> None:
+        """Record a downloaded asset, in constant time however many were recorded before."""
+        self.state["assets"].append(path)
+        with open(self.journal, "a") as file:
+            file.write(f"{path}\n")
+
+    def save(self) -> None:
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(self.state, file)
+        os.replace(temporary, self.path)
+        if os.path.exists(self.journal):
+            os.remove(self.journal)
+
+    def reset(self) -> None:
+        self.state = { "sheets": {}, "assets": [] }
+        for path in (self.path, self.journal):
+            if os.path.exists(path):
+                os.remove(path)
+
+class Writer(Protocol):
+    """
+    Output of a sheet export. `resume` is called for every sheet before its rows are written, with the position `write` last
+    returned for it, or `None` to start the sheet over.
+    """
+    def resume(self, sheet: SchemaSpecifier, position: Optional[int]) -> None: ...
+    def write(self, sheet: SchemaSpecifier, rows: List[RowResult]) -> int: ...
+    def close(self) -> None: ...
+
+class JsonlWriter:
+    """Writes each sheet to `{sheet}.jsonl`, one row per line. Positions are byte offsets, so a resumed export drops partial writes."""
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self._files: Dict[str, IO[bytes]] = {}
+
+    def resume(self, sheet: SchemaSpecifier, position: Optional[int]) -> None:
+        file = open(os.path.join(self.directory, f"{sheet}.jsonl"), "r+b" if position is not None else "wb")
+        if position is not None:
+            file.truncate(position)
+            file.seek(position)
+        self._files[sheet] = file
+
+    def write(self, sheet: SchemaSpecifier, rows: List[RowResult]) -> int:
+        file = self._files[sheet]
+        file.write(b"".join(json.dumps(_record(row), separators=(",", ":")).encode() + b"\n" for row in rows))
+        file.flush()
+        return file.tell()
+
+    def close(self) -> None:
+        for file in self._files.values():
+            file.close()
+
+class SqliteWriter:
+    """
+    Writes every sheet to its own table of `export.sqlite`. Positions are row counts: rows are upserted by ID, so a resumed export
+    simply replaces the rows written after the last checkpoint, while a sheet started over (or at another version) is cleared.
+    """
+    def __init__(self, directory: str) -> None:
+        # Writes are serialised by the crawler, but come from its worker threads
+        self._db = sqlite3.connect(os.path.join(directory, "export.sqlite"), check_same_thread=False)
+        self._rows: Dict[str, int] = {}
+
+    def resume(self, sheet: SchemaSpecifier, position: Optional[int]) -> None:
+        if position is None:
+            self._db.execute(f'DROP TABLE IF EXISTS "{sheet}"')
+        self._db.execute(f'CREATE TABLE IF NOT EXISTS "{sheet}" (row_id INTEGER NOT NULL, subrow_id INTEGER NOT NULL, fields TEXT NOT NULL, PRIMARY KEY (row_id, subrow_id))')
+        self._db.commit()
+        self._rows[sheet] = position or 0
+
+    def write(self, sheet: SchemaSpecifier, rows: List[RowResult]) -> int:
+        self._db.executemany(
+            f'INSERT OR REPLACE INTO "{sheet}" (row_id, subrow_id, fields) VALUES (?, ?, ?)',
+            [(row.row_id, -1 if row.subrow_id is None else row.subrow_id, json.dumps(row.fields)) for row in rows],
+        )
+        self._db.commit()
+        self._rows[sheet] += len(rows)
+        return self._rows[sheet]
+
+    def close(self) -> None:
+        self._db.close()
+
+class ParquetWriter:
+    """
+    Writes each sheet as numbered Parquet parts under `{sheet}/`, with fields stored as JSON. Positions are part counts, so parts
+    written after the last checkpoint are removed when resuming. Requires `pyarrow` (`pip install pyxivapi[parquet]`).
+    """
+    def __init__(self, directory: str) -> None:
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise CustomError("Parquet exports require pyarrow, install it with `pip install pyxivapi[parquet]`") from e
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self.directory = directory
+        self._parts: Dict[str, int] = {}
+
+    def resume(self, sheet: SchemaSpecifier, position: Optional[int]) -> None:
+        folder = os.path.join(self.directory, sheet)
+        os.makedirs(folder, exist_ok=True)
+        self._parts[sheet] = position or 0
+        for part in glob.glob(os.path.join(folder, "part-*.parquet")):
+            if int(os.path.basename(part)[5:-8]) >= self._parts[sheet]:
+                os.remove(part)
+
+    def write(self, sheet: SchemaSpecifier, rows: List[RowResult]) -> int:
+        table = self._pa.table({
+            "row_id": [row.row_id for row in rows],
+            "subrow_id": [row.subrow_id for row in rows],
+            "fields": [json.dumps(row.fields) for row in rows],
+        })
+        self._pq.write_table(table, os.path.join(self.directory, sheet, f"part-{self._parts[sheet]:06}.parquet"))
+        self._parts[sheet] += 1
+        return self._parts[sheet]
+
+    def close(self) -> None:
+        pass
+
+WRITERS: Dict[str, Callable[[str], Writer]] = { "jsonl": JsonlWriter, "sqlite": SqliteWriter, "parquet": ParquetWriter }
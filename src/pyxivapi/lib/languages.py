@@ -0,0 +1,161 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple, Unpack
+from .models import RowReaderQuery, RowResponse, RowsResponse, SchemaLanguage, SheetQuery, SheetResponse, SchemaSpecifier, XIVAPIOptions
+from .sheets import DEFAULT_BATCH_SIZE, Sheets, AsyncSheets, fetch_batches, match
+from ..utils import as_model
+
+# Every language game data is available in
+LANGUAGES: Tuple[str, ...] = tuple(language.value for language in SchemaLanguage if language is not SchemaLanguage.none)
+
+class Localized(Dict[str, Any]):
+    """Value of a field that differs between languages, keyed on the language."""
+
+def merge(values: Mapping[str, Any]) -> Any:
+    """
+    Merge the values of one field in several languages (keyed on the language). Values equal in every language are kept once;
+    related rows and arrays are merged item by item, so that only the values that actually differ become `Localized`.
+    """
+    first = next(iter(values.values()))
+    if all(value == first for value in values.values()):
+        return first
+    if all(isinstance(value, dict) for value in values.values()) and all(value.keys() == first.keys() for value in values.values()):
+        return { key: merge({ language: value[key] for language, value in values.items() }) for key in first }
+    if all(isinstance(value, list) for value in values.values()) and all(len(value) == len(first) for value in values.values()):
+        return [merge({ language: value[index] for language, value in values.items() }) for index in range(len(first))]
+    return Localized(values)
+
+def localize(value: Any, language: str) -> Any:
+    """A merged value as read in `language`."""
+    if isinstance(value, Localized):
+        return value.get(language)
+    if isinstance(value, dict):
+        return { key: localize(item, language) for key, item in value.items() }
+    if isinstance(value, list):
+        return [localize(item, language) for item in value]
+    return value
+
+class MultilingualRow(NamedTuple):
+    """Row fetched in several languages, holding the fields that differ between them as `Localized` values."""
+    row_id: int
+    """ID of this row."""
+    subrow_id: Optional[int]
+    """Subrow ID of this row, when relevant."""
+    fields: Dict[str, Any]
+    """Merged field values."""
+    languages: Tuple[str, ...]
+    """Languages the row was fetched in."""
+
+    def in_language(self, language: str) -> Dict[str, Any]:
+        """Field values of the row in `language`."""
+        if language not in self.languages:
+            raise KeyError(language)
+        fields: Dict[str, Any] = localize(self.fields, language)
+        return fields
+
+class MultilingualRows(NamedTuple):
+    """Counterpart of `RowsResponse` for rows fetched in several languages, returned by `MultilingualSheet.get_many`."""
+    rows: List[MultilingualRow]
+    """Rows found, in the order their IDs were first requested."""
+    by_id: Dict[str, MultilingualRow]
+    """Rows found, keyed on the requested row ID (`row` or `row:subrow`)."""
+    missing: List[str]
+    """Requested row IDs the sheet has no row for, in every language."""
+
+def combine(languages: Sequence[str], rows: Mapping[str, Iterable[Any]]) -> List[MultilingualRow]:
+    """
+    Merge the rows (`RowResult`s) fetched in each language into one row per row ID, in the order they were first seen. Rows
+    missing from some of the languages are merged from those they were found in.
+    """
+    by_key: Dict[Tuple[int, Optional[int]], Dict[str, Any]] = {}
+    for language in languages:
+        for row in rows[language]:
+            by_key.setdefault((row.row_id, row.subrow_id), {})[language] = row.fields
+    return [
+        MultilingualRow(row_id, subrow_id, merge(fields), tuple(fields))
+        for (row_id, subrow_id), fields in by_key.items()
+    ]
+
+def _params(params: Optional[RowReaderQuery | SheetQuery | Dict[str, Any]], language: str, model: Any) -> Any:
+    query = model() if params is None else model(**params) if isinstance(params, dict) else params
+    return query.model_copy(update={ "language": language })
+
+class MultilingualSheet:
+    """
+    Endpoint reading the rows of one sheet in several languages at once, returned by `Sheet.multilingual()`.
+
+    Each language is requested concurrently, and the responses are merged into one `MultilingualRow` per row. Values equal in every
+    language (numbers, flags, most related rows) are kept once, and only those that differ hold one value per language.
+
+    See: `Sheet`
+    """
+    def __init__(self, sheet: SchemaSpecifier, languages: Sequence[str] = LANGUAGES, **options: Unpack[XIVAPIOptions]) -> None:
+        self.type = sheet
+        self.languages = tuple(languages)
+        self.options = XIVAPIOptions(**options)
+        self.raw = Sheets(**self.options)
+
+    def _each(self, fetch: Any) -> Dict[str, Any]:
+        # The languages are fetched in parallel; each may itself send its batches in parallel
+        responses = fetch_batches(lambda language: [(language, fetch(language))], list(self.languages), len(self.languages))
+        return dict(responses)
+
+    def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> MultilingualRow:
+        """Fetch a single row from the sheet in every language (`GET /sheet/{sheet}/{row}`)."""
+        responses = self._each(lambda language: as_model(RowResponse, self.raw.get(self.type, str(row_id), _params(params, language, RowReaderQuery))))
+        return combine(self.languages, { language: [response] for language, response in responses.items() })[0]
+
+    def list(self, params: Optional[SheetQuery] = None) -> List[MultilingualRow]:
+        """Fetch multiple rows from the sheet in every language (`GET /sheet/{sheet}`)."""
+        responses = self._each(lambda language: as_model(SheetResponse, self.raw.list(self.type, _params(params, language, SheetQuery))).rows)
+        return combine(self.languages, responses)
+
+    def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> MultilingualRows:
+        """
+        Fetch many rows from the sheet in every language, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        See: `Sheets.get_many`
+        """
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+        responses = self._each(lambda language: as_model(RowsResponse, self.raw.get_many(self.type, row_ids, _params(params, language, RowReaderQuery), batch_size)).rows)
+        by_id, missing = match(row_ids, combine(self.languages, responses))
+        return MultilingualRows(list(by_id.values()), by_id, missing)
+
+class AsyncMultilingualSheet:
+    """
+    Asynchronous counterpart of `MultilingualSheet`, returned by `AsyncSheet.multilingual()`.
+
+    See: `MultilingualSheet`
+    """
+    def __init__(self, sheet: SchemaSpecifier, languages: Sequence[str] = LANGUAGES, **options: Unpack[XIVAPIOptions]) -> None:
+        self.type = sheet
+        self.languages = tuple(languages)
+        self.options = XIVAPIOptions(**options)
+        self.raw = AsyncSheets(**self.options)
+
+    async def _each(self, fetch: Any) -> Dict[str, Any]:
+        return dict(zip(self.languages, await asyncio.gather(*(fetch(language) for language in self.languages))))
+
+    async def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> MultilingualRow:
+        """Fetch a single row from the sheet in every language (`GET /sheet/{sheet}/{row}`)."""
+        async def fetch(language: str) -> List[Any]:
+            return [as_model(RowResponse, await self.raw.get(self.type, str(row_id), _params(params, language, RowReaderQuery)))]
+        return combine(self.languages, await self._each(fetch))[0]
+
+    async def list(self, params: Optional[SheetQuery] = None) -> List[MultilingualRow]:
+        """Fetch multiple rows from the sheet in every language (`GET /sheet/{sheet}`)."""
+        async def fetch(language: str) -> List[Any]:
+            return as_model(SheetResponse, await self.raw.list(self.type, _params(params, language, SheetQuery))).rows
+        return combine(self.languages, await self._each(fetch))
+
+    async def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> MultilingualRows:
+        """
+        Fetch many rows from the sheet in every language, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        See: `AsyncSheets.get_many`
+        """
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+
+        async def fetch(language: str) -> List[Any]:
+            return as_model(RowsResponse, await self.raw.get_many(self.type, row_ids, _params(params, language, RowReaderQuery), batch_size)).rows
+        by_id, missing = match(row_ids, combine(self.languages, await self._each(fetch)))
+        return MultilingualRows(list(by_id.values()), by_id, missing)
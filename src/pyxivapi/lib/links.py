@@ -0,0 +1,205 @@
+import asyncio
+import re
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Unpack
+from pydantic import BaseModel
+from .models import FilterString, XIVAPIOptions
+from .session import DEFAULT_POOL_SIZE
+from .sheets import DEFAULT_BATCH_SIZE, batches, fetch_batches
+from ..utils import request, async_request, normalize
+from ..errors import CustomError
+
+# Rows fetched to resolve the links of one response, unless overridden
+DEFAULT_MAX_ROWS = 1000
+
+Key = Tuple[str, int]
+Pending = List[Tuple[Dict[str, Any], List[str]]]
+
+def segments(path: str) -> List[str]:
+    """Split a link path such as `BaseParam[].ItemSortCategory` into its fields and `[]` array markers."""
+    return re.findall(r"\[\]|[^.\[\]]+", path)
+
+def row_fields(response: Any) -> Iterator[Dict[str, Any]]:
+    """Field dicts of every row or result held by a response: a row, a page of rows or search results, models or raw dicts."""
+    if isinstance(response, BaseModel):
+        for name in ("rows", "results"):
+            items = getattr(response, name, None)
+            if items is not None:
+                for item in items:
+                    yield item.fields
+                return
+        yield getattr(response, "fields")
+        return
+    items = response.get("rows", response.get("results"))
+    if items is None:
+        yield response["fields"]
+        return
+    for item in items:
+        yield item["fields"]
+
+def references(fields: Dict[str, Any], path: List[str]) -> Iterator[Tuple[Dict[str, Any], List[str]]]:
+    """
+    Related-row references at the first field of `path` (every item of it, when followed by `[]`), along with the rest of the path,
+    which continues from the fields of each referenced row.
+    """
+    value, rest = fields.get(path[0]), path[1:]
+    values = [value]
+    if rest[:1] == ["[]"]:
+        values, rest = value if isinstance(value, list) else [], rest[1:]
+    for item in values:
+        if isinstance(item, dict) and item.get("sheet") and item.get("row_id") is not None:
+            yield item, rest
+
+class _Resolver:
+    def __init__(self, paths: Iterable[str], depth: Optional[int] = None, max_rows: int = DEFAULT_MAX_ROWS, fields: Optional[Mapping[str, FilterString]] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, **options: Unpack[XIVAPIOptions]) -> None:
+        self.paths = [segments(path) for path in paths]
+        self.depth = depth
+        self.max_rows = max_rows
+        self.fields = dict(fields or {})
+        self.batch_size = batch_size
+        self.options = XIVAPIOptions(**options)
+        self._stats = { "references": 0, "memo_hits": 0, "requests": 0, "rows": 0, "unresolved": 0 }
+        self._lock = threading.Lock()
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Totals over every resolved response: references found, those served from the memo (or already expanded by the API),
+        requests sent, rows fetched, and references left unresolved (missing rows, or over `max_rows`).
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _count(self, **counts: int) -> None:
+        with self._lock:
+            for name, count in counts.items():
+                self._stats[name] += count
+
+    def _collect(self, pending: Pending, memo: Dict[Key, Dict[str, Any]], budget: int) -> Tuple[Dict[Key, List[Tuple[Dict[str, Any], List[str]]]], Dict[str, List[str]]]:
+        """References found from `pending`, grouped by the row they point at, and the row IDs to fetch per sheet (at most `budget`)."""
+        found: Dict[Key, List[Tuple[Dict[str, Any], List[str]]]] = {}
+        for fields, path in pending:
+            for reference, rest in references(fields, path):
+                key = (reference["sheet"], int(reference["row_id"]))
+                # References the API already expanded need no request
+                if reference.get("fields"):
+                    memo.setdefault(key, reference["fields"])
+                found.setdefault(key, []).append((reference, rest))
+        wanted: Dict[str, List[str]] = {}
+        for sheet, row_id in found:
+            if (sheet, row_id) in memo:
+                continue
+            if budget <= 0:
+                break
+            wanted.setdefault(sheet, []).append(str(row_id))
+            budget -= 1
+        self._count(references=sum(len(refs) for refs in found.values()), memo_hits=sum(len(refs) for key, refs in found.items() if key in memo))
+        return found, wanted
+
+    def _work(self, wanted: Dict[str, List[str]]) -> Tuple[Dict[str, Dict[str, Any]], List[Tuple[str, List[str]]]]:
+        """Normalised parameters per sheet, and the `(sheet, rows)` batches to fetch."""
+        params = { sheet: normalize({ "fields": self.fields[sheet] } if sheet in self.fields else {}, self.options) for sheet in wanted }
+        work = [(sheet, batch) for sheet, ids in wanted.items() for batch in batches(f"/sheet/{sheet}", params[sheet], ids, self.batch_size)]
+        return params, work
+
+    def _stitch(self, found: Dict[Key, List[Tuple[Dict[str, Any], List[str]]]], memo: Dict[Key, Dict[str, Any]]) -> Pending:
+        """Fill referenced rows in from the memo, returning where the next level of links is to be looked for."""
+        pending: Pending = []
+        unresolved = 0
+        for key, refs in found.items():
+            fields = memo.get(key)
+            for reference, rest in refs:
+                if fields is None:
+                    unresolved += 1
+                    continue
+                reference["fields"] = fields
+                if rest:
+                    pending.append((fields, rest))
+        self._count(unresolved=unresolved)
+        return pending
+
+    def _start(self, response: Any, memo: Optional[Dict[Key, Dict[str, Any]]]) -> Tuple[Pending, Dict[Key, Dict[str, Any]]]:
+        memo = memo if memo is not None else {}
+        pending: Pending = []
+        for fields in row_fields(response):
+            for path in self.paths:
+                if path:
+                    pending.append((fields, path))
+        return pending, memo
+
+    def _levels(self) -> Iterator[int]:
+        level = 0
+        while self.depth is None or level < self.depth:
+            yield level
+            level += 1
+
+class Resolver(_Resolver):
+    """
+    Resolves links to other sheets in fetched rows, DataLoader-style: the references found at the opted-in field `paths` of every
+    row in a response are deduplicated, fetched with as few batched `rows=` requests as possible (sent in parallel), and stitched
+    back in as the `fields` of each reference.
+
+    Paths follow links level by level (`ItemUICategory.ItemSortCategory`, `BaseParam[]`), up to `depth` levels when given. Rows
+    are fetched with the `fields` selected for their sheet, at most `max_rows` per response; references beyond that, or to rows
+    that do not exist, are left as they are.
+
+        resolver = Resolver(["ItemUICategory", "ClassJobCategory"], fields={ "ClassJobCategory": "Name" }, **xiv.options)
+        results = resolver.resolve(xiv.search({ "query": 'Name~"sword"', "sheets": "Item", "fields": "Name,ItemUICategory,ClassJobCategory" }))
+    """
+    def resolve(self, response: Any, memo: Optional[Dict[Key, Dict[str, Any]]] = None) -> Any:
+        """
+        Resolve the links of `response` in place, and return it. Rows fetched are kept in `memo` (a fresh one per call unless
+        given), keyed on `(sheet, row_id)`, so sharing it across calls avoids fetching the same rows again.
+        """
+        pending, memo = self._start(response, memo)
+        budget = self.max_rows
+        for _ in self._levels():
+            if not pending:
+                break
+            found, wanted = self._collect(pending, memo, budget)
+            budget -= sum(len(ids) for ids in wanted.values())
+            params, work = self._work(wanted)
+
+            def fetch(batch: Tuple[str, List[str]]) -> List[Tuple[str, Dict[str, Any]]]:
+                sheet, rows = batch
+                data, errors = request(path=f"/sheet/{sheet}", params={ **params[sheet], "rows": ",".join(rows), "limit": len(rows) }, options=self.options)
+                if errors:
+                    raise CustomError(errors[0]["message"])
+                return [(sheet, row) for row in data["rows"]]
+
+            fetched = fetch_batches(fetch, work, self.options.get("pool_size", DEFAULT_POOL_SIZE))
+            for sheet, row in fetched:
+                memo.setdefault((sheet, int(row["row_id"])), row["fields"])
+            self._count(requests=len(work), rows=len(fetched))
+            pending = self._stitch(found, memo)
+        return response
+
+class AsyncResolver(_Resolver):
+    """
+    Asynchronous counterpart of `Resolver`, for `AsyncXIVAPI` options.
+
+    See: `Resolver`
+    """
+    async def resolve(self, response: Any, memo: Optional[Dict[Key, Dict[str, Any]]] = None) -> Any:
+        """See: `Resolver.resolve`"""
+        pending, memo = self._start(response, memo)
+        budget = self.max_rows
+        for _ in self._levels():
+            if not pending:
+                break
+            found, wanted = self._collect(pending, memo, budget)
+            budget -= sum(len(ids) for ids in wanted.values())
+            params, work = self._work(wanted)
+
+            async def fetch(sheet: str, rows: List[str]) -> List[Tuple[str, Dict[str, Any]]]:
+                data, errors = await async_request(path=f"/sheet/{sheet}", params={ **params[sheet], "rows": ",".join(rows), "limit": len(rows) }, options=self.options)
+                if errors:
+                    raise CustomError(errors[0]["message"])
+                return [(sheet, row) for row in data["rows"]]
+
+            fetched = [item for items in await asyncio.gather(*(fetch(sheet, rows) for sheet, rows in work)) for item in items]
+            for sheet, row in fetched:
+                memo.setdefault((sheet, int(row["row_id"])), row["fields"])
+            self._count(requests=len(work), rows=len(fetched))
+            pending = self._stitch(found, memo)
+        return response
@@ -0,0 +1,267 @@
+import bisect
+import json
+import mmap
+import os
+import struct
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Sequence, Tuple, Union, Unpack, overload
+from .models import RowResult, SheetQuery, SchemaLanguage, SchemaSpecifier, XIVAPIOptions
+from .sheets import Sheets
+from .versions import Versions
+from .cache import DiskCache
+from ..utils import loads
+from ..errors import CustomError
+
+# File signature and header layout: magic, then the byte length of the JSON header that follows
+MAGIC = b"XIVMIRR1"
+HEADER = struct.Struct("<8sQ")
+
+# Memoryview formats sections are read with
+Format = Literal["q", "d", "?", "B"]
+
+# Fixed-width column types and the memoryview format they are read with
+FIXED: Dict[str, Format] = { "int": "q", "float": "d", "bool": "?" }
+
+# Integers a float column can hold exactly; wider integers are kept in JSON instead
+EXACT_FLOAT = 2**53
+
+def _align(position: int) -> int:
+    return position + -position % 8
+
+def _column_type(values: List[Any]) -> str:
+    """
+    Narrowest column type able to hold every value exactly, falling back to JSON for mixed, nested or missing values, and for
+    integers too wide for the fixed-width columns.
+    """
+    if all(isinstance(v, bool) for v in values):
+        return "bool"
+    if all(isinstance(v, int) and not isinstance(v, bool) and -2**63 <= v < 2**63 for v in values):
+        return "int"
+    if all(isinstance(v, float) or (isinstance(v, int) and not isinstance(v, bool) and -EXACT_FLOAT <= v <= EXACT_FLOAT) for v in values):
+        return "float"
+    if all(isinstance(v, str) for v in values):
+        return "str"
+    return "json"
+
+def _wide(value: Any) -> bool:
+    """Whether `value` holds an integer outside the 64-bit range, anywhere in its nested lists and dicts."""
+    if isinstance(value, dict):
+        return any(_wide(v) for v in value.values())
+    if isinstance(value, list):
+        return any(_wide(v) for v in value)
+    return isinstance(value, int) and not -2**63 <= value < 2**63
+
+class StringColumn(Sequence[Any]):
+    """Variable-width column backed by an offsets array and a data blob in the mapped file, decoded on access."""
+    def __init__(self, offsets: "memoryview[int]", data: "memoryview[int]", kind: str, decode: Callable[[bytes], Any] = loads) -> None:
+        self._offsets = offsets
+        self._data = data
+        self._kind = kind
+        self._decode = decode
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+    @overload
+    def __getitem__(self, index: slice) -> List[Any]: ...
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        raw = bytes(self._data[self._offsets[index]:self._offsets[index + 1]])
+        return raw.decode() if self._kind == "str" else self._decode(raw)
+
+    def release(self) -> None:
+        self._offsets.release()
+        self._data.release()
+
+class Mirror:
+    """
+    Read-only, memory-mapped copy of a sheet for one game version and language.
+
+    Mirrors are stored in a compact single-file columnar layout: row and subrow IDs plus fixed-width columns are raw little-endian
+    arrays read with zero copies, while strings and nested values are stored as offsets into a data blob and only decoded when
+    accessed. Files are mapped read-only, so several processes opening the same mirror share one copy through the page cache.
+
+    Use `Mirror.download` to create a mirror from the API, or `Mirror.write` to create one from rows already fetched.
+    """
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+        magic, length = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            self._view.release()
+            self._map.close()
+            raise CustomError(f"{self.path} is not a sheet mirror")
+        header = json.loads(str(self._view[HEADER.size:HEADER.size + length], "utf-8"))
+        self._start = _align(HEADER.size + length)
+
+        self.sheet: SchemaSpecifier = header["sheet"]
+        self.version: str = header["version"]
+        self.language: str = header["language"]
+        self.types: Dict[str, str] = { name: column["type"] for name, column in header["columns"].items() }
+        self._wide = { name for name, column in header["columns"].items() if column.get("wide") }
+        self._sections: Dict[str, List[int]] = header["sections"]
+        self._columns: Dict[str, Union["memoryview[Any]", StringColumn]] = {}
+
+        self.row_ids = self._section("row_id", "q")
+        self.subrow_ids = self._section("subrow_id", "q")
+
+    def _section(self, name: str, fmt: Format) -> "memoryview[Any]":
+        start, length = self._sections[name]
+        start += self._start
+        return self._view[start:start + length].cast(fmt)
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self.types)
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def column(self, name: str) -> Sequence[Any]:
+        """Zero-copy view of a whole column, in row order. Fixed-width columns are returned as typed memoryviews."""
+        if name not in self._columns:
+            if name not in self.types:
+                raise CustomError(f"Column {name} is not part of the {self.sheet} mirror")
+            kind = self.types[name]
+            if kind in FIXED:
+                self._columns[name] = self._section(name, FIXED[kind])
+            else:
+                # orjson and msgspec reject integers wider than 64 bits, so columns holding them decode with the standard library
+                decode = json.loads if name in self._wide else loads
+                self._columns[name] = StringColumn(self._section(f"{name}.offsets", "q"), self._section(name, "B"), kind, decode)
+        return self._columns[name]
+
+    def index(self, row_id: int, subrow_id: Optional[int] = None) -> Optional[int]:
+        """Position of a row in the mirror, found by binary search over the sorted row IDs."""
+        position = bisect.bisect_left(self.row_ids, row_id)
+        while position < len(self.row_ids) and self.row_ids[position] == row_id:
+            if subrow_id is None or self.subrow_ids[position] == subrow_id:
+                return position
+            position += 1
+        return None
+
+    def row(self, position: int, columns: Optional[Iterable[str]] = None) -> RowResult:
+        """Materialise the row at `position`, limited to `columns` when provided."""
+        subrow_id = self.subrow_ids[position]
+        fields = { name: self.column(name)[position] for name in (columns if columns is not None else self.types) }
+        return RowResult.model_construct(fields=fields, row_id=self.row_ids[position], subrow_id=None if subrow_id < 0 else subrow_id, transient=None)
+
+    def get(self, row_id: int, subrow_id: Optional[int] = None, columns: Optional[Iterable[str]] = None) -> Optional[RowResult]:
+        """Look up a single row by ID, limited to `columns` when provided."""
+        position = self.index(row_id, subrow_id)
+        return None if position is None else self.row(position, columns)
+
+    def rows(self, columns: Optional[Iterable[str]] = None) -> Iterator[RowResult]:
+        """Iterate every row in ID order, limited to `columns` when provided."""
+        projection = list(columns) if columns is not None else None
+        for position in range(len(self)):
+            yield self.row(position, projection)
+
+    def close(self) -> None:
+        """Release every view and unmap the file."""
+        for column in self._columns.values():
+            column.release()
+        self._columns.clear()
+        for view in (self.row_ids, self.subrow_ids, self._view):
+            view.release()
+        self._map.close()
+
+    def __enter__(self) -> "Mirror":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def write(path: str | os.PathLike[str], rows: Iterable[RowResult], *, sheet: SchemaSpecifier, version: str, language: str = "") -> None:
+        """
+        Write `rows` to a mirror file at `path`, replacing it atomically once complete.
+
+        `rows` is consumed in a single pass and only the field values are kept, column by column, so rows can be streamed in
+        from the API. The values and their encoded sections are still held in memory until the file is written, which takes
+        roughly twice the size of the finished mirror.
+        """
+        ids: List[Tuple[int, int]] = []
+        table: Dict[str, List[Any]] = {}
+        for row in rows:
+            for name, value in row.fields.items():
+                if name not in table:
+                    table[name] = [None] * len(ids)
+                table[name].append(value)
+            ids.append((row.row_id, -1 if row.subrow_id is None else row.subrow_id))
+            for values in table.values():
+                if len(values) < len(ids):
+                    values.append(None)
+
+        # Rows from the API are already in ID order; anything else is sorted through one permutation shared by every column
+        order = sorted(range(len(ids)), key=ids.__getitem__)
+        if any(position != index for index, position in enumerate(order)):
+            ids = [ids[position] for position in order]
+            table = { name: [values[position] for position in order] for name, values in table.items() }
+
+        sections: List[Tuple[str, bytes]] = [
+            ("row_id", struct.pack(f"<{len(ids)}q", *(row_id for row_id, _ in ids))),
+            ("subrow_id", struct.pack(f"<{len(ids)}q", *(subrow_id for _, subrow_id in ids))),
+        ]
+        columns: Dict[str, Dict[str, Any]] = {}
+        for name in list(table):
+            values = table.pop(name)
+            kind = _column_type(values)
+            columns[name] = { "type": kind }
+            if kind in FIXED:
+                sections.append((name, struct.pack(f"<{len(values)}{FIXED[kind]}", *values)))
+                continue
+            if kind == "json" and any(_wide(v) for v in values):
+                columns[name]["wide"] = True
+            encoded = [(v if isinstance(v, str) and kind == "str" else json.dumps(v, separators=(",", ":"))).encode() for v in values]
+            offsets = [0]
+            for chunk in encoded:
+                offsets.append(offsets[-1] + len(chunk))
+            sections.append((f"{name}.offsets", struct.pack(f"<{len(offsets)}q", *offsets)))
+            sections.append((name, b"".join(encoded)))
+
+        # Sections follow the header, each aligned to 8 bytes; offsets are relative to the end of the header
+        layout: Dict[str, List[int]] = {}
+        position = 0
+        for name, data in sections:
+            position += -position % 8
+            layout[name] = [position, len(data)]
+            position += len(data)
+        header = { "sheet": sheet, "version": version, "language": language, "columns": columns, "sections": layout }
+        encoded_header = json.dumps(header, separators=(",", ":")).encode()
+        start = _align(HEADER.size + len(encoded_header))
+
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(HEADER.pack(MAGIC, len(encoded_header)))
+            file.write(encoded_header)
+            for name, data in sections:
+                file.write(b"\0" * (start + layout[name][0] - file.tell()))
+                file.write(data)
+        os.replace(temporary, path)
+
+    @classmethod
+    def download(cls, path: str | os.PathLike[str], sheet: SchemaSpecifier, params: Optional[SheetQuery] = None, page_size: int = 500, **options: Unpack[XIVAPIOptions]) -> "Mirror":
+        """
+        Download every row of `sheet` for the version and language in `options` into a mirror at `path`, and open it.
+
+        The version is resolved through the versions list, so a mirror of `latest` records the concrete version it was taken from.
+        Pages are streamed into `Mirror.write`, see it for the memory the mirror takes while it is built.
+        """
+        versions = Versions(**options).raw()
+        version, _ = DiskCache.resolve(options.get("version") or "latest", versions)
+        pinned = XIVAPIOptions(**options)
+        pinned["version"] = version
+
+        language = pinned.get("language") or ""
+        if isinstance(language, SchemaLanguage):
+            language = language.value
+        cls.write(path, Sheets(**pinned).iter_rows(sheet, params, page_size=page_size), sheet=sheet, version=version, language=language)
+        return cls(path)
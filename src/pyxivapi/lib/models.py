@@ -1,8 +1,20 @@
-from pydantic import BaseModel
-from typing import Dict, List, Optional, Union, Any, TypedDict, NotRequired
+from pydantic import BaseModel, ConfigDict
+from typing import TYPE_CHECKING, Dict, List, Literal, NamedTuple, Optional, Union, Any, TypedDict, NotRequired
 from enum import Enum
 
-class VersionQuery(BaseModel):
+if TYPE_CHECKING:
+    from .cache import AssetStore, DiskCache, MemoryCache
+    from .events import Hooks
+    from .query import SearchBackend
+    from .resilience import CircuitBreaker, Hedger
+    from .scheduler import Scheduler
+    from .session import AsyncTransport, Transport
+
+class Model(BaseModel):
+    """Base of every model, whose validators are built the first time they are used rather than when the module is imported."""
+    model_config = ConfigDict(defer_build=True)
+
+class VersionQuery(Model):
     """
     Query parameters accepted by endpoints that interact with versioned game data.
     
@@ -17,7 +29,7 @@ class SchemaFormat(str, Enum):
     png = "png"
     webp = "webp"
     
-class AssetQuery(BaseModel):
+class AssetQuery(Model):
     """
     Query parameters accepted by the asset endpoint.
     
@@ -28,7 +40,7 @@ class AssetQuery(BaseModel):
     """Game path of the asset to retrieve. E.g. `ui/icon/051000/051474_hr1.tex`"""
 
     
-class ErrorResponse(BaseModel):
+class ErrorResponse(Model):
     """
     General purpose error response structure.
     
@@ -40,7 +52,7 @@ class ErrorResponse(BaseModel):
 
 # status code
 
-class MapPath(BaseModel):
+class MapPath(Model):
     """
     Path segments expected by the asset map endpoint.
     
@@ -59,26 +71,6 @@ class MapPath(BaseModel):
     
 QueryString = Union[str, List[str], Dict[str,str|int|bool], None]
     
-class SearchQuery(BaseModel):
-    """
-    Query paramters accepted by the search endpoint.
-    
-    See: https://v2.xivapi.com/api/docs#model/searchquery
-    """
-    cursor: Optional[str] = None
-    """Continuation token to retrieve further results from a prior search request. If specified, takes priority over query."""
-    limit: Optional[int] = None
-    """Maximum number of rows to return. To paginate, provide the cursor token provided in `next` to the `cursor` parameter."""
-    query: QueryString = None
-    """
-    A query string for searching excel data.
-    Queries are formed of clauses, which take the basic form of `[specifier][operation][value]`, i.e. `Name="Example"`. Multiple clauses may be specified by seperating them with whitespace, i.e. `Foo=1 Bar=2`.
-    
-    See: https://v2.xivapi.com/docs/guides/search/#query
-    """
-    sheets: Optional[str] = None
-    """List of excel sheets that the query should be run against. At least one must be specified if not querying a cursor."""
-
 class SchemaLanguage(str, Enum):
     """See: https://v2.xivapi.com/api/docs#model/schemalanguage"""
     none = "none"
@@ -93,7 +85,7 @@ class SchemaLanguage(str, Enum):
 SchemaSpecifier = str
 FilterString = Union[str, List[str]]
 
-class RowReaderQuery(BaseModel):
+class RowReaderQuery(Model):
     """
     Query parameters accepted by endpoints that retrieve excel row data.
 
@@ -108,7 +100,27 @@ class RowReaderQuery(BaseModel):
     transient: Optional[FilterString] = None
     """Transient row field selection."""
     
-class SearchResult(BaseModel):
+class SearchQuery(RowReaderQuery, VersionQuery):
+    """
+    Query paramters accepted by the search endpoint, along with those selecting the game version and the fields of each result.
+    
+    See: https://v2.xivapi.com/api/docs#model/searchquery
+    """
+    cursor: Optional[str] = None
+    """Continuation token to retrieve further results from a prior search request. If specified, takes priority over query."""
+    limit: Optional[int] = None
+    """Maximum number of rows to return. To paginate, provide the cursor token provided in `next` to the `cursor` parameter."""
+    query: QueryString = None
+    """
+    A query string for searching excel data.
+    Queries are formed of clauses, which take the basic form of `[specifier][operation][value]`, i.e. `Name="Example"`. Multiple clauses may be specified by seperating them with whitespace, i.e. `Foo=1 Bar=2`.
+    
+    See: https://v2.xivapi.com/docs/guides/search/#query
+    """
+    sheets: Optional[str] = None
+    """List of excel sheets that the query should be run against. At least one must be specified if not querying a cursor."""
+    
+class SearchResult(Model):
     """
     Result found by a search query.
     
@@ -129,7 +141,7 @@ class SearchResult(BaseModel):
     transient: Optional[dict[str, Any]] = None
     """Field values for this row's transient row, if any is present, according to the current schema and transient filter."""    
     
-class SearchResponse(BaseModel):
+class SearchResponse(Model):
     """
     Response structure for the search endpoint.
     
@@ -138,8 +150,16 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
     schema: SchemaSpecifier # pyright: ignore[reportIncompatibleMethodOverride]
     next: Optional[str] = None
+
+class SearchHit(NamedTuple):
+    """Result yielded by `XIVAPI.search_many`, along with the sub-query it was found by."""
+    score: float
+    """Relevance score of the result, by which the results of every sub-query are merged."""
+    query: int
+    """Index of the sub-query the result was found by."""
+    result: SearchResult
  
-class SheetMetadata(BaseModel):
+class SheetMetadata(Model):
     """
     Metadata about a single sheet.
     
@@ -148,7 +168,7 @@ class SheetMetadata(BaseModel):
     name: str
     """The name of the sheet."""
     
-class ListResponse(BaseModel):
+class ListResponse(Model):
     """
     Response structure for the list endpoint.
     
@@ -157,9 +177,9 @@ class ListResponse(BaseModel):
     sheets: List[SheetMetadata]
     """List of sheets known to the API."""
     
-class SheetQuery(BaseModel):
+class SheetQuery(RowReaderQuery):
     """
-    Query parameters accepted by the sheet endpoint.
+    Query parameters accepted by the sheet endpoint, along with those selecting the fields of each row.
     
     See: https://v2.xivapi.com/api/docs#model/sheetquery
     """
@@ -172,7 +192,7 @@ class SheetQuery(BaseModel):
     Rows to fetch from the sheet, as a comma-separated list. Behavior is undefined if both `rows` and `after` are provided.
     """
     
-class SheetPath(BaseModel):
+class SheetPath(Model):
     """
     Path variables accepted by the sheet endpoint.
     
@@ -181,7 +201,7 @@ class SheetPath(BaseModel):
     sheet: SchemaSpecifier
     """Name of the sheet to read."""
     
-class RowResult(BaseModel):
+class RowResult(Model):
     """
     Row retrieved by the sheet endpoint.
     
@@ -195,7 +215,7 @@ class RowResult(BaseModel):
     transient: Optional[dict[str, Any]] = None
     """Field values for this row's transient row, if any is present, according to the current schema and transient filter."""
     
-class SheetResponse(BaseModel):
+class SheetResponse(Model):
     """
     Response structure for the sheet endpoint.
     
@@ -210,7 +230,18 @@ class SheetResponse(BaseModel):
     schema: SchemaSpecifier # type: ignore - schema exists on BaseModel
     """The canonical specifier for the schema used in this response."""
     
-class RowPath(BaseModel):
+class RowsResponse(Model):
+    """
+    Response structure for `Sheet.get_many`, combining the rows of every batched request.
+    """
+    rows: List[RowResult]
+    """Rows found, in the order their IDs were first requested."""
+    by_id: Dict[str, RowResult]
+    """Rows found, keyed on the requested row ID (`row` or `row:subrow`)."""
+    missing: List[str]
+    """Requested row IDs the sheet has no row for."""
+    
+class RowPath(Model):
     """
     Path variables accepted by the row endpoint.
     
@@ -220,7 +251,7 @@ class RowPath(BaseModel):
     sheet: SchemaSpecifier
     """Name of the sheet to read."""
     
-class RowResponse(BaseModel):
+class RowResponse(Model):
     """
     Response structure for the row endpoint.
     
@@ -236,7 +267,7 @@ class RowResponse(BaseModel):
     transient: Optional[dict[str, Any]] = None
     """Field values for this row's transient row, if any is present, according to the current schema and transient filter."""
     
-class VersionMetadata(BaseModel):
+class VersionMetadata(Model):
     """
     Metadata about a single version supported by the API.
     
@@ -245,7 +276,7 @@ class VersionMetadata(BaseModel):
     names: List[str]
     """Names associated with this version. Version names specified here are accepted by the `version` query parameter throughout the API."""
     
-class VersionsResponse(BaseModel):
+class VersionsResponse(Model):
     """
     Response structure for the versions endpoint.
     
@@ -268,4 +299,60 @@ class XIVAPIOptions(TypedDict,total=False):
     
     See: https://v2.xivapi.com/docs/guides/sheets/#language
     """
-    verbose: NotRequired[bool]
\ No newline at end of file
+    verbose: NotRequired[bool]
+    """Whether requests, responses, retries, cache hits and errors are printed as they happen."""
+    hooks: NotRequired["Hooks"]
+    """Hooks receiving an event for every request, response, retry, cache hit, error, decode and validation, e.g. to collect metrics."""
+    pool_size: NotRequired[int]
+    """Maximum number of pooled connections kept open to the API. Defaults to `10`."""
+    keep_alive: NotRequired[bool]
+    """Whether connections should be kept alive between requests. Defaults to `True`."""
+    compression: NotRequired[bool]
+    """Whether to negotiate gzip/deflate (and brotli/zstd, when installed) response compression. Defaults to `True`."""
+    connect_timeout: NotRequired[float]
+    """Seconds to wait for a connection to the API to be established. Defaults to `10`."""
+    read_timeout: NotRequired[float]
+    """Seconds to wait between bytes received from the API. Defaults to `30`."""
+    max_concurrency: NotRequired[int]
+    """Maximum number of requests an `AsyncXIVAPI` client keeps in flight at once. Defaults to `100`."""
+    rate_limit: NotRequired[float]
+    """Maximum number of requests per second sent by a client, shared by every endpoint object it hands out. Unlimited by default."""
+    burst: NotRequired[int]
+    """Number of requests that may be sent at once before `rate_limit` applies. Defaults to one second's worth of requests."""
+    retries: NotRequired[int]
+    """Number of times a request failing with `429`/`5xx` or a connection error is retried, with jittered exponential backoff. Defaults to `3`."""
+    deadline: NotRequired[float]
+    """
+    Seconds every request may take, retries and rate limiting included, before `DeadlineExceeded` is raised.
+    Calls can be bounded further with the `pyxivapi.lib.resilience.deadline` context manager.
+    """
+    hedge: NotRequired["Hedger"]
+    """Hedger sending a duplicate of requests slower than a percentile of recent latencies, using whichever response arrives first."""
+    circuit_breaker: NotRequired["CircuitBreaker"]
+    """Circuit breaker failing requests fast with `CircuitOpenError` while the API keeps failing."""
+    scheduler: NotRequired["Scheduler"]
+    """Scheduler rate limiting and retrying requests; created from the options above by the client when not provided."""
+    cache: NotRequired["DiskCache"]
+    """Persistent cache for sheet, search and version responses, keyed on the resolved game version."""
+    asset_store: NotRequired["AssetStore"]
+    """On-disk store for assets, keyed on the resolved game version and deduplicated by content."""
+    memory_cache: NotRequired["MemoryCache"]
+    """In-process LRU/TTL cache for responses, which also coalesces identical concurrent requests."""
+    decode: NotRequired[Literal["validated", "lazy", "raw"]]
+    """
+    How responses are turned into models. `validated` (the default) fully validates them, `lazy` builds the same models but only
+    validates each row/result the first time it is read, and `raw` returns the decoded JSON dicts as-is.
+    Helpers such as `iter_rows` and `get_many` always yield models.
+    """
+    search_backend: NotRequired["SearchBackend"]
+    """Local backend to run searches against instead of the API, e.g. a `LocalSearch` over mirrored sheets."""
+    transport: NotRequired[Literal["http1", "http2"]]
+    """
+    Wire protocol of the session created by the client: pooled HTTP/1.1 connections (`http1`, the default) or `http2`, multiplexing
+    concurrent requests over one connection (`pip install pyxivapi[http2]`).
+    """
+    session: NotRequired["Transport | AsyncTransport"]
+    """
+    Transport used for every request. Created from `transport` and owned by `XIVAPI`/`AsyncXIVAPI`, which share it with the endpoint
+    objects they hand out; pass one of `pyxivapi.lib.transports` to mock, record or replay requests. If omitted, a module-level session is used.
+    """
\ No newline at end of file
@@ -0,0 +1,127 @@
+import asyncio
+import contextvars
+import heapq
+import queue
+import threading
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple, TypeVar
+
+if TYPE_CHECKING:
+    from .sheets import Identified
+
+T = TypeVar("T")
+
+# Marks the end of the page stream in the prefetch buffers
+_DONE: Any = object()
+
+# Number of rows/results requested per page by the iterators, unless overridden
+DEFAULT_PAGE_SIZE = 100
+
+def after(row: "Identified") -> str:
+    """Row specifier to pass to `SheetQuery.after` to continue listing from `row`."""
+    return str(row.row_id) if row.subrow_id is None else f"{row.row_id}:{row.subrow_id}"
+
+def prefetch(pages: Iterator[T], depth: int = 1) -> Iterator[T]:
+    """
+    Iterate `pages`, fetching up to `depth` pages ahead in a background thread while the caller processes the current one.
+    With a `depth` of `0` pages are fetched on demand.
+    """
+    if depth <= 0:
+        yield from pages
+        return
+
+    buffer: "queue.Queue[Tuple[Any, Optional[BaseException]]]" = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item: Tuple[Any, Optional[BaseException]]) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for page in pages:
+                if not put((page, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:
+            put((_DONE, e))
+        finally:
+            # Runs the cleanup of generators (sessions, files) abandoned by a consumer that stopped early
+            close = getattr(pages, "close", None)
+            if close is not None:
+                close()
+
+    # The producer runs in a copy of the caller's context, so context-scoped settings still apply to its requests
+    thread = threading.Thread(target=contextvars.copy_context().run, args=(produce,), daemon=True)
+    thread.start()
+    try:
+        while True:
+            page, error = buffer.get()
+            if page is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        stop.set()
+
+async def async_prefetch(pages: AsyncIterator[T], depth: int = 1) -> AsyncIterator[T]:
+    """Asynchronous counterpart of `prefetch`, fetching ahead in a background task."""
+    if depth <= 0:
+        async for page in pages:
+            yield page
+        return
+
+    buffer: "asyncio.Queue[Tuple[Any, Optional[BaseException]]]" = asyncio.Queue(maxsize=depth)
+
+    async def produce() -> None:
+        try:
+            async for page in pages:
+                await buffer.put((page, None))
+            await buffer.put((_DONE, None))
+        except Exception as e:
+            await buffer.put((_DONE, e))
+        finally:
+            close = getattr(pages, "aclose", None)
+            if close is not None:
+                await close()
+
+    task = asyncio.create_task(produce())
+    try:
+        while True:
+            page, error = await buffer.get()
+            if page is _DONE:
+                if error is not None:
+                    raise error
+                return
+            yield page
+    finally:
+        task.cancel()
+
+async def _next(stream: AsyncIterator[T]) -> Any:
+    """Next item of `stream`, or `_DONE` once it is exhausted."""
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+async def async_merge(streams: List[AsyncIterator[T]], key: Callable[[T], Any]) -> AsyncIterator[T]:
+    """
+    Asynchronous counterpart of `heapq.merge`: merge already sorted `streams` by `key`, lazily. The first item of every stream is
+    awaited concurrently; afterwards, a stream is only advanced once its previous item has been yielded.
+    """
+    heads = await asyncio.gather(*(_next(stream) for stream in streams))
+    heap = [(key(head), index, head) for index, head in enumerate(heads) if head is not _DONE]
+    heapq.heapify(heap)
+    while heap:
+        _, index, item = heap[0]
+        yield item
+        following = await _next(streams[index])
+        if following is _DONE:
+            heapq.heappop(heap)
+        else:
+            heapq.heapreplace(heap, (key(following), index, following))
@@ -0,0 +1,118 @@
+import asyncio
+from string import Formatter
+from urllib.parse import quote, quote_plus, urlencode
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, Type, TypeVar
+from pydantic import BaseModel
+from .models import RowReaderQuery, RowResponse, SearchQuery, SearchResponse, SchemaSpecifier
+from ..utils import normalize, url_for, dispatch, async_dispatch, read, decode, Decoded
+from ..errors import CustomError
+
+if TYPE_CHECKING:
+    from .query import SearchBackend
+
+Q = TypeVar("Q", bound=BaseModel)
+
+def query_model(model: Type[Q], params: Optional[Q | Dict[str, Any]], query: Dict[str, Any]) -> Q:
+    """Query `model` from `params` (a model or a dict), updated with the keyword arguments in `query`."""
+    if isinstance(params, BaseModel):
+        params = params.model_dump(exclude_none=True)
+    return model(**{ **(params or {}), **query })
+
+def literal(value: Any) -> str:
+    """Format `value` as a search query literal: strings are quoted and escaped, booleans lowercased."""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (int, float)):
+        return str(value)
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+def split(path: str, params: Dict[str, Any], variable: str) -> Tuple[str, str]:
+    """
+    Split the request URL for `path` around the value of its `variable` parameter, returning the encoded text before and after it.
+    Parameters are sorted by name, so the bound URL is also the request's in-memory cache key.
+    """
+    ordered = sorted({ **params, variable: "" }.items())
+    position = [key for key, _ in ordered].index(variable)
+    before, after = urlencode(ordered[:position]), urlencode(ordered[position + 1:])
+    head = f"{url_for(path)}?{before}&{variable}=" if before else f"{url_for(path)}?{variable}="
+    return head, f"&{after}" if after else ""
+
+class _PreparedGet:
+    def __init__(self, sheet: SchemaSpecifier, params: Optional[RowReaderQuery] = None, options: Optional[Dict[str, Any]] = None) -> None:
+        self.sheet = sheet
+        self.options = options if options is not None else {}
+        # Everything but the row ID is validated, flattened and encoded once
+        self.params = normalize((params or RowReaderQuery()).model_dump(exclude_none=True), self.options)
+        self._path = f"/sheet/{sheet}/"
+        self._base = url_for(self._path)
+        self._query = f"?{urlencode(sorted(self.params.items()))}" if self.params else ""
+
+    def bind(self, row_id: str | int) -> Tuple[str, str]:
+        """Path and URL of the request for `row_id`."""
+        row = str(row_id) if isinstance(row_id, int) else quote(row_id, safe=":")
+        return self._path + row, self._base + row + self._query
+
+class PreparedGet(_PreparedGet):
+    """
+    Row lookup on one sheet with fixed query parameters, encoded once so that each call only binds the row ID.
+    Calls go through the same caches, scheduler and events as `Sheet.get`, and return the same responses.
+    """
+    def __call__(self, row_id: str | int) -> Decoded[RowResponse]:
+        path, url = self.bind(row_id)
+        data, errors = read(path, dispatch(path, self.params, url, self.options, url), self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(RowResponse, data, self.options)
+
+class AsyncPreparedGet(_PreparedGet):
+    """Asynchronous counterpart of `PreparedGet`."""
+    async def __call__(self, row_id: str | int) -> Decoded[RowResponse]:
+        path, url = self.bind(row_id)
+        data, errors = read(path, await async_dispatch(path, self.params, url, self.options, url), self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(RowResponse, data, self.options)
+
+class _PreparedSearch:
+    def __init__(self, query_template: str, params: Optional[SearchQuery] = None, options: Optional[Dict[str, Any]] = None) -> None:
+        self.query_template = query_template
+        self.names = { name for _, name, _, _ in Formatter().parse(query_template) if name }
+        self.options = options if options is not None else {}
+        self.query = (params or SearchQuery()).model_copy(update={ "query": None, "cursor": None })
+        self.params = normalize(self.query.model_dump(exclude_none=True), self.options)
+        self._head, self._tail = split("/search", self.params, "query")
+
+    def bind(self, values: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str]:
+        """Query string, parameters and URL of the search for the template `values`."""
+        if values.keys() != self.names:
+            raise CustomError(f"Expected values for {sorted(self.names)} in search query, got {sorted(values)}")
+        query = self.query_template.format_map({ name: literal(value) for name, value in values.items() })
+        return query, { **self.params, "query": query }, self._head + quote_plus(query) + self._tail
+
+class PreparedSearch(_PreparedSearch):
+    """
+    Search with a fixed query template and parameters, encoded once so that each call only escapes and binds the template values.
+    Values are formatted as query literals, so `Name~{term}` bound to `term='a "b"'` searches for `Name~"a \\"b\\""`.
+    """
+    def __call__(self, **values: Any) -> Decoded[SearchResponse]:
+        query, params, url = self.bind(values)
+        backend: Optional["SearchBackend"] = self.options.get("search_backend")
+        if backend is not None:
+            return backend.search(self.query.model_copy(update={ "query": query }))
+        data, errors = read("/search", dispatch("/search", params, url, self.options, url), self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(SearchResponse, data, self.options)
+
+class AsyncPreparedSearch(_PreparedSearch):
+    """Asynchronous counterpart of `PreparedSearch`."""
+    async def __call__(self, **values: Any) -> Decoded[SearchResponse]:
+        query, params, url = self.bind(values)
+        backend: Optional["SearchBackend"] = self.options.get("search_backend")
+        if backend is not None:
+            return await asyncio.to_thread(backend.search, self.query.model_copy(update={ "query": query }))
+        data, errors = read("/search", await async_dispatch("/search", params, url, self.options, url), self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(SearchResponse, data, self.options)
@@ -0,0 +1,223 @@
+import bisect
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Unpack
+from urllib.parse import parse_qs, urlparse
+from ..client import XIVAPI
+from .cache import CachedResponse, DiskCache, MemoryCache
+from .mirror import Mirror
+from .models import XIVAPIOptions
+from ..utils import raw_request, loads
+
+# First segment of the paths served, like the v2 API's routes
+ROUTES = ("asset", "search", "sheet", "version")
+
+# Query parameters a mirror can answer on its own; sheet requests with any other are sent upstream
+MIRROR_PARAMS = frozenset(("version", "language", "fields", "limit", "after", "rows"))
+
+# Rows per page of `GET /sheet/{sheet}` when `limit` is not given, like the API
+DEFAULT_LIMIT = 100
+
+# Schema specifier reported by responses served from a mirror
+MIRROR_SCHEMA = "mirror"
+
+def etag(body: bytes) -> str:
+    """Strong entity tag for a response body."""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+def _header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+def _matches(condition: str, tag: str) -> bool:
+    """Whether an `If-None-Match` header matches `tag`, compared weakly as the HTTP specification requires for it."""
+    tags = [value.strip().removeprefix("W/") for value in condition.split(",")]
+    return "*" in tags or tag.removeprefix("W/") in tags
+
+def _json(data: Any, status: int = 200) -> CachedResponse:
+    return status, { "content-type": "application/json" }, json.dumps(data, separators=(",", ":")).encode()
+
+def _error(status: int, message: str) -> CachedResponse:
+    return _json({ "code": status, "message": message }, status)
+
+def _specifier(value: str) -> Tuple[int, Optional[int]]:
+    row, _, subrow = value.partition(":")
+    return int(row), int(subrow) if subrow else None
+
+def _row(mirror: Mirror, position: int, columns: Optional[List[str]]) -> Dict[str, Any]:
+    row = mirror.row(position, columns)
+    data: Dict[str, Any] = { "row_id": row.row_id, "fields": row.fields }
+    if row.subrow_id is not None:
+        data["subrow_id"] = row.subrow_id
+    return data
+
+class ProxyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately, which Nagle's algorithm would delay by tens of milliseconds
+    disable_nagle_algorithm = True
+    server: "CachingProxy"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        path = "/" + url.path.removeprefix("/api").strip("/")
+        query = { k: v[0] for k, v in parse_qs(url.query).items() }
+        status, headers, body = self.server.respond(path, query)
+
+        extra: Dict[str, str] = {}
+        if status == 200:
+            tag = _header(headers, "etag") or etag(body)
+            extra["ETag"] = tag
+            condition = self.headers.get("If-None-Match")
+            if condition is not None and _matches(condition, tag):
+                self.server.count("not_modified")
+                self.send_response(304)
+                self.send_header("ETag", tag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+        self.send_response(status)
+        self.send_header("Content-Type", _header(headers, "content-type") or "application/octet-stream")
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class CachingProxy(ThreadingHTTPServer):
+    """
+    Read-through caching proxy answering the `/version`, `/sheet`, `/search` and `/asset` routes of the v2 API, so that several
+    services (in any language) share one cache and one upstream budget.
+
+    Sheet requests are answered from `mirrors` when one matches the sheet, version and language requested (and the request only
+    selects top-level fields). Every other request goes through a client built from `options`: its memory cache (created when
+    not given) coalesces concurrent misses into one upstream request, and its persistent cache, scheduler and rate limit apply to
+    the whole fleet. Responses carry an ETag, and conditional requests (`If-None-Match`) are answered with `304 Not Modified`.
+    """
+    daemon_threads = True
+
+    def __init__(self, mirrors: Iterable[Mirror] = (), host: str = "127.0.0.1", port: int = 0, **options: Unpack[XIVAPIOptions]) -> None:
+        super().__init__((host, port), ProxyHandler)
+        self.mirrors: Dict[str, List[Mirror]] = {}
+        for mirror in mirrors:
+            self.mirrors.setdefault(mirror.sheet, []).append(mirror)
+        if options.get("memory_cache") is None:
+            options["memory_cache"] = MemoryCache()
+        self.client = XIVAPI(**options)
+        self.memory: MemoryCache = self.client.options["memory_cache"]
+        self._lock = threading.Lock()
+        self._counters = { "requests": 0, "mirror": 0, "not_modified": 0, "upstream_errors": 0 }
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Base URL of the proxy, in place of `https://v2.xivapi.com/api/`."""
+        host, port = self.server_address[:2]
+        assert isinstance(host, str)
+        return f"http://{host}:{port}/api/"
+
+    def count(self, name: str) -> None:
+        with self._lock:
+            self._counters[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Requests served, from a mirror, and answered `304`, along with the memory cache counters."""
+        with self._lock:
+            counters = dict(self._counters)
+        return { **counters, **self.memory.stats() }
+
+    def respond(self, path: str, query: Dict[str, str]) -> CachedResponse:
+        """Response to a request for `path` (without the `/api` prefix) and its `query`."""
+        self.count("requests")
+        parts = path.lstrip("/").split("/")
+        if parts[0] not in ROUTES:
+            return _error(404, "Not found")
+        if parts[0] == "sheet" and len(parts) in (2, 3) and parts[1] in self.mirrors:
+            response = self._mirror(parts, query)
+            if response is not None:
+                self.count("mirror")
+                return response
+        try:
+            return raw_request(path=path, params=dict(query), options=self.client.options, defaults=())
+        except Exception as e:
+            self.count("upstream_errors")
+            return _error(502, f"Upstream request failed: {e}")
+
+    def _version(self, name: str) -> str:
+        """Canonical name of a version, resolved through the (cached) versions list."""
+        try:
+            status, _, body = raw_request(path="/version", params={}, options=self.client.options, defaults=())
+        except Exception:
+            return name
+        return DiskCache.resolve(name, loads(body))[0] if status == 200 else name
+
+    def _mirror(self, parts: List[str], query: Dict[str, str]) -> Optional[CachedResponse]:
+        """Answer a sheet request from a matching mirror, or `None` when none can."""
+        if query.keys() - MIRROR_PARAMS:
+            return None
+        columns = query["fields"].split(",") if "fields" in query else None
+        candidates = [
+            mirror for mirror in self.mirrors[parts[1]]
+            if mirror.language == query.get("language", "") and (columns is None or set(columns) <= mirror.types.keys())
+        ]
+        requested = query.get("version") or "latest"
+        if not any(mirror.version == requested for mirror in candidates) and candidates:
+            requested = self._version(requested)
+        mirror = next((mirror for mirror in candidates if mirror.version == requested), None)
+        if mirror is None:
+            return None
+
+        try:
+            if len(parts) == 3:
+                position = mirror.index(*_specifier(parts[2]))
+                if position is None:
+                    return _error(404, f"Unknown row {parts[2]}")
+                return _json({ "schema": MIRROR_SCHEMA, **_row(mirror, position, columns) })
+            if "rows" in query:
+                found = (mirror.index(*_specifier(value)) for value in query["rows"].split(","))
+                positions = [position for position in found if position is not None]
+            else:
+                start = 0
+                if "after" in query:
+                    row_id, subrow_id = _specifier(query["after"])
+                    start = bisect.bisect_right(mirror.row_ids, row_id) if subrow_id is None else bisect.bisect_left(mirror.row_ids, row_id)
+                    while subrow_id is not None and start < len(mirror) and mirror.row_ids[start] == row_id and mirror.subrow_ids[start] <= subrow_id:
+                        start += 1
+                positions = list(range(start, min(start + int(query.get("limit", DEFAULT_LIMIT)), len(mirror))))
+        except ValueError:
+            # Malformed row specifiers are left for the API to reject
+            return None
+        return _json({ "schema": MIRROR_SCHEMA, "rows": [_row(mirror, position, columns) for position in positions] })
+
+    def start(self) -> "CachingProxy":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving, and close the client (but not the mirrors)."""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+        self.client.close()
+
+    @contextmanager
+    def serve(self) -> Iterator["CachingProxy"]:
+        """Serve requests on a background thread until the block exits."""
+        self.start()
+        try:
+            yield self
+        finally:
+            self.stop()
+
+    def __enter__(self) -> "CachingProxy":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
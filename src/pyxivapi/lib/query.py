@@ -0,0 +1,331 @@
+import base64
+import bisect
+import json
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Protocol, Sequence, Set, Tuple, Union
+from .models import RowResult, SearchQuery, SearchResponse, SearchResult, SchemaSpecifier
+from .mirror import Mirror
+from ..errors import CustomError
+
+class Clause(NamedTuple):
+    """A single `[specifier][operation][value]` clause of a search query."""
+    occur: str
+    """`+` (must match), `-` (must not match) or an empty string (should match)."""
+    specifier: str
+    operator: str
+    value: Any
+
+class Group(NamedTuple):
+    """A parenthesised group of clauses, combined like a query of its own."""
+    occur: str
+    clauses: List[Union[Clause, "Group"]]
+
+Node = Union[Clause, Group]
+
+OPERATORS = (">=", "<=", "=", "~", ">", "<")
+_SPECIFIER = re.compile(r"[A-Za-z0-9_.\[\]@]+")
+_BARE_VALUE = re.compile(r"[^\s()]+")
+
+def parse_query(query: str) -> List[Node]:
+    """
+    Parse a search query into clauses, following the same grammar as the API.
+
+    See: https://v2.xivapi.com/docs/guides/search/#query
+    """
+    clauses, _ = _parse_clauses(query, 0, nested=False)
+    return clauses
+
+def _parse_clauses(query: str, position: int, nested: bool) -> Tuple[List[Node], int]:
+    clauses: List[Node] = []
+    while True:
+        while position < len(query) and query[position].isspace():
+            position += 1
+        if position >= len(query):
+            if nested:
+                raise CustomError("Unterminated group in search query")
+            return clauses, position
+        if query[position] == ")":
+            if not nested:
+                raise CustomError(f"Unexpected ')' at position {position} in search query")
+            return clauses, position + 1
+
+        occur = ""
+        if query[position] in "+-":
+            occur = query[position]
+            position += 1
+        if position < len(query) and query[position] == "(":
+            group, position = _parse_clauses(query, position + 1, nested=True)
+            clauses.append(Group(occur, group))
+            continue
+
+        match = _SPECIFIER.match(query, position)
+        if match is None:
+            raise CustomError(f"Expected a field specifier at position {position} in search query")
+        specifier, position = match.group(0), match.end()
+        operator = next((op for op in OPERATORS if query.startswith(op, position)), None)
+        if operator is None:
+            raise CustomError(f"Expected an operator after {specifier} in search query")
+        value, position = _parse_value(query, position + len(operator))
+        if operator == "~" and not isinstance(value, str):
+            raise CustomError(f"The ~ operator of {specifier} expects a string value")
+        clauses.append(Clause(occur, specifier, operator, value))
+
+def _parse_value(query: str, position: int) -> Tuple[Any, int]:
+    if position < len(query) and query[position] == '"':
+        chars: List[str] = []
+        position += 1
+        while position < len(query) and query[position] != '"':
+            if query[position] == "\\" and position + 1 < len(query):
+                position += 1
+            chars.append(query[position])
+            position += 1
+        if position >= len(query):
+            raise CustomError("Unterminated string in search query")
+        return "".join(chars), position + 1
+
+    match = _BARE_VALUE.match(query, position)
+    if match is None:
+        raise CustomError(f"Expected a value at position {position} in search query")
+    raw = match.group(0)
+    if raw in ("true", "false"):
+        return raw == "true", match.end()
+    try:
+        return (float(raw) if any(c in raw for c in ".eE") else int(raw)), match.end()
+    except ValueError:
+        raise CustomError(f"Invalid value {raw} in search query")
+
+def _walk(value: Any, segments: Sequence[str]) -> Iterator[Any]:
+    """Yield every value found at a field path, descending through related rows and `[]` arrays."""
+    if not segments:
+        # Related rows compare by their row ID
+        if isinstance(value, dict) and "row_id" in value:
+            yield value.get("value", value["row_id"])
+        elif value is not None:
+            yield value
+        return
+    segment, rest = segments[0], segments[1:]
+    if segment == "[]":
+        if isinstance(value, list):
+            for item in value:
+                yield from _walk(item, rest)
+        return
+    if isinstance(value, dict):
+        if segment not in value and isinstance(value.get("fields"), dict):
+            value = value["fields"]
+        if segment in value:
+            yield from _walk(value[segment], rest)
+
+def _segments(specifier: str) -> List[str]:
+    # Language suffixes (`Name@ja`) are ignored, local data is held in a single language
+    return re.findall(r"\[\]|[^.\[\]]+", specifier.split("@", 1)[0])
+
+def _trigrams(text: str) -> Set[str]:
+    return { text[i:i + 3] for i in range(len(text) - 2) }
+
+class FieldIndex:
+    """
+    Indexes over the values of one field path of a local sheet: a hash index for equality, a sorted index for ranges
+    and a trigram index for case-insensitive `~` substring matches.
+    """
+    def __init__(self, values: Iterable[Tuple[int, Any]]) -> None:
+        self.hash: Dict[Any, List[int]] = {}
+        numbers: List[Tuple[float, int]] = []
+        self.strings: Dict[str, List[int]] = {}
+        self.trigrams: Dict[str, Set[str]] = {}
+        for position, value in values:
+            if isinstance(value, (dict, list)):
+                continue
+            self.hash.setdefault(value, []).append(position)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                numbers.append((value, position))
+            elif isinstance(value, str):
+                self.strings.setdefault(value.lower(), []).append(position)
+        # Trigrams map to the distinct (lowercased) strings containing them
+        for string in self.strings:
+            for trigram in _trigrams(string):
+                self.trigrams.setdefault(trigram, set()).add(string)
+        numbers.sort()
+        self.keys = [n for n, _ in numbers]
+        self.positions = [p for _, p in numbers]
+
+    def equal(self, value: Any) -> Set[int]:
+        return set(self.hash.get(value, ()))
+
+    def range(self, operator: str, value: float) -> Set[int]:
+        if operator == ">":
+            return set(self.positions[bisect.bisect_right(self.keys, value):])
+        if operator == ">=":
+            return set(self.positions[bisect.bisect_left(self.keys, value):])
+        if operator == "<":
+            return set(self.positions[:bisect.bisect_left(self.keys, value)])
+        return set(self.positions[:bisect.bisect_right(self.keys, value)])
+
+    def contains(self, needle: str) -> Dict[int, float]:
+        """Positions whose value contains `needle` (case-insensitive), scored by how much of the value it covers."""
+        needle = needle.lower()
+        strings: Iterable[str] = self.strings
+        if len(needle) >= 3:
+            strings = set.intersection(*(self.trigrams.get(t, set()) for t in _trigrams(needle)))
+        matches: Dict[int, float] = {}
+        for string in strings:
+            if needle in string:
+                score = len(needle) / len(string) if string else 1.0
+                for position in self.strings[string]:
+                    matches[position] = max(matches.get(position, 0.0), score)
+        return matches
+
+class LocalSheet:
+    """Rows of one sheet held locally, either as a `Mirror` or as fetched `RowResult`s, with lazily built field indexes."""
+    def __init__(self, name: SchemaSpecifier, rows: Union[Mirror, Sequence[RowResult]]) -> None:
+        self.name = name
+        self.rows = rows
+        self._indexes: Dict[str, FieldIndex] = {}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def row(self, position: int, fields: Optional[List[str]] = None) -> RowResult:
+        if isinstance(self.rows, Mirror):
+            return self.rows.row(position, fields)
+        row = self.rows[position]
+        if fields is None:
+            return row
+        return row.model_copy(update={ "fields": { k: v for k, v in row.fields.items() if k in fields } })
+
+    def _top_level(self, name: str) -> Callable[[int], Any]:
+        if isinstance(self.rows, Mirror):
+            if name not in self.rows.types:
+                return lambda position: None
+            column = self.rows.column(name)
+            return lambda position: column[position]
+        rows = self.rows
+        return lambda position: rows[position].fields.get(name)
+
+    def index(self, specifier: str) -> FieldIndex:
+        """Index over the values at a field path, built on first use."""
+        segments = _segments(specifier)
+        key = ".".join(segments)
+        if key not in self._indexes:
+            if not segments:
+                raise CustomError(f"Invalid field specifier {specifier} in search query")
+            top = self._top_level(segments[0])
+            self._indexes[key] = FieldIndex(
+                (position, value) for position in range(len(self)) for value in _walk(top(position), segments[1:])
+            )
+        return self._indexes[key]
+
+class SearchBackend(Protocol):
+    """What searches run against instead of the API when passed as the `search_backend` option, e.g. a `LocalSearch`."""
+    def search(self, params: SearchQuery) -> SearchResponse: ...
+
+class LocalSearch:
+    """
+    Offline search backend that evaluates `SearchQuery` clauses against locally held sheets, returning `SearchResponse`s.
+
+    Pass an instance as the `search_backend` option to make `XIVAPI.search` (and `iter_search`) use it instead of the API.
+    Scores only loosely represent relevance, like those of the API.
+    """
+    def __init__(self, sheets: Optional[Dict[SchemaSpecifier, Union[Mirror, Sequence[RowResult]]]] = None) -> None:
+        self.sheets: Dict[SchemaSpecifier, LocalSheet] = {}
+        for name, rows in (sheets or {}).items():
+            self.add(name, rows)
+
+    def add(self, sheet: SchemaSpecifier, rows: Union[Mirror, Iterable[RowResult]]) -> None:
+        """Make a sheet searchable, from a `Mirror` or from rows already fetched (e.g. through `Sheet.iter_rows`)."""
+        self.sheets[sheet] = LocalSheet(sheet, rows if isinstance(rows, Mirror) else list(rows))
+
+    def search(self, params: Dict[str, Any] | SearchQuery) -> SearchResponse:
+        """Run a search query against the local sheets, mirroring `GET /search`."""
+        if isinstance(params, dict):
+            params = SearchQuery(**params)
+        offset = 0
+        query, sheets, fields = params.query, params.sheets, getattr(params, "fields", None)
+        if params.cursor:
+            state = json.loads(base64.urlsafe_b64decode(params.cursor.encode()))
+            query, sheets, fields, offset = state["query"], state["sheets"], state["fields"], state["offset"]
+        if not sheets:
+            raise CustomError("At least one sheet must be specified when searching")
+
+        text = self._query_text(query)
+        clauses = parse_query(text)
+        names = [s.strip() for s in sheets.split(",") if s.strip()]
+        projection = self._projection(fields)
+
+        matches: List[Tuple[float, int, int, SchemaSpecifier]] = []
+        for order, name in enumerate(names):
+            if name not in self.sheets:
+                raise CustomError(f"Sheet {name} is not available locally")
+            sheet = self.sheets[name]
+            for position, score in self._evaluate(sheet, clauses).items():
+                matches.append((-score, order, position, name))
+        matches.sort()
+
+        limit = params.limit or 100
+        page = matches[offset:offset + limit]
+        results = []
+        for negative_score, _, position, name in page:
+            row = self.sheets[name].row(position, projection)
+            results.append(SearchResult.model_construct(
+                fields=row.fields, row_id=row.row_id, score=-negative_score, sheet=name, subrow_id=row.subrow_id, transient=None
+            ))
+
+        next_cursor = None
+        if offset + limit < len(matches):
+            state = { "query": text, "sheets": sheets, "fields": fields, "offset": offset + limit }
+            next_cursor = base64.urlsafe_b64encode(json.dumps(state).encode()).decode()
+        return SearchResponse.model_construct(results=results, schema="local", next=next_cursor)
+
+    @staticmethod
+    def _query_text(query: Any) -> str:
+        if isinstance(query, list):
+            return " ".join(str(q) for q in query)
+        if isinstance(query, dict):
+            return " ".join(f"{k}={json.dumps(v)}" for k, v in query.items())
+        return query or ""
+
+    @staticmethod
+    def _projection(fields: Any) -> Optional[List[str]]:
+        if not fields:
+            return None
+        names = fields if isinstance(fields, list) else fields.split(",")
+        return list(dict.fromkeys(re.split(r"[.\[@]", name.strip(), maxsplit=1)[0] for name in names))
+
+    def _evaluate(self, sheet: LocalSheet, clauses: List[Node]) -> Dict[int, float]:
+        """Positions matching a list of clauses, with their score. Must clauses are required, should clauses only score once one is required."""
+        must = [c for c in clauses if c.occur == "+"]
+        should = [c for c in clauses if c.occur == ""]
+        must_not = [c for c in clauses if c.occur == "-"]
+
+        result: Optional[Dict[int, float]] = None
+        for clause in must:
+            matched = self._match(sheet, clause)
+            result = matched if result is None else { p: result[p] + s for p, s in matched.items() if p in result }
+        if should:
+            scored: Dict[int, float] = {}
+            for clause in should:
+                for position, score in self._match(sheet, clause).items():
+                    scored[position] = scored.get(position, 0.0) + score
+            if result is None:
+                result = scored
+            else:
+                result = { p: s + scored.get(p, 0.0) for p, s in result.items() }
+        if result is None:
+            result = { position: 0.0 for position in range(len(sheet)) } if must_not else {}
+        for clause in must_not:
+            for position in self._match(sheet, clause):
+                result.pop(position, None)
+
+        scoring = len(must) + len(should)
+        return { p: s / scoring if scoring else 1.0 for p, s in result.items() }
+
+    def _match(self, sheet: LocalSheet, node: Node) -> Dict[int, float]:
+        if isinstance(node, Group):
+            return self._evaluate(sheet, node.clauses)
+        index = sheet.index(node.specifier)
+        if node.operator == "~":
+            return index.contains(node.value)
+        if node.operator == "=":
+            return dict.fromkeys(index.equal(node.value), 1.0)
+        if not isinstance(node.value, (int, float)) or isinstance(node.value, bool):
+            raise CustomError(f"The {node.operator} operator of {node.specifier} expects a numeric value")
+        return dict.fromkeys(index.range(node.operator, node.value), 1.0)
@@ -0,0 +1,190 @@
+import asyncio
+import contextvars
+import math
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterator, Mapping, Optional, TypeVar
+
+R = TypeVar("R")
+
+# Absolute (monotonic) time every request made in the current context must complete by
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("pyxivapi_deadline", default=None)
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound every request made within the block to `seconds` from now, retries and waits for the rate limit included.
+    The deadline follows the context into async tasks and the worker threads used by helpers such as `get_many`, and nested
+    deadlines can only shorten the one they are nested in.
+    """
+    expires = time.monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(expires if current is None else min(current, expires))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+def expiry(options: Mapping[str, Any]) -> Optional[float]:
+    """Time a request starting now must complete by, from the current `deadline` block and the client's `deadline` option."""
+    expires = _deadline.get()
+    if options.get("deadline") is not None:
+        client = time.monotonic() + options["deadline"]
+        expires = client if expires is None else min(expires, client)
+    return expires
+
+def remaining(expires: Optional[float]) -> Optional[float]:
+    return None if expires is None else expires - time.monotonic()
+
+class Hedger:
+    """
+    Hedges slow requests: once a request has been outstanding for longer than the `percentile` of recent latencies, a duplicate is
+    sent and whichever response arrives first is used. Hedging starts once `min_samples` latencies have been recorded, out of the
+    last `window`. Share one `Hedger` per client through the `hedge` option.
+    """
+    def __init__(self, percentile: float = 0.95, window: int = 256, min_samples: int = 20, max_workers: int = 64) -> None:
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.hedged = 0
+        self._latencies: Deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def threshold(self) -> Optional[float]:
+        """Seconds after which a request is hedged, or `None` while there are too few samples."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(self.percentile * len(ordered)) - 1)]
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def send(self, call: Callable[[], R]) -> R:
+        """Send a request by calling `call`, hedging it from a worker thread if it is slow."""
+        threshold = self.threshold()
+        started = time.monotonic()
+        if threshold is None:
+            response = call()
+            self.record(time.monotonic() - started)
+            return response
+
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="pyxivapi-hedge")
+        executor = self._executor
+        pending = { executor.submit(contextvars.copy_context().run, call) }
+        done, _ = wait(pending, timeout=threshold)
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            pending.add(executor.submit(contextvars.copy_context().run, call))
+        return self._first(pending, started)
+
+    def _first(self, pending: "set[Future[R]]", started: float) -> R:
+        # The first successful response wins; the error of the first failure is raised if every request fails
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    self.record(time.monotonic() - started)
+                    return future.result()
+                error = error or future.exception()
+        assert error is not None
+        raise error
+
+    async def async_send(self, call: Callable[[], Awaitable[R]]) -> R:
+        """Asynchronous counterpart of `send`; the slower request is cancelled once the other has completed."""
+        threshold = self.threshold()
+        started = time.monotonic()
+        if threshold is None:
+            response = await call()
+            self.record(time.monotonic() - started)
+            return response
+
+        pending = { asyncio.ensure_future(call()) }
+        try:
+            done, pending = await asyncio.wait(pending, timeout=threshold)
+            if not done:
+                with self._lock:
+                    self.hedged += 1
+                pending.add(asyncio.ensure_future(call()))
+            error: Optional[BaseException] = None
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        self.record(time.monotonic() - started)
+                        return task.result()
+                    error = error or task.exception()
+                if not pending:
+                    assert error is not None
+                    raise error
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the API is unhealthy. After `failures` consecutive failures (`5xx` responses, connection errors and
+    timeouts) the circuit opens and requests are rejected for `reset_timeout` seconds. A single trial request is then let through:
+    the circuit closes again if it succeeds, and reopens if it fails.
+    """
+    def __init__(self, failures: int = 5, reset_timeout: float = 30.0) -> None:
+        self.failures = failures
+        self.reset_timeout = reset_timeout
+        self._consecutive = 0
+        self._opened: Optional[float] = None
+        self._trial = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened is None:
+                return "closed"
+            return "half-open" if time.monotonic() - self._opened >= self.reset_timeout else "open"
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now."""
+        with self._lock:
+            if self._opened is None:
+                return True
+            if self._trial or time.monotonic() - self._opened < self.reset_timeout:
+                return False
+            self._trial = True
+            return True
+
+    def success(self) -> None:
+        with self._lock:
+            self._consecutive = 0
+            self._opened = None
+            self._trial = False
+
+    def failure(self) -> None:
+        with self._lock:
+            self._consecutive += 1
+            if self._trial or self._consecutive >= self.failures:
+                self._opened = time.monotonic()
+            self._trial = False
+
+    def record(self, status: int) -> None:
+        """Record the outcome of a request from its status code."""
+        if status >= 500:
+            self.failure()
+        else:
+            self.success()
+
+    def stats(self) -> Dict[str, Any]:
+        return { "state": self.state, "consecutive_failures": self._consecutive }
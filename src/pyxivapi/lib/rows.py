@@ -0,0 +1,286 @@
+import asyncio
+from typing import (Any, AsyncIterator, ClassVar, Dict, Generic, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Tuple, Type, TypeVar, Union,
+                    Unpack, cast, get_args, get_origin, get_type_hints)
+from .models import RowReaderQuery, SheetQuery, XIVAPIOptions
+from .session import DEFAULT_POOL_SIZE
+from . import pagination
+from .sheets import DEFAULT_BATCH_SIZE, batches, fetch_batches, match
+from ..utils import request, async_request, normalize
+from ..errors import CustomError
+
+R = TypeVar("R", bound="Row")
+
+class RowMeta(type):
+    """Gives every `Row` subclass slots for its annotated columns, so rows carry no per-instance `__dict__`."""
+    def __new__(mcs, name: str, bases: Tuple[type, ...], namespace: Dict[str, Any], sheet: Optional[str] = None, **kwargs: Any) -> "RowMeta":
+        if "__slots__" not in namespace:
+            annotations = namespace.get("__annotations__", {})
+            columns = tuple(column for column, hint in annotations.items() if "ClassVar" not in str(hint))
+            # Defaults would clash with the slots of the same name, they are kept aside instead
+            namespace["_defaults"] = { **getattr(bases[0], "_defaults", {}), **{ column: namespace.pop(column) for column in columns if column in namespace } }
+            namespace["__slots__"] = columns
+            namespace["columns"] = getattr(bases[0], "columns", ()) + columns
+            namespace["sheet"] = sheet or namespace.get("sheet") or getattr(bases[0], "sheet", None) or name
+        return super().__new__(mcs, name, bases, namespace, **kwargs)
+
+class Row(metaclass=RowMeta):
+    """
+    Base of compact, typed rows, declared with one annotated attribute per field (named like the field in the API):
+
+        class Category(Row, sheet="ItemUICategory"):
+            Name: str
+
+        class Item(Row, sheet="Item"):
+            Name: str
+            LevelEquip: int
+            Icon: Dict[str, Any]
+            ItemUICategory: Category
+
+    Rows are slotted, and only hold their ID and declared fields. Fields annotated with another `Row` (or a list of them) are
+    decoded into it, and fetched through its own fields. Values are not converted or validated: annotations are for type
+    checkers, and fields missing from a response take their declared default, or `None`.
+
+    See: `TypedSheet`
+    """
+    __slots__ = ("row_id", "subrow_id")
+    sheet: ClassVar[str] = ""
+    columns: ClassVar[Tuple[str, ...]] = ()
+    _defaults: ClassVar[Dict[str, Any]] = {}
+    _links: ClassVar[Optional[Dict[str, Tuple[Type["Row"], bool]]]] = None
+
+    row_id: int
+    subrow_id: Optional[int]
+
+    def __init__(self, row_id: int, subrow_id: Optional[int] = None, **fields: Any) -> None:
+        self.row_id = row_id
+        self.subrow_id = subrow_id
+        for column in self.columns:
+            setattr(self, column, fields.get(column, self._defaults.get(column)))
+
+    @classmethod
+    def links(cls) -> Dict[str, Tuple[Type["Row"], bool]]:
+        """Columns holding related rows, mapped to their row class and whether they hold a list of them."""
+        # Looked up on the class itself, so subclasses do not reuse the links of their parent
+        links: Optional[Dict[str, Tuple[Type[Row], bool]]] = cls.__dict__.get("_links")
+        if links is None:
+            links = {}
+            hints = get_type_hints(cls)
+            for column in cls.columns:
+                hint, many = hints.get(column), False
+                # Optional[X] is read as X, and List[X] as many X
+                if get_origin(hint) is Union:
+                    hint = next((arg for arg in get_args(hint) if arg is not type(None)), None)
+                if get_origin(hint) in (list, List):
+                    hint, many = (get_args(hint) or (None,))[0], True
+                if isinstance(hint, type) and issubclass(hint, Row):
+                    links[column] = (hint, many)
+            cls._links = links
+        return links
+
+    @classmethod
+    def projection(cls) -> List[str]:
+        """Field paths to request for this row, related rows included (e.g. `["Name", "ItemUICategory.Name"]`)."""
+        links = cls.links()
+        paths: List[str] = []
+        for column in cls.columns:
+            if column not in links:
+                paths.append(column)
+                continue
+            row, many = links[column]
+            prefix = f"{column}[]" if many else column
+            paths.extend(f"{prefix}.{path}" for path in row.projection())
+        return paths
+
+    @classmethod
+    def from_row(cls: Type[R], data: Mapping[str, Any]) -> R:
+        """Decode a row (or related row) as returned by the API: `{ "row_id": ..., "fields": { ... } }`."""
+        row = cls.__new__(cls)
+        row.row_id = data["row_id"]
+        row.subrow_id = data.get("subrow_id")
+        fields = data.get("fields") or {}
+        links = cls.links()
+        for column in cls.columns:
+            value = fields.get(column, cls._defaults.get(column))
+            if column in links and value is not None:
+                link, many = links[column]
+                value = [link.from_row(item) for item in value] if many else link.from_row(value)
+            setattr(row, column, value)
+        return row
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Declared fields of the row, related rows included as dicts."""
+        def plain(value: Any) -> Any:
+            if isinstance(value, Row):
+                return value.as_dict()
+            if isinstance(value, list):
+                return [plain(item) for item in value]
+            return value
+        return { column: plain(getattr(self, column)) for column in self.columns }
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return (self.row_id, self.subrow_id, self.as_dict()) == (other.row_id, other.subrow_id, other.as_dict())
+
+    def __repr__(self) -> str:
+        fields = "".join(f", {column}={getattr(self, column)!r}" for column in self.columns)
+        return f"{type(self).__name__}(row_id={self.row_id!r}{fields})"
+
+def row_model(sheet: str, columns: Mapping[str, Any] | Iterable[str], name: Optional[str] = None) -> Type[Row]:
+    """
+    Generate a `Row` class for `sheet`, from a mapping of field names to their types (or an iterable of untyped field names),
+    e.g. for columns only known at runtime.
+    """
+    annotations = dict(columns) if isinstance(columns, Mapping) else { column: Any for column in columns }
+    return cast(Type[Row], RowMeta(name or sheet, (Row,), { "__annotations__": annotations, "__module__": __name__ }, sheet=sheet))
+
+class Rows(NamedTuple, Generic[R]):
+    """Typed counterpart of `RowsResponse`, returned by `TypedSheet.get_many`."""
+    rows: List[R]
+    """Rows found, in the order their IDs were first requested."""
+    by_id: Dict[str, R]
+    """Rows found, keyed on the requested row ID (`row` or `row:subrow`)."""
+    missing: List[str]
+    """Requested row IDs the sheet has no row for."""
+
+class _TypedSheet(Generic[R]):
+    def __init__(self, row: Type[R], **options: Unpack[XIVAPIOptions]) -> None:
+        self.row = row
+        self.type = row.sheet
+        self.options = XIVAPIOptions(**options)
+        self._fields = ",".join(row.projection())
+
+    def params(self, params: Optional[RowReaderQuery | SheetQuery | Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Request parameters for `params`, selecting the row's fields unless `fields` is given."""
+        if params is None:
+            query: Dict[str, Any] = {}
+        elif isinstance(params, dict):
+            query = dict(params)
+        else:
+            query = params.model_dump(exclude_none=True)
+        query.setdefault("fields", self._fields)
+        return query
+
+    def decode(self, rows: List[Dict[str, Any]]) -> List[R]:
+        return [self.row.from_row(row) for row in rows]
+
+class TypedSheet(_TypedSheet[R]):
+    """
+    Endpoint for one sheet whose rows are decoded straight into a `Row` class, returned by `xiv.sheet(Item)`.
+
+    Only the fields declared by the row class are requested (unless `fields` is passed), which keeps responses, decoding time and
+    the memory held by rows small. Rows skip model validation, whatever the client's `decode` option.
+
+    See: `Sheet`
+    """
+    def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> R:
+        """Fetch a single row from the sheet (`GET /sheet/{sheet}/{row}`)."""
+        data, errors = request(path=f"/sheet/{self.type}/{row_id}", params=self.params(params), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return self.row.from_row(data)
+
+    def list(self, params: Optional[SheetQuery] = None) -> List[R]:
+        """Fetch multiple rows from the sheet (`GET /sheet/{sheet}`)."""
+        data, errors = request(path=f"/sheet/{self.type}", params=self.params(params), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return self.decode(data["rows"])
+
+    def iter_rows(self, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> Iterator[R]:
+        """
+        Lazily iterate every row of the sheet, fetching the next page in the background.
+
+        See: `Sheets.iter_rows`
+        """
+        query = { **self.params(params), "limit": page_size }
+
+        def pages() -> Iterator[List[R]]:
+            while True:
+                rows = self.list(SheetQuery(**query))
+                if not rows:
+                    return
+                yield rows
+                query["after"] = pagination.after(rows[-1])
+
+        for rows in pagination.prefetch(pages(), prefetch):
+            yield from rows
+
+    def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> Rows[R]:
+        """
+        Fetch many rows from the sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        See: `Sheets.get_many`
+        """
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+        path = f"/sheet/{self.type}"
+        base = normalize(self.params(params), self.options)
+
+        def fetch(batch: List[str]) -> List[R]:
+            data, errors = request(path=path, params={ **base, "rows": ",".join(batch), "limit": len(batch) }, options=self.options)
+            if errors:
+                raise CustomError(errors[0]["message"])
+            return self.decode(data["rows"])
+
+        by_id, missing = match(row_ids, fetch_batches(fetch, batches(path, base, row_ids, batch_size), self.options.get("pool_size", DEFAULT_POOL_SIZE)))
+        return Rows(list(by_id.values()), by_id, missing)
+
+class AsyncTypedSheet(_TypedSheet[R]):
+    """
+    Asynchronous counterpart of `TypedSheet`, returned by `AsyncXIVAPI.sheet(Item)`.
+
+    See: `AsyncSheet`
+    """
+    async def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> R:
+        """Fetch a single row from the sheet (`GET /sheet/{sheet}/{row}`)."""
+        data, errors = await async_request(path=f"/sheet/{self.type}/{row_id}", params=self.params(params), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return self.row.from_row(data)
+
+    async def list(self, params: Optional[SheetQuery] = None) -> List[R]:
+        """Fetch multiple rows from the sheet (`GET /sheet/{sheet}`)."""
+        data, errors = await async_request(path=f"/sheet/{self.type}", params=self.params(params), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return self.decode(data["rows"])
+
+    async def iter_rows(self, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> AsyncIterator[R]:
+        """
+        Lazily iterate every row of the sheet, fetching the next page in the background.
+
+        See: `AsyncSheets.iter_rows`
+        """
+        query = { **self.params(params), "limit": page_size }
+
+        async def pages() -> AsyncIterator[List[R]]:
+            while True:
+                rows = await self.list(SheetQuery(**query))
+                if not rows:
+                    return
+                yield rows
+                query["after"] = pagination.after(rows[-1])
+
+        async for rows in pagination.async_prefetch(pages(), prefetch):
+            for row in rows:
+                yield row
+
+    async def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> Rows[R]:
+        """
+        Fetch many rows from the sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        See: `AsyncSheets.get_many`
+        """
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+        path = f"/sheet/{self.type}"
+        base = normalize(self.params(params), self.options)
+
+        async def fetch(batch: List[str]) -> List[R]:
+            data, errors = await async_request(path=path, params={ **base, "rows": ",".join(batch), "limit": len(batch) }, options=self.options)
+            if errors:
+                raise CustomError(errors[0]["message"])
+            return self.decode(data["rows"])
+
+        results = await asyncio.gather(*(fetch(batch) for batch in batches(path, base, row_ids, batch_size)))
+        by_id, missing = match(row_ids, [row for rows in results for row in rows])
+        return Rows(list(by_id.values()), by_id, missing)
@@ -0,0 +1,239 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Protocol, Tuple, Type, TypeVar, Unpack
+from .models import XIVAPIOptions
+from .session import DEFAULT_MAX_CONCURRENCY
+
+class Answered(Protocol):
+    """What the scheduler reads from a response to pace and retry requests."""
+    @property
+    def status_code(self) -> int: ...
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+
+R = TypeVar("R", bound=Answered)
+
+# Defaults used when the matching option is not provided
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+
+# Statuses worth retrying a `GET` for, and those that mean the API is asking us to slow down
+RETRY_STATUSES = frozenset({ 429, 500, 502, 503, 504 })
+THROTTLE_STATUSES = frozenset({ 429, 503 })
+
+def retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds to wait according to a `Retry-After` header, given either as seconds or as an HTTP date."""
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def _wake(waiter: "asyncio.Future[None]") -> None:
+    if not waiter.done():
+        waiter.set_result(None)
+
+class Scheduler:
+    """
+    Per-client request scheduler, shared by every endpoint object a client hands out.
+
+    Requests are admitted through a token bucket (`rate_limit` requests per second, bursting up to `burst`) and an adaptive
+    concurrency limit. The limit follows AIMD: it grows by roughly one slot per round of successful requests and is halved when the
+    API answers `429`/`503`, at most once per round of requests already in flight. A `Retry-After` header pauses every request
+    for the time asked. Failed `GET`s (retryable statuses and connection errors) are retried up to `retries` times with jittered
+    exponential backoff.
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.rate_limit: Optional[float] = options.get("rate_limit")
+        self.burst = float(options.get("burst") or max(1.0, self.rate_limit or 1.0))
+        self.retries = options.get("retries", DEFAULT_RETRIES)
+        self.backoff = DEFAULT_BACKOFF
+        self.max_backoff = DEFAULT_MAX_BACKOFF
+        self.max_limit = float(options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY))
+
+        self.limit = self.max_limit
+        self.in_flight = 0
+        self._tokens = self.burst
+        self._refilled = time.monotonic()
+        self._paused_until = 0.0
+        self._decreased = 0.0
+        self._counters = { "requests": 0, "retries": 0, "throttled": 0 }
+        self._lock = threading.Condition()
+        # Tasks waiting for a concurrency slot, woken on their own loop when one is released
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, "asyncio.Future[None]"]] = []
+
+    def _admit(self) -> Optional[float]:
+        """
+        Take a token and a concurrency slot, returning `0` once admitted, the seconds to wait before trying again, or `None` to
+        wait until a slot is released.
+        """
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+        if self.in_flight >= int(self.limit):
+            return None
+        if self.rate_limit is not None:
+            self._tokens = min(self.burst, self._tokens + (now - self._refilled) * self.rate_limit)
+            self._refilled = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.rate_limit
+            self._tokens -= 1
+        self.in_flight += 1
+        self._counters["requests"] += 1
+        return 0.0
+
+    def acquire(self, expires: Optional[float] = None) -> float:
+        """
+        Wait until a request may be sent, returning the time it was admitted at.
+        Raises `TimeoutError` if it cannot be admitted before `expires` (a `time.monotonic()` deadline).
+        """
+        with self._lock:
+            while (wait := self._admit()) != 0:
+                self._lock.wait(self._timeout(wait, expires))
+        return time.monotonic()
+
+    @staticmethod
+    def _timeout(wait: Optional[float], expires: Optional[float]) -> Optional[float]:
+        """Time to wait for, given the wait asked by `_admit`, raising `TimeoutError` if admission would come after `expires`."""
+        left = None if expires is None else expires - time.monotonic()
+        if left is not None and (left <= 0 or (wait is not None and wait > left)):
+            raise TimeoutError("Deadline exceeded while waiting for the rate limit")
+        return left if wait is None else wait
+
+    async def async_acquire(self, expires: Optional[float] = None) -> float:
+        """Asynchronous counterpart of `acquire`."""
+        loop = asyncio.get_running_loop()
+        while True:
+            released: Optional["asyncio.Future[None]"] = None
+            with self._lock:
+                wait = self._admit()
+                if wait == 0:
+                    return time.monotonic()
+                timeout = self._timeout(wait, expires)
+                if wait is None:
+                    released = loop.create_future()
+                    self._waiters.append((loop, released))
+            if released is None:
+                await asyncio.sleep(wait or 0)
+                continue
+            try:
+                await asyncio.wait_for(released, timeout)
+            except asyncio.TimeoutError:
+                # Admission is checked again, and fails once the deadline has passed
+                pass
+
+    def release(self, started: float, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None) -> None:
+        """Record the outcome of a request admitted at `started`, adapting the concurrency limit to it."""
+        with self._lock:
+            self.in_flight -= 1
+            if status in THROTTLE_STATUSES:
+                self._counters["throttled"] += 1
+                # Only requests sent after the last decrease can decrease the limit again
+                if started >= self._decreased:
+                    self.limit = max(1.0, self.limit / 2)
+                    self._decreased = time.monotonic()
+                delay = retry_after(headers)
+                if delay is not None:
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            elif status is not None and status < 500:
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._lock.notify_all()
+            for loop, waiter in self._waiters:
+                try:
+                    loop.call_soon_threadsafe(_wake, waiter)
+                except RuntimeError:
+                    # The waiter's loop has been closed
+                    pass
+            self._waiters.clear()
+
+    def delay(self, attempt: int, status: Optional[int] = None, headers: Optional[Mapping[str, str]] = None, expires: Optional[float] = None) -> Optional[float]:
+        """
+        Seconds to wait before retrying a failed attempt (`status` is `None` for connection errors), or `None` to give up,
+        which is also the case when the retry could not start before `expires`.
+        """
+        if attempt >= self.retries or (status is not None and status not in RETRY_STATUSES):
+            return None
+        backoff = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        wait = max(backoff, retry_after(headers) or 0.0)
+        if expires is not None and time.monotonic() + wait >= expires:
+            return None
+        with self._lock:
+            self._counters["retries"] += 1
+        return wait
+
+    def send(self, call: Callable[[], R], errors: Tuple[Type[BaseException], ...] = (), discard: Optional[Callable[[R], Any]] = None, expires: Optional[float] = None, on_retry: Optional[Callable[[int, Optional[int], float], Any]] = None) -> R:
+        """
+        Send a request through the scheduler, retrying it when it fails. `call` sends it and returns the response, `errors` are the
+        exceptions worth retrying, and `discard` releases a response that is about to be retried. No retry is started past `expires`.
+        `on_retry` is called with the attempt, status code (`None` for errors) and wait before each retry.
+        """
+        attempt = 0
+        while True:
+            started = self.acquire(expires)
+            try:
+                response = call()
+            except errors:
+                self.release(started)
+                status = None
+                wait = self.delay(attempt, expires=expires)
+                if wait is None:
+                    raise
+            except BaseException:
+                self.release(started)
+                raise
+            else:
+                self.release(started, response.status_code, response.headers)
+                status = response.status_code
+                wait = self.delay(attempt, response.status_code, response.headers, expires)
+                if wait is None:
+                    return response
+                if discard is not None:
+                    discard(response)
+            if on_retry is not None:
+                on_retry(attempt + 1, status, wait)
+            time.sleep(wait)
+            attempt += 1
+
+    async def async_send(self, call: Callable[[], Awaitable[R]], errors: Tuple[Type[BaseException], ...] = (), discard: Optional[Callable[[R], Awaitable[Any]]] = None, expires: Optional[float] = None, on_retry: Optional[Callable[[int, Optional[int], float], Any]] = None) -> R:
+        """Asynchronous counterpart of `send`."""
+        attempt = 0
+        while True:
+            started = await self.async_acquire(expires)
+            try:
+                response = await call()
+            except errors:
+                self.release(started)
+                status = None
+                wait = self.delay(attempt, expires=expires)
+                if wait is None:
+                    raise
+            except BaseException:
+                self.release(started)
+                raise
+            else:
+                self.release(started, response.status_code, response.headers)
+                status = response.status_code
+                wait = self.delay(attempt, response.status_code, response.headers, expires)
+                if wait is None:
+                    return response
+                if discard is not None:
+                    await discard(response)
+            if on_retry is not None:
+                on_retry(attempt + 1, status, wait)
+            await asyncio.sleep(wait)
+            attempt += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Current concurrency limit and requests in flight, along with request, retry and throttled counters."""
+        with self._lock:
+            return { "limit": self.limit, "in_flight": self.in_flight, **self._counters }
@@ -0,0 +1,292 @@
+import asyncio
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, Mapping, Optional, Protocol, Tuple, Type, Unpack
+from .models import XIVAPIOptions
+
+if TYPE_CHECKING:
+    import requests
+
+# Defaults used when the matching option is not provided
+DEFAULT_POOL_SIZE = 10
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_CONCURRENCY = 100
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+class Response(Protocol):
+    """Response returned by a transport; streamed responses must also be closed once read."""
+    @property
+    def status_code(self) -> int: ...
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+    @property
+    def content(self) -> bytes: ...
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]: ...
+    def close(self) -> None: ...
+
+class Transport(Protocol):
+    """
+    How a client sends its requests. `Session` (HTTP/1.1) is used by default; `Http2Session` is selected with the `transport`
+    option, and `pyxivapi.lib.transports` has mock, recording and replaying transports, passed as the `session` option.
+    The attributes are only read, so they may be plain attributes or properties.
+    """
+    @property
+    def closed(self) -> bool: ...
+    @property
+    def timeout(self) -> Tuple[float, float]: ...
+    @property
+    def transient_errors(self) -> Tuple[Type[BaseException], ...]: ...
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        """Send a `GET` request. Accepts `headers`, a `(connect, read)` `timeout` and `stream=True` to read the body in chunks."""
+        ...
+
+    def close(self) -> None: ...
+
+class AsyncResponse(Protocol):
+    @property
+    def status_code(self) -> int: ...
+    @property
+    def headers(self) -> Mapping[str, str]: ...
+    @property
+    def content(self) -> bytes: ...
+
+    async def aread(self) -> bytes: ...
+    def aiter_bytes(self, chunk_size: int) -> AsyncIterator[bytes]: ...
+    async def aclose(self) -> None: ...
+
+class AsyncTransport(Protocol):
+    """Asynchronous counterpart of `Transport`, used by `AsyncXIVAPI`. `stream` returns once headers are received."""
+    @property
+    def closed(self) -> bool: ...
+    @property
+    def timeout(self) -> Tuple[float, float]: ...
+    @property
+    def transient_errors(self) -> Tuple[Type[BaseException], ...]: ...
+
+    async def get(self, url: str, **kwargs: Any) -> AsyncResponse: ...
+    async def stream(self, url: str, **kwargs: Any) -> AsyncResponse: ...
+    async def close(self) -> None: ...
+
+class Session:
+    """
+    Pooled, keep-alive HTTP session shared by a client and every endpoint object it hands out.
+
+    Connections are reused between requests, so only the first request to the API pays for the TCP and TLS handshake.
+    The pool (and `requests` itself) is only set up by that first request, so clients answered from a cache never pay for it.
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.pool_size = options.get("pool_size", DEFAULT_POOL_SIZE)
+        self.timeout: Tuple[float, float] = (
+            options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+            options.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        )
+        self.closed = False
+        self.compression = options.get("compression", True)
+        self.keep_alive = options.get("keep_alive", True)
+        self._http: Optional["requests.Session"] = None
+        self._lock = threading.Lock()
+
+    @property
+    def transient_errors(self) -> Tuple[Type[BaseException], ...]:
+        import requests
+        return (requests.ConnectionError, requests.Timeout)
+
+    def _connect(self) -> "requests.Session":
+        with self._lock:
+            if self._http is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.request import ACCEPT_ENCODING
+
+                http = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                http.mount("https://", adapter)
+                http.mount("http://", adapter)
+
+                # gzip/deflate are always available, brotli/zstd when their decoders are installed
+                http.headers["Accept-Encoding"] = ACCEPT_ENCODING if self.compression else "identity"
+                http.headers["Connection"] = "keep-alive" if self.keep_alive else "close"
+                self._http = http
+            return self._http
+
+    def get(self, url: str, **kwargs: Any) -> "requests.Response":
+        """Send a `GET` request through the pool, applying the session timeouts unless overridden."""
+        kwargs.setdefault("timeout", self.timeout)
+        return (self._http or self._connect()).get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection. The session cannot be used afterwards."""
+        if not self.closed:
+            self.closed = True
+            if self._http is not None:
+                self._http.close()
+
+    def __enter__(self) -> "Session":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class AsyncSession:
+    """
+    Asynchronous counterpart of `Session`, shared by an `AsyncXIVAPI` client and every endpoint object it hands out.
+
+    Requests go through a single `httpx.AsyncClient` connection pool, and at most `max_concurrency` of them are in flight at once.
+    With the `http2` transport, they are multiplexed as concurrent streams over as few connections as possible.
+    Requires the optional `httpx` dependency (`pip install pyxivapi[async]`, or `pyxivapi[http2]` for HTTP/2).
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        try:
+            import httpx
+        except ImportError as e:
+            raise ImportError("AsyncXIVAPI requires httpx, install it with `pip install pyxivapi[async]`") from e
+
+        self.pool_size = options.get("pool_size", DEFAULT_POOL_SIZE)
+        self.max_concurrency = options.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+        self.timeout: Tuple[float, float] = (
+            options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+            options.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        )
+        self.closed = False
+        self.transient_errors: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        headers = {}
+        if not options.get("compression", True):
+            headers["Accept-Encoding"] = "identity"
+        keep_alive = options.get("keep_alive", True)
+        self._http = httpx.AsyncClient(
+            http2=_http2(options),
+            headers=headers,
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size if keep_alive else 0),
+        )
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        """Send a `GET` request through the pool once a concurrency slot is free, returning the `httpx.Response`."""
+        async with self._semaphore:
+            return await self._http.get(url, **kwargs)
+
+    async def stream(self, url: str, **kwargs: Any) -> Any:
+        """
+        Send a `GET` request once a concurrency slot is free, returning as soon as its headers are received.
+        The body is read from the returned `httpx.Response`, which must be closed with `aclose()`.
+        """
+        async with self._semaphore:
+            return await self._http.send(self._http.build_request("GET", url, **kwargs), stream=True)
+
+    async def close(self) -> None:
+        """Close every pooled connection. The session cannot be used afterwards."""
+        if not self.closed:
+            self.closed = True
+            await self._http.aclose()
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+class _StreamedResponse:
+    """`httpx.Response` being streamed, read like a streamed `requests.Response`."""
+    def __init__(self, response: Any) -> None:
+        self._response = response
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._response, name)
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        chunks: Iterator[bytes] = self._response.iter_bytes(chunk_size)
+        return chunks
+
+class Http2Session:
+    """
+    HTTP/2 counterpart of `Session`, selected with the `http2` transport. Concurrent requests (e.g. from `get_many` or the crawler's
+    threads) are multiplexed as streams over one connection instead of each holding a pooled connection, which suits floods of
+    small row requests. Servers that do not negotiate HTTP/2 are spoken to over HTTP/1.1.
+    Requires `httpx` with HTTP/2 support (`pip install pyxivapi[http2]`).
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        try:
+            import httpx
+            import h2 # noqa: F401
+        except ImportError as e:
+            raise ImportError("The http2 transport requires httpx[http2], install it with `pip install pyxivapi[http2]`") from e
+
+        self.pool_size = options.get("pool_size", DEFAULT_POOL_SIZE)
+        self.timeout: Tuple[float, float] = (
+            options.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+            options.get("read_timeout", DEFAULT_READ_TIMEOUT),
+        )
+        self.closed = False
+        self.transient_errors: Tuple[Type[BaseException], ...] = (httpx.TransportError,)
+        self._httpx = httpx
+
+        headers = {}
+        if not options.get("compression", True):
+            headers["Accept-Encoding"] = "identity"
+        keep_alive = options.get("keep_alive", True)
+        self._http = httpx.Client(
+            http2=True,
+            headers=headers,
+            timeout=httpx.Timeout(self.timeout[1], connect=self.timeout[0]),
+            limits=httpx.Limits(max_connections=self.pool_size, max_keepalive_connections=self.pool_size if keep_alive else 0),
+        )
+
+    def get(self, url: str, stream: bool = False, timeout: Optional[Tuple[float, float]] = None, **kwargs: Any) -> Any:
+        """Send a `GET` request, taking the same arguments as `Session.get`."""
+        if timeout is not None:
+            kwargs["timeout"] = self._httpx.Timeout(timeout[1], connect=timeout[0])
+        if stream:
+            return _StreamedResponse(self._http.send(self._http.build_request("GET", url, **kwargs), stream=True))
+        return self._http.get(url, **kwargs)
+
+    def close(self) -> None:
+        """Close the connections. The session cannot be used afterwards."""
+        if not self.closed:
+            self.closed = True
+            self._http.close()
+
+    def __enter__(self) -> "Http2Session":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+# Transports selectable by name through the `transport` option
+TRANSPORTS = ("http1", "http2")
+
+def _http2(options: Mapping[str, Any]) -> bool:
+    transport: str = options.get("transport", "http1")
+    if transport not in TRANSPORTS:
+        raise ValueError(f"Unknown transport {transport!r}, expected one of {', '.join(TRANSPORTS)}")
+    return transport == "http2"
+
+def connect(**options: Unpack[XIVAPIOptions]) -> Transport:
+    """Session for the transport named by the `transport` option (`http1` by default)."""
+    return Http2Session(**options) if _http2(options) else Session(**options)
+
+_default_session: Optional[Session] = None
+# httpx clients are bound to the event loop they are first used on, so each running loop gets its own
+_default_async_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncSession]" = weakref.WeakKeyDictionary()
+
+def default_session() -> Session:
+    """Session used by endpoint objects created without a client (e.g. a bare `Sheets()`)."""
+    global _default_session
+    if _default_session is None or _default_session.closed:
+        _default_session = Session()
+    return _default_session
+
+def default_async_session() -> AsyncSession:
+    """
+    Session used by asynchronous endpoint objects created without a client (e.g. a bare `AsyncSheets()`), one per running event
+    loop.
+    """
+    loop = asyncio.get_running_loop()
+    session = _default_async_sessions.get(loop)
+    if session is None or session.closed:
+        session = _default_async_sessions[loop] = AsyncSession()
+    return session
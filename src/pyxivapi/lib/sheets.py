@@ -1,7 +1,77 @@
-from typing import Optional, Unpack
-from pyxivapi.client import XIVAPIOptions
-from .models import (RowReaderQuery, SheetQuery, RowResponse, SheetResponse, ListResponse, SchemaSpecifier)
-from ..utils import request, CustomError
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple, TypeVar, Unpack
+from .models import (RowReaderQuery, SheetQuery, RowResponse, RowResult, RowsResponse, SheetResponse, ListResponse, SchemaSpecifier, XIVAPIOptions)
+from .session import DEFAULT_POOL_SIZE
+from . import pagination
+from .prepared import PreparedGet, AsyncPreparedGet, query_model
+from ..utils import request, async_request, normalize, url_for, decode, as_model, Decoded
+from ..errors import CustomError
+
+if TYPE_CHECKING:
+    from .languages import MultilingualSheet, AsyncMultilingualSheet
+
+class Identified(Protocol):
+    # Read-only, so that named tuples (e.g. `MultilingualRow`) match too
+    @property
+    def row_id(self) -> int: ...
+    @property
+    def subrow_id(self) -> Optional[int]: ...
+
+R = TypeVar("R", bound=Identified)
+T = TypeVar("T")
+W = TypeVar("W")
+
+# Longest URL sent for a batched `rows=` request, comfortably under the limits of common servers and proxies
+MAX_URL_LENGTH = 2000
+
+# Number of rows requested per batch by `get_many`, unless overridden
+DEFAULT_BATCH_SIZE = 100
+
+def batches(path: str, params: Dict[str, Any], ids: List[str], batch_size: int = DEFAULT_BATCH_SIZE) -> List[List[str]]:
+    """Split row `ids` into batches of at most `batch_size`, each keeping its `rows=` request URL under `MAX_URL_LENGTH`."""
+    room = MAX_URL_LENGTH - len(url_for(path, { **params, "limit": batch_size })) - len("&rows=")
+    result: List[List[str]] = []
+    batch: List[str] = []
+    length = 0
+    for row in ids:
+        # Each ID is followed by an encoded comma (%2C)
+        size = len(quote(row)) + 3
+        if batch and (len(batch) >= batch_size or length + size > room):
+            result.append(batch)
+            batch, length = [], 0
+        batch.append(row)
+        length += size
+    if batch:
+        result.append(batch)
+    return result
+
+def match(ids: List[str], rows: Iterable[R]) -> Tuple[Dict[str, R], List[str]]:
+    """Match fetched `rows` back to the requested `ids`, returning the rows found by ID and the IDs no row was returned for."""
+    found: Dict[str, R] = {}
+    for row in rows:
+        found.setdefault(str(row.row_id), row)
+        if row.subrow_id is not None:
+            found[f"{row.row_id}:{row.subrow_id}"] = row
+    by_id = {i: found[i] for i in ids if i in found}
+    return by_id, [i for i in ids if i not in found]
+
+def collect(ids: List[str], rows: Iterable[RowResult]) -> RowsResponse:
+    """Match fetched `rows` back to the requested `ids`, reporting the IDs no row was returned for."""
+    by_id, missing = match(ids, rows)
+    return RowsResponse(rows=list(by_id.values()), by_id=by_id, missing=missing)
+
+def fetch_batches(fetch: Callable[[W], List[T]], work: List[W], workers: int) -> List[T]:
+    """Rows returned by `fetch` for every batch of `work`, fetched in parallel by up to `workers` threads when there are several."""
+    if len(work) <= 1:
+        return [row for batch in work for row in fetch(batch)]
+    with ThreadPoolExecutor(min(len(work), workers)) as pool:
+        # Each batch runs in a copy of the caller's context, so context-scoped settings still apply to it
+        contexts = [contextvars.copy_context() for _ in work]
+        results = list(pool.map(lambda context, batch: context.run(fetch, batch), contexts, work))
+    return [row for rows in results for row in rows]
 
 class Sheet:
     """
@@ -12,8 +82,10 @@ class Sheet:
     def __init__(self, sheet: SchemaSpecifier, **options: Unpack[XIVAPIOptions]) -> None:
         self.type = sheet
         self.options = XIVAPIOptions(**options)
+        # Requests go through one raw endpoint, created with the sheet rather than on every call
+        self.raw = Sheets(**self.options)
     
-    def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> RowResponse:
+    def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> Decoded[RowResponse]:
         """
         Fetch a single row from the sheet (`GET /sheet/{sheet}/{row}`).
         
@@ -21,21 +93,60 @@ class Sheet:
         """
         try:
             row_id = str(row_id)
-            return Sheets(**self.options).get(self.type, row_id, params or RowReaderQuery())
+            return self.raw.get(self.type, row_id, params or RowReaderQuery())
+        except CustomError:
+            raise
         except Exception as e:
             raise CustomError(str(e))
         
-    def list(self, params: Optional[SheetQuery] = None) -> SheetResponse:
+    def list(self, params: Optional[SheetQuery] = None) -> Decoded[SheetResponse]:
         """
         Fetches multiple rows from the sheet (`GET /sheet/{sheet}`).
         
         See: https://v2.xivapi.com/api/docs#tag/sheets/get/sheet/{sheet}
         """
         try:
-            return Sheets(**self.options).list(self.type, params or SheetQuery())
+            return self.raw.list(self.type, params or SheetQuery())
+        except CustomError:
+            raise
         except Exception as e:
             raise CustomError(str(e))
         
+    def iter_rows(self, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> Iterator[RowResult]:
+        """
+        Lazily iterate every row of the sheet, paginating through `GET /sheet/{sheet}` and fetching the next page in the background.
+        
+        See: `Sheets.iter_rows`
+        """
+        return self.raw.iter_rows(self.type, params, page_size, prefetch)
+        
+    def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> RowsResponse:
+        """
+        Fetch many rows from the sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+        
+        See: `Sheets.get_many`
+        """
+        return self.raw.get_many(self.type, ids, params, batch_size)
+
+    def prepare_get(self, params: Optional[RowReaderQuery] = None, **query: Any) -> PreparedGet:
+        """
+        Prepare a row lookup with fixed query parameters (`params`, or keyword arguments such as `fields=`), to be called with each row ID.
+        
+        See: `PreparedGet`
+        """
+        return PreparedGet(self.type, query_model(RowReaderQuery, params, query), self.options)
+
+    def multilingual(self, languages: Optional[Sequence[str]] = None) -> "MultilingualSheet":
+        """
+        Endpoint reading the sheet in several `languages` at once (every language by default), merging each row's fields so that
+        only those that differ between languages are held once per language.
+        
+        See: `MultilingualSheet`
+        """
+        # Imported here, as the languages module builds on this one
+        from .languages import LANGUAGES, MultilingualSheet
+        return MultilingualSheet(self.type, languages or LANGUAGES, **self.options)
+        
 class Sheets:
     """
     Raw endpoints for reading data from XIVAPI sheets.
@@ -45,14 +156,14 @@ class Sheets:
     def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
         self.options = XIVAPIOptions(**options)
     
-    def all(self) -> ListResponse:
+    def all(self) -> Decoded[ListResponse]:
         """List all known sheets."""
-        data, errors = request(path="/sheet", params={}, **self.options)
+        data, errors = request(path="/sheet", params={}, options=self.options)
         if errors:
             raise CustomError(errors[0]["message"])
-        return ListResponse(**data)
+        return decode(ListResponse, data, self.options)
     
-    def list(self, sheet: SchemaSpecifier, params: Optional[SheetQuery] = None) -> SheetResponse:
+    def list(self, sheet: SchemaSpecifier, params: Optional[SheetQuery] = None) -> Decoded[SheetResponse]:
         """Fetch multiple rows from a sheet."""
         if params is None:
             params = SheetQuery()
@@ -61,15 +172,224 @@ class Sheets:
         data, errors = request(path=f"/sheet/{sheet}", params=params.model_dump(exclude_none=True), options=self.options)
         if errors:
             raise CustomError(errors[0]["message"])
-        return SheetResponse(**data)
+        return decode(SheetResponse, data, self.options)
     
-    def get(self, sheet: SchemaSpecifier, row: str, params: Optional[RowReaderQuery] = None) -> RowResponse:
+    def get(self, sheet: SchemaSpecifier, row: str, params: Optional[RowReaderQuery] = None) -> Decoded[RowResponse]:
         """Fetch a single row from a sheet."""
+        if params is None:
+            params = RowReaderQuery()
+        elif isinstance(params, dict):
+            params = RowReaderQuery(**params)
+        data, errors = request(path=f"/sheet/{sheet}/{row}", params=params.model_dump(exclude_none=True), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(RowResponse, data, self.options)
+
+    def iter_rows(self, sheet: SchemaSpecifier, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> Iterator[RowResult]:
+        """
+        Lazily iterate every row of a sheet, starting after `params.after` when provided.
+        
+        Rows are requested `page_size` at a time, and up to `prefetch` pages are fetched in a background thread while the caller
+        processes the current one (`0` disables prefetching).
+        """
         if params is None:
             params = SheetQuery()
         elif isinstance(params, dict):
             params = SheetQuery(**params)
-        data, errors = request(path=f"/sheet/{sheet}/{row}", params=params.model_dump(exclude_none=True), options=self.options)
+        query = params.model_copy(update={ "limit": page_size })
+
+        def pages() -> Iterator[List[RowResult]]:
+            nonlocal query
+            while True:
+                rows = as_model(SheetResponse, self.list(sheet, query)).rows
+                if not rows:
+                    return
+                yield rows
+                query = query.model_copy(update={ "after": pagination.after(rows[-1]) })
+
+        for rows in pagination.prefetch(pages(), prefetch):
+            yield from rows
+
+    def get_many(self, sheet: SchemaSpecifier, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> RowsResponse:
+        """
+        Fetch many rows from a sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+        
+        Duplicate IDs are requested once, batches are sent in parallel over the client's connection pool, and IDs the sheet has no
+        row for are reported in `missing` rather than raised.
+        """
+        if params is None:
+            params = RowReaderQuery()
+        elif isinstance(params, dict):
+            params = RowReaderQuery(**params)
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+        path = f"/sheet/{sheet}"
+        base = normalize(params.model_dump(exclude_none=True), self.options)
+        
+        def fetch(batch: List[str]) -> List[RowResult]:
+            data, errors = request(path=path, params={ **base, "rows": ",".join(batch), "limit": len(batch) }, options=self.options)
+            if errors:
+                raise CustomError(errors[0]["message"])
+            return as_model(SheetResponse, decode(SheetResponse, data, self.options)).rows
+        
+        work = batches(path, base, row_ids, batch_size)
+        return collect(row_ids, fetch_batches(fetch, work, self.options.get("pool_size", DEFAULT_POOL_SIZE)))
+
+class AsyncSheet:
+    """
+    Asynchronous counterpart of `Sheet`.
+
+    See: https://v2.xivapi.com/api/docs#tag/sheets
+    """
+    def __init__(self, sheet: SchemaSpecifier, **options: Unpack[XIVAPIOptions]) -> None:
+        self.type = sheet
+        self.options = XIVAPIOptions(**options)
+        # Requests go through one raw endpoint, created with the sheet rather than on every call
+        self.raw = AsyncSheets(**self.options)
+
+    async def get(self, row_id: str | int, params: Optional[RowReaderQuery] = None) -> Decoded[RowResponse]:
+        """
+        Fetch a single row from the sheet (`GET /sheet/{sheet}/{row}`).
+
+        See: https://v2.xivapi.com/api/docs#tag/sheets/get/sheet/{sheet}/{row}
+        """
+        try:
+            return await self.raw.get(self.type, str(row_id), params or RowReaderQuery())
+        except CustomError:
+            raise
+        except Exception as e:
+            raise CustomError(str(e))
+
+    async def list(self, params: Optional[SheetQuery] = None) -> Decoded[SheetResponse]:
+        """
+        Fetches multiple rows from the sheet (`GET /sheet/{sheet}`).
+
+        See: https://v2.xivapi.com/api/docs#tag/sheets/get/sheet/{sheet}
+        """
+        try:
+            return await self.raw.list(self.type, params or SheetQuery())
+        except CustomError:
+            raise
+        except Exception as e:
+            raise CustomError(str(e))
+
+    def iter_rows(self, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> AsyncIterator[RowResult]:
+        """
+        Lazily iterate every row of the sheet, paginating through `GET /sheet/{sheet}` and fetching the next page in the background.
+
+        See: `AsyncSheets.iter_rows`
+        """
+        return self.raw.iter_rows(self.type, params, page_size, prefetch)
+
+    async def get_many(self, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> RowsResponse:
+        """
+        Fetch many rows from the sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        See: `AsyncSheets.get_many`
+        """
+        return await self.raw.get_many(self.type, ids, params, batch_size)
+
+    def prepare_get(self, params: Optional[RowReaderQuery] = None, **query: Any) -> AsyncPreparedGet:
+        """
+        Prepare a row lookup with fixed query parameters (`params`, or keyword arguments such as `fields=`), to be awaited with each row ID.
+
+        See: `AsyncPreparedGet`
+        """
+        return AsyncPreparedGet(self.type, query_model(RowReaderQuery, params, query), self.options)
+
+    def multilingual(self, languages: Optional[Sequence[str]] = None) -> "AsyncMultilingualSheet":
+        """
+        Endpoint reading the sheet in several `languages` at once (every language by default), merging each row's fields so that
+        only those that differ between languages are held once per language.
+
+        See: `AsyncMultilingualSheet`
+        """
+        from .languages import LANGUAGES, AsyncMultilingualSheet
+        return AsyncMultilingualSheet(self.type, languages or LANGUAGES, **self.options)
+
+class AsyncSheets:
+    """
+    Asynchronous counterpart of `Sheets`.
+
+    See: https://v2.xivapi.com/api/docs#tag/sheets
+    """
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+
+    async def all(self) -> Decoded[ListResponse]:
+        """List all known sheets."""
+        data, errors = await async_request(path="/sheet", params={}, options=self.options)
         if errors:
             raise CustomError(errors[0]["message"])
-        return RowResponse(**data)
\ No newline at end of file
+        return decode(ListResponse, data, self.options)
+
+    async def list(self, sheet: SchemaSpecifier, params: Optional[SheetQuery] = None) -> Decoded[SheetResponse]:
+        """Fetch multiple rows from a sheet."""
+        if params is None:
+            params = SheetQuery()
+        elif isinstance(params, dict):
+            params = SheetQuery(**params)
+        data, errors = await async_request(path=f"/sheet/{sheet}", params=params.model_dump(exclude_none=True), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(SheetResponse, data, self.options)
+
+    async def get(self, sheet: SchemaSpecifier, row: str, params: Optional[RowReaderQuery] = None) -> Decoded[RowResponse]:
+        """Fetch a single row from a sheet."""
+        if params is None:
+            params = RowReaderQuery()
+        elif isinstance(params, dict):
+            params = RowReaderQuery(**params)
+        data, errors = await async_request(path=f"/sheet/{sheet}/{row}", params=params.model_dump(exclude_none=True), options=self.options)
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return decode(RowResponse, data, self.options)
+
+    async def iter_rows(self, sheet: SchemaSpecifier, params: Optional[SheetQuery] = None, page_size: int = pagination.DEFAULT_PAGE_SIZE, prefetch: int = 1) -> AsyncIterator[RowResult]:
+        """
+        Lazily iterate every row of a sheet, starting after `params.after` when provided.
+
+        Rows are requested `page_size` at a time, and up to `prefetch` pages are fetched in a background task while the caller
+        processes the current one (`0` disables prefetching).
+        """
+        if params is None:
+            params = SheetQuery()
+        elif isinstance(params, dict):
+            params = SheetQuery(**params)
+        query = params.model_copy(update={ "limit": page_size })
+
+        async def pages() -> AsyncIterator[List[RowResult]]:
+            nonlocal query
+            while True:
+                rows = as_model(SheetResponse, await self.list(sheet, query)).rows
+                if not rows:
+                    return
+                yield rows
+                query = query.model_copy(update={ "after": pagination.after(rows[-1]) })
+
+        async for rows in pagination.async_prefetch(pages(), prefetch):
+            for row in rows:
+                yield row
+
+    async def get_many(self, sheet: SchemaSpecifier, ids: Iterable[str | int], params: Optional[RowReaderQuery] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> RowsResponse:
+        """
+        Fetch many rows from a sheet at once, batching them through the `rows` parameter of `GET /sheet/{sheet}`.
+
+        Duplicate IDs are requested once, batches are sent concurrently (bounded by the client's `max_concurrency`), and IDs the sheet
+        has no row for are reported in `missing` rather than raised.
+        """
+        if params is None:
+            params = RowReaderQuery()
+        elif isinstance(params, dict):
+            params = RowReaderQuery(**params)
+        row_ids: List[str] = list(dict.fromkeys(str(i) for i in ids))
+        path = f"/sheet/{sheet}"
+        base = normalize(params.model_dump(exclude_none=True), self.options)
+
+        async def fetch(batch: List[str]) -> List[RowResult]:
+            data, errors = await async_request(path=path, params={ **base, "rows": ",".join(batch), "limit": len(batch) }, options=self.options)
+            if errors:
+                raise CustomError(errors[0]["message"])
+            return as_model(SheetResponse, decode(SheetResponse, data, self.options)).rows
+
+        results = await asyncio.gather(*(fetch(batch) for batch in batches(path, base, row_ids, batch_size)))
+        return collect(row_ids, [row for rows in results for row in rows])
@@ -0,0 +1,215 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Unpack
+from .cache import DiskCache
+from .crawl import Crawler, WorkUnit, DEFAULT_CRAWL_PAGE_SIZE
+from .mirror import Mirror
+from .models import ListResponse, RowResult, SchemaLanguage, SchemaSpecifier, SheetQuery, XIVAPIOptions
+from .sheets import Sheets
+from .versions import Versions
+from ..utils import as_model
+from ..errors import CustomError
+
+# Row and subrow ID of a row, with `-1` standing in for rows without subrows
+RowKey = Tuple[int, int]
+
+def row_key(row: RowResult) -> RowKey:
+    return row.row_id, -1 if row.subrow_id is None else row.subrow_id
+
+def row_hash(row: RowResult) -> bytes:
+    """Compact (8 byte) hash of the content of a row, independent of the order of its fields."""
+    canonical = json.dumps(row.fields, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode(), digest_size=8).digest()
+
+class SheetDelta(NamedTuple):
+    """Rows of a sheet that differ between two versions, as found by `Sync.run`."""
+    sheet: SchemaSpecifier
+    """Name of the sheet."""
+    previous: Optional[str]
+    """Version the sheet was last synced at, or `None` on its first sync (every row is then added)."""
+    version: str
+    """Version the sheet was synced to."""
+    language: str
+    """Language the sheet was read in (empty for the API default)."""
+    added: List[RowResult]
+    """Rows new in `version`."""
+    changed: List[RowResult]
+    """Rows whose content differs in `version`, as read in it."""
+    removed: List[RowKey]
+    """Row and subrow IDs (`-1` without subrows) of the rows no longer in `version`."""
+    unchanged: int
+    """Number of rows identical in both versions."""
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def summary(self) -> str:
+        return f"{self.sheet}: +{len(self.added)} ~{len(self.changed)} -{len(self.removed)} ({self.unchanged} unchanged)"
+
+    def write(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the delta as JSONL at `path`: one `{"op", "row_id", "subrow_id", "fields"}` record per added (`add`), changed
+        (`change`) or removed (`remove`, without fields) row. The file is replaced atomically once complete.
+        """
+        temporary = f"{os.fspath(path)}.tmp"
+        with open(temporary, "w") as file:
+            for op, rows in (("add", self.added), ("change", self.changed)):
+                for row in rows:
+                    record = { "op": op, "row_id": row.row_id, "subrow_id": row.subrow_id, "fields": row.fields }
+                    file.write(json.dumps(record, separators=(",", ":")) + "\n")
+            for row_id, subrow_id in self.removed:
+                file.write(json.dumps({ "op": "remove", "row_id": row_id, "subrow_id": None if subrow_id < 0 else subrow_id }) + "\n")
+        os.replace(temporary, path)
+
+    def apply(self, path: str | os.PathLike[str]) -> None:
+        """
+        Apply the delta to the mirror of the sheet at `path`, which must have been taken at the previous version. The updated mirror
+        replaces it atomically, at the new version. On a first sync, the delta holds every row and creates the mirror instead.
+        """
+        if self.previous is None:
+            return Mirror.write(path, self.added, sheet=self.sheet, version=self.version, language=self.language)
+        with Mirror(path) as mirror:
+            if mirror.sheet != self.sheet or mirror.version != self.previous:
+                raise CustomError(f"{mirror.path} mirrors {mirror.sheet} at version {mirror.version}, not {self.sheet} at {self.previous}")
+            dropped = set(self.removed) | { row_key(row) for row in self.changed }
+            rows = [row for row in mirror.rows() if row_key(row) not in dropped]
+        Mirror.write(path, [*rows, *self.changed, *self.added], sheet=self.sheet, version=self.version, language=self.language)
+
+class HashStore:
+    """
+    Content hashes of every row of the sheets synced, per language, along with the version they were taken at. Kept in an SQLite
+    file so that the next sync only needs the hashes, not a copy of the rows.
+    """
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = os.fspath(path)
+        # Sheets are recorded by the crawler's worker threads, serialised by the crawler
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute("CREATE TABLE IF NOT EXISTS sheets (sheet TEXT NOT NULL, language TEXT NOT NULL, version TEXT NOT NULL, PRIMARY KEY (sheet, language))")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes (sheet TEXT NOT NULL, language TEXT NOT NULL, row_id INTEGER NOT NULL, subrow_id INTEGER NOT NULL, "
+            "hash BLOB NOT NULL, PRIMARY KEY (sheet, language, row_id, subrow_id))"
+        )
+        self._db.commit()
+
+    def version(self, sheet: SchemaSpecifier, language: str = "") -> Optional[str]:
+        """Version `sheet` was last synced at in `language`, if ever."""
+        with self._lock:
+            row = self._db.execute("SELECT version FROM sheets WHERE sheet = ? AND language = ?", (sheet, language)).fetchone()
+        return None if row is None else row[0]
+
+    def hashes(self, sheet: SchemaSpecifier, language: str = "") -> Dict[RowKey, bytes]:
+        """Hashes of the rows of `sheet` at the version it was last synced at."""
+        with self._lock:
+            rows = self._db.execute("SELECT row_id, subrow_id, hash FROM hashes WHERE sheet = ? AND language = ?", (sheet, language)).fetchall()
+        return { (row_id, subrow_id): digest for row_id, subrow_id, digest in rows }
+
+    def record(self, sheet: SchemaSpecifier, version: str, hashes: Dict[RowKey, bytes], language: str = "") -> None:
+        """Replace the hashes of `sheet` with those taken at `version`, in one transaction."""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM hashes WHERE sheet = ? AND language = ?", (sheet, language))
+            self._db.executemany(
+                "INSERT INTO hashes (sheet, language, row_id, subrow_id, hash) VALUES (?, ?, ?, ?, ?)",
+                [(sheet, language, row_id, subrow_id, digest) for (row_id, subrow_id), digest in hashes.items()],
+            )
+            self._db.execute("INSERT OR REPLACE INTO sheets (sheet, language, version) VALUES (?, ?, ?)", (sheet, language, version))
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "HashStore":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class _Progress:
+    """Hashes of the rows of one sheet seen so far, and the rows that differ from the previous version."""
+    def __init__(self, previous: Dict[RowKey, bytes]) -> None:
+        self.previous = previous
+        self.hashes: Dict[RowKey, bytes] = {}
+        self.added: List[RowResult] = []
+        self.changed: List[RowResult] = []
+
+class Sync:
+    """
+    Keeps sheets up to date across game versions, keeping only the rows that change from one version to the next.
+
+    The latest version is found through the versions list; sheets already synced to it are skipped. Other sheets are crawled at the
+    new version, hashing every row as its page arrives, and the hashes are compared with those stored for the previous version: only
+    rows added, changed or removed are kept, as a `SheetDelta` per sheet, and the new hashes replace the old ones. The API has no
+    per-row change feed, so every row of a sheet that needs syncing is still read; but only 8 byte hashes are kept between syncs, and
+    deltas hold nothing but the rows that changed. Deltas are computed per sheet as its crawl completes, so an interrupted sync
+    resumes at the sheets not yet synced.
+
+    `params` (e.g. `fields`) should not change between syncs, as rows would no longer hash the same.
+    """
+    def __init__(self, store: HashStore, workers: Optional[int] = None, page_size: int = DEFAULT_CRAWL_PAGE_SIZE, params: Optional[SheetQuery | Dict[str, Any]] = None, **options: Unpack[XIVAPIOptions]) -> None:
+        self.store = store
+        self.workers = workers
+        self.page_size = page_size
+        self.params = params
+        self.options = XIVAPIOptions(**options)
+
+    @property
+    def language(self) -> str:
+        language = self.options.get("language") or ""
+        return language.value if isinstance(language, SchemaLanguage) else language
+
+    def latest(self) -> str:
+        """Canonical name of the version to sync to: the version in the options, or the latest one."""
+        versions = Versions(**self.options).raw()
+        return DiskCache.resolve(self.options.get("version") or "latest", versions)[0]
+
+    def stale(self, sheets: Optional[Iterable[SchemaSpecifier]] = None, version: Optional[str] = None) -> List[SchemaSpecifier]:
+        """Sheets (every sheet when omitted) not yet synced to `version` (the latest one when omitted)."""
+        version = version or self.latest()
+        if sheets is None:
+            sheets = [sheet.name for sheet in as_model(ListResponse, Sheets(**{ **self.options, "version": version }).all()).sheets]
+        return [sheet for sheet in sheets if self.store.version(sheet, self.language) != version]
+
+    def run(self, sheets: Optional[Iterable[SchemaSpecifier]] = None, version: Optional[str] = None, done: Optional[Callable[[SheetDelta], Any]] = None) -> Dict[SchemaSpecifier, SheetDelta]:
+        """
+        Sync `sheets` (every sheet when omitted) to `version` (the latest one when omitted), returning the delta of each sheet that
+        was not already synced to it. `done` is called with each delta as soon as its sheet is synced, before its hashes are stored,
+        e.g. to write or apply it.
+        """
+        version = version or self.latest()
+        pending = self.stale(sheets, version)
+        language = self.language
+        progress: Dict[SchemaSpecifier, _Progress] = {}
+        deltas: Dict[SchemaSpecifier, SheetDelta] = {}
+
+        def sink(sheet: SchemaSpecifier, rows: List[RowResult]) -> None:
+            state = progress.get(sheet)
+            if state is None:
+                state = progress[sheet] = _Progress(self.store.hashes(sheet, language))
+            for row in rows:
+                key, digest = row_key(row), row_hash(row)
+                state.hashes[key] = digest
+                previous = state.previous.get(key)
+                if previous is None:
+                    state.added.append(row)
+                elif previous != digest:
+                    state.changed.append(row)
+
+        def finish(unit: WorkUnit) -> None:
+            # Sheets without any row in the new version never reach the sink
+            state = progress.pop(unit.sheet, None) or _Progress(self.store.hashes(unit.sheet, language))
+            removed = sorted(state.previous.keys() - state.hashes.keys())
+            delta = SheetDelta(
+                unit.sheet, self.store.version(unit.sheet, language), version, language, state.added, state.changed, removed,
+                len(state.hashes) - len(state.added) - len(state.changed),
+            )
+            if done is not None:
+                done(delta)
+            self.store.record(unit.sheet, version, state.hashes, language)
+            deltas[unit.sheet] = delta
+
+        if pending:
+            crawler = Crawler(workers=self.workers, page_size=self.page_size, **{ **self.options, "version": version })
+            crawler.run(sink, [WorkUnit(sheet) for sheet in pending], self.params, finish)
+        return { sheet: deltas[sheet] for sheet in pending }
@@ -0,0 +1,213 @@
+import base64
+import json
+import threading
+from typing import IO, Any, AsyncIterator, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Type, Union
+from urllib.parse import urlsplit
+from requests.structures import CaseInsensitiveDict
+from .session import DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT, AsyncTransport, Transport
+from ..errors import CustomError
+
+# What a mock route answers with: a full (status, headers, body) response, a body, JSON-serialisable data, or a function of the URL
+Reply = Union[Tuple[int, Mapping[str, str], bytes], bytes, Dict[str, Any], List[Any], Callable[[str], Any]]
+
+def route_key(url: str) -> str:
+    """Key of a request URL in mock routes and cassettes: its path and query, so recordings replay against any host."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+class MockResponse:
+    """In-memory response served by the mock and replaying transports, readable like both `requests` and `httpx` responses."""
+    def __init__(self, status_code: int, headers: Mapping[str, str], content: bytes) -> None:
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers)
+        self.content = content
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def close(self) -> None:
+        pass
+
+    async def aread(self) -> bytes:
+        return self.content
+
+    async def aiter_bytes(self, chunk_size: int) -> AsyncIterator[bytes]:
+        for chunk in self.iter_content(chunk_size):
+            yield chunk
+
+    async def aclose(self) -> None:
+        pass
+
+def _response(reply: Any, url: str) -> MockResponse:
+    if callable(reply):
+        reply = reply(url)
+    if isinstance(reply, MockResponse):
+        return reply
+    if isinstance(reply, tuple):
+        return MockResponse(*reply)
+    if isinstance(reply, bytes):
+        return MockResponse(200, { "content-type": "application/octet-stream" }, reply)
+    return MockResponse(200, { "content-type": "application/json" }, json.dumps(reply).encode())
+
+class _Mock:
+    def __init__(self, routes: Optional[Mapping[str, Reply]] = None, strict: bool = False) -> None:
+        self.routes: Dict[str, Reply] = dict(routes or {})
+        self.strict = strict
+        self.requests: List[str] = []
+        self.closed = False
+        self.timeout: Tuple[float, float] = (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.transient_errors: Tuple[Type[BaseException], ...] = ()
+
+    @classmethod
+    def replay(cls, path: str) -> Any:
+        """Transport answering every request from the cassette at `path`, and failing requests that were not recorded."""
+        return cls(load_cassette(path), strict=True)
+
+    def route(self, path: str, reply: Reply) -> None:
+        """Answer requests for `path` (with its query string, to only match those parameters) with `reply`."""
+        self.routes[path] = reply
+
+    def _respond(self, url: str) -> MockResponse:
+        if self.closed:
+            raise CustomError("Cannot send a request through a closed session")
+        self.requests.append(url)
+        key = route_key(url)
+        reply = self.routes.get(key, self.routes.get(key.split("?")[0]))
+        if reply is None:
+            if self.strict:
+                raise CustomError(f"No response recorded for {key}")
+            return MockResponse(404, { "content-type": "application/json" }, json.dumps({ "code": 404, "message": f"No mock route for {key}" }).encode())
+        return _response(reply, url)
+
+class MockSession(_Mock):
+    """
+    In-memory transport for tests and offline use, passed as the `session` option. Requests are answered from `routes`, keyed on
+    the URL path (and optionally query string), and kept in `requests`. Unrouted requests get a `404`, or raise when `strict`.
+
+        session = MockSession({ "/api/sheet/Item/1": { "row_id": 1, "fields": { "Name": "Item" } } })
+        XIVAPI(session=session).items.get(1)
+    """
+    def get(self, url: str, **kwargs: Any) -> MockResponse:
+        return self._respond(url)
+
+    def close(self) -> None:
+        self.closed = True
+
+class AsyncMockSession(_Mock):
+    """Asynchronous counterpart of `MockSession`, for `AsyncXIVAPI`."""
+    async def get(self, url: str, **kwargs: Any) -> MockResponse:
+        return self._respond(url)
+
+    async def stream(self, url: str, **kwargs: Any) -> MockResponse:
+        return self._respond(url)
+
+    async def close(self) -> None:
+        self.closed = True
+
+def load_cassette(path: str) -> Dict[str, Tuple[int, Dict[str, str], bytes]]:
+    """Responses recorded by a `RecordingSession`, keyed like mock routes. Later recordings of a URL replace earlier ones."""
+    responses: Dict[str, Tuple[int, Dict[str, str], bytes]] = {}
+    with open(path) as file:
+        for line in file:
+            if line.strip():
+                entry = json.loads(line)
+                responses[entry["key"]] = (entry["status"], entry["headers"], base64.b64decode(entry["body"]))
+    return responses
+
+class _Recorder:
+    session: Union[Transport, AsyncTransport]
+
+    def __init__(self, session: Union[Transport, AsyncTransport], path: str) -> None:
+        self.session = session
+        self.path = path
+        self._lock = threading.Lock()
+        # Opened by the first recording, so a recorder that is never used (or never closed) leaves no file handle behind
+        self._file: Optional[IO[str]] = None
+
+    @property
+    def closed(self) -> bool:
+        return self.session.closed
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        return self.session.timeout
+
+    @property
+    def transient_errors(self) -> Tuple[Type[BaseException], ...]:
+        return self.session.transient_errors
+
+    def _record(self, url: str, status: int, headers: Mapping[str, str], body: bytes) -> MockResponse:
+        headers = { name.lower(): value for name, value in headers.items() if name.lower() in ("content-type", "etag", "last-modified", "retry-after") }
+        entry = { "key": route_key(url), "status": status, "headers": headers, "body": base64.b64encode(body).decode() }
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, "a")
+            self._file.write(json.dumps(entry) + "\n")
+            self._file.flush()
+        return MockResponse(status, headers, body)
+
+    def _close_file(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+class RecordingSession(_Recorder):
+    """
+    Transport sending requests through another `session` and appending every response to a cassette (JSON lines) at `path`.
+    Replay the cassette offline with `MockSession.replay(path)`. Streamed responses are buffered so that they can be recorded.
+    """
+    session: Transport
+
+    def __init__(self, session: Transport, path: str) -> None:
+        super().__init__(session, path)
+
+    def get(self, url: str, **kwargs: Any) -> MockResponse:
+        response = self.session.get(url, **kwargs)
+        try:
+            return self._record(url, response.status_code, response.headers, response.content)
+        finally:
+            response.close()
+
+    def close(self) -> None:
+        try:
+            self.session.close()
+        finally:
+            self._close_file()
+
+    def __enter__(self) -> "RecordingSession":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+class AsyncRecordingSession(_Recorder):
+    """Asynchronous counterpart of `RecordingSession`, replayed with `AsyncMockSession.replay(path)`."""
+    session: AsyncTransport
+
+    def __init__(self, session: AsyncTransport, path: str) -> None:
+        super().__init__(session, path)
+
+    async def get(self, url: str, **kwargs: Any) -> MockResponse:
+        response = await self.session.get(url, **kwargs)
+        return self._record(url, response.status_code, response.headers, response.content)
+
+    async def stream(self, url: str, **kwargs: Any) -> MockResponse:
+        response = await self.session.stream(url, **kwargs)
+        try:
+            return self._record(url, response.status_code, response.headers, await response.aread())
+        finally:
+            await response.aclose()
+
+    async def close(self) -> None:
+        try:
+            await self.session.close()
+        finally:
+            self._close_file()
+
+    async def __aenter__(self) -> "AsyncRecordingSession":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
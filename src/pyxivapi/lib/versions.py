@@ -1,10 +1,35 @@
-from .models import VersionsResponse
-from ..utils import request, CustomError
+from typing import Any, Dict, Unpack
+from .models import VersionsResponse, XIVAPIOptions
+from ..utils import request, async_request, decode, Decoded
+from ..errors import CustomError
 
 class Versions:
     """Raw versions endpoint."""
-    def all(self) -> VersionsResponse:
-        data, errors = request(path="/version", params={})
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+        
+    def all(self) -> Decoded[VersionsResponse]:
+        return decode(VersionsResponse, self.raw(), self.options)
+
+    def raw(self) -> Dict[str, Any]:
+        """The versions list as decoded from the response, whatever the `decode` option, e.g. to resolve version aliases."""
+        data, errors = request(path="/version", params={}, options=self.options, defaults=())
+        if errors:
+            raise CustomError(errors[0]["message"])
+        return data
+
+
+class AsyncVersions:
+    """Asynchronous counterpart of `Versions`."""
+    def __init__(self, **options: Unpack[XIVAPIOptions]) -> None:
+        self.options = XIVAPIOptions(**options)
+
+    async def all(self) -> Decoded[VersionsResponse]:
+        return decode(VersionsResponse, await self.raw(), self.options)
+
+    async def raw(self) -> Dict[str, Any]:
+        """Asynchronous counterpart of `Versions.raw`."""
+        data, errors = await async_request(path="/version", params={}, options=self.options, defaults=())
         if errors:
             raise CustomError(errors[0]["message"])
-        return VersionsResponse(**data)
+        return data
@@ -0,0 +1,232 @@
+"""
+Local stand-in for the XIVAPI v2 API, for tests and benchmarks that must not depend on the live service.
+
+    with FakeXIVAPI(sheets={ "Item": 10_000 }, latency=0.005, row_size=1024).serve() as server:
+        rows = list(XIVAPI().sheets().iter_rows("Item"))
+
+Sheets are synthetic (rows `0..n-1` whose fields are a `Name` plus `row_size` bytes of padding), and specific responses can be
+replaced by recorded ones.
+"""
+import bisect
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from . import utils
+
+# Sheets served when none are given, with their number of rows
+DEFAULT_SHEETS = { "Achievement": 250, "Action": 250, "Companion": 250, "Item": 250, "Mount": 250 }
+
+# Size of the synthetic asset bodies, in bytes
+DEFAULT_ASSET_SIZE = 256 * 1024
+
+class FakeHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and bodies are written separately, which Nagle's algorithm would delay by tens of milliseconds
+    disable_nagle_algorithm = True
+    server: "FakeXIVAPI"
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak_in_flight = max(server.peak_in_flight, server.in_flight)
+        try:
+            self.respond()
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    def respond(self) -> None:
+        url = urlparse(self.path)
+        query = { k: v[0] for k, v in parse_qs(url.query).items() }
+        path = url.path.removeprefix("/api")
+        server = self.server
+        if server.record_requests:
+            server.requests.append((url.path, query, dict(self.headers)))
+        if server.latency:
+            time.sleep(server.latency)
+        if server.delays:
+            time.sleep(server.delays.pop(0))
+        if server.failures:
+            status, headers = server.failures.pop(0)
+            return self.send(status, json.dumps({ "code": status, "message": "Unavailable" }).encode(), "application/json", headers)
+
+        recorded = server.recordings.get(f"{path}?{url.query}" if url.query else path) or server.recordings.get(path)
+        if recorded is not None:
+            status, content_type, body = recorded
+            return self.send(status, body, content_type)
+
+        parts = path.lstrip("/").split("/")
+        if parts[0] == "version":
+            return self.send_json({ "versions": [{ "names": names } for names in server.versions] })
+        if parts[0] == "sheet" and len(parts) == 1:
+            return self.send_json({ "sheets": [{ "name": name } for name in server.sheets] })
+        if parts[0] == "sheet" and parts[1] not in server.sheets:
+            return self.send_json({ "code": 404, "message": f"Unknown sheet {parts[1]}" }, 404)
+        if parts[0] == "sheet" and len(parts) == 3:
+            fields = server.fields(int(parts[2]), query.get("fields"), query.get("language"), parts[1], query.get("version"))
+            if fields is None:
+                return self.send_json({ "code": 404, "message": f"Unknown row {parts[2]}" }, 404)
+            return self.send_json({ "schema": "test", "row_id": int(parts[2]), "fields": fields })
+        if parts[0] == "sheet" and len(parts) == 2:
+            version = query.get("version")
+            existing = server.row_ids(parts[1], version)
+            if "rows" in query:
+                present = existing if isinstance(existing, range) else set(existing)
+                ids: Sequence[int] = [int(i) for i in query["rows"].split(",") if int(i) in present]
+            else:
+                start = bisect.bisect_left(existing, int(query.get("after", -1)) + 1)
+                ids = existing[start:start + int(query.get("limit", 100))]
+            rows = [
+                { "row_id": i, "fields": server.fields(i, query.get("fields"), query.get("language"), parts[1], version) }
+                for i in ids
+            ]
+            return self.send_json({ "schema": "test", "rows": rows })
+        if parts[0] == "search":
+            # 100 results per sheet, in descending score order; the cursor is the offset of the next page
+            sheets = query.get("sheets", "Item").split(",")
+            offset = int(query.get("cursor", 0))
+            limit = int(query.get("limit", 20))
+            results = [
+                { "score": 1 - i / 100, "sheet": sheet, "row_id": i, "fields": { "Name": f"{sheet} {i}" } }
+                for i in range(100) for sheet in sheets
+            ][offset:offset + limit]
+            more = offset + limit < 100 * len(sheets)
+            return self.send_json({ "schema": "test", "results": results, "next": str(offset + limit) if more else None })
+        if parts[0] == "asset":
+            # Content only depends on the asset, so every version serves the same ETag
+            body = b"\x89PNG" + "/".join(parts[1:]).encode() + query.get("path", "").encode() + b"\x00" * server.asset_size
+            etag = f'"{hashlib.sha256(body).hexdigest()}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            return self.send(200, body, "image/png", { "ETag": etag })
+        self.send_json({ "code": 404, "message": "Not found" }, 404)
+
+    def send_json(self, data: Any, status: int = 200) -> None:
+        self.send(status, json.dumps(data).encode(), "application/json")
+
+    def send(self, status: int, body: bytes, content_type: str, headers: Optional[Mapping[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class FakeXIVAPI(ThreadingHTTPServer):
+    """
+    Threaded HTTP server answering `/version`, `/sheet`, `/search` and `/asset` requests like the XIVAPI v2 API.
+
+    Every response waits `latency` seconds, and the most requests handled at once is kept in `peak_in_flight`; `delays` (seconds) and `failures` (`(status, headers)` pairs) are consumed by the next
+    requests, to simulate slow or failing calls. Requests received are kept in `requests` as `(path, query, headers)`, unless
+    `record_requests` is false. `recordings` maps request paths (with or without their query string) to the
+    `(status, content_type, body)` to answer them with instead of synthetic data.
+
+    Sheets are identical in every version, unless `patches` maps a version name to the rows that differ in it: sheet names to row
+    IDs to their fields, or to `None` for rows removed from that version. Row IDs past the end of a sheet are added to it.
+    """
+    daemon_threads = True
+
+    def __init__(self, sheets: Optional[Mapping[str, int]] = None, latency: float = 0.0, row_size: int = 0, asset_size: int = DEFAULT_ASSET_SIZE, recordings: Optional[Mapping[str, Tuple[int, str, bytes]]] = None, record_requests: bool = True, port: int = 0) -> None:
+        super().__init__(("127.0.0.1", port), FakeHandler)
+        self.sheets = dict(sheets if sheets is not None else DEFAULT_SHEETS)
+        self.latency = latency
+        self.row_size = row_size
+        self.asset_size = asset_size
+        self.recordings = dict(recordings or {})
+        self.record_requests = record_requests
+        self.requests: List[Tuple[str, Dict[str, str], Dict[str, str]]] = []
+        self.failures: List[Tuple[int, Dict[str, str]]] = []
+        self.delays: List[float] = []
+        self.versions = [["7.0", "latest"], ["6.5"]]
+        self.patches: Dict[str, Dict[str, Dict[int, Optional[Dict[str, Any]]]]] = {}
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def endpoint(self) -> str:
+        """Base URL of the fake API, in place of `https://v2.xivapi.com/api/`."""
+        return f"http://127.0.0.1:{self.server_port}/api/"
+
+    def patch(self, sheet: Optional[str], version: Optional[str]) -> Dict[int, Optional[Dict[str, Any]]]:
+        """Rows of `sheet` that differ in `version` (`latest` when omitted) from the synthetic ones."""
+        version = version or "latest"
+        names = next((names for names in self.versions if version in names), [version])
+        return self.patches.get(names[0], {}).get(sheet, {}) if sheet is not None else {}
+
+    def row_ids(self, sheet: str, version: Optional[str] = None) -> Sequence[int]:
+        """Sorted IDs of the rows `sheet` has in `version`."""
+        patch = self.patch(sheet, version)
+        if not patch:
+            return range(self.sheets[sheet])
+        ids = set(range(self.sheets[sheet])) | { row_id for row_id, fields in patch.items() if fields is not None }
+        return sorted(ids - { row_id for row_id, fields in patch.items() if fields is None })
+
+    def fields(self, row_id: int, selected: Optional[str] = None, language: Optional[str] = None, sheet: Optional[str] = None, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Fields of a row, limited to the top-level fields of the `selected` field paths when given. Names are suffixed with the
+        `language` they are read in, unless it is English. Rows of `sheet` patched in `version` are replaced, or `None` if removed.
+        """
+        patch = self.patch(sheet, version)
+        fields: Optional[Dict[str, Any]]
+        if row_id in patch:
+            fields = patch[row_id]
+            if fields is None:
+                return None
+        else:
+            fields = { "Name": f"Row {row_id}" if language in (None, "en") else f"Row {row_id} ({language})" }
+            if self.row_size:
+                fields["Description"] = "x" * self.row_size
+        if selected:
+            names = { path.split(".")[0].removesuffix("[]").split("@")[0] for path in selected.split(",") }
+            fields = { name: value for name, value in fields.items() if name in names }
+        return fields
+
+    def handle_error(self, request: Any, client_address: Any) -> None:
+        # Clients abandoning slow requests (deadlines, hedging) are expected
+        pass
+
+    def start(self) -> "FakeXIVAPI":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread = None
+        self.server_close()
+
+    @contextmanager
+    def serve(self) -> Iterator["FakeXIVAPI"]:
+        """Run the server, sending every client's requests to it instead of the real API until the block exits."""
+        previous = utils.endpoint
+        self.start()
+        utils.endpoint = self.endpoint
+        try:
+            yield self
+        finally:
+            utils.endpoint = previous
+            self.stop()
+
+    def __enter__(self) -> "FakeXIVAPI":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
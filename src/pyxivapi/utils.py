@@ -1,60 +1,536 @@
-import requests
-from urllib.parse import urlencode, urljoin
-from typing import Any, Dict, Optional, Tuple
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from urllib.parse import urlencode, urljoin, urlsplit
+from types import UnionType
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, Tuple, Type, TypeVar, Union, get_args, get_origin
+from pydantic import BaseModel
+from .errors import CustomError as CustomError, DeadlineExceeded, CircuitOpenError
+from .lib.session import DEFAULT_CHUNK_SIZE, default_session, default_async_session
+from .lib.cache import CachedResponse, MemoryCache, COALESCED, HIT
+from .lib.events import Event, next_id, route
+from .lib.resilience import expiry, remaining
 
 # The endpoint to use, kept at the top for quick changing (if needed)
 endpoint = "https://v2.xivapi.com/api/"
 
-class CustomError(Exception):
-    def __init__(self, message: str, name: Optional[str] = None):
-        super().__init__(message)
-        self.name = name or "XIVAPIError"
-        self.message = message
-        
-def request(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Optional[list[Any]]]:
-    url = urljoin(endpoint, path.lstrip("/"))
-    params = params or {}
-    options = options or {}
-    
+# JSON decoder for response bodies, using the fastest library installed
+loads: Callable[[bytes], Any]
+try:
+    import orjson
+    loads = orjson.loads
+except ImportError:
+    try:
+        import msgspec
+        loads = msgspec.json.decode
+    except ImportError:
+        loads = json.loads
+
+M = TypeVar("M", bound=BaseModel)
+
+# What `decode` returns: the response model, or the decoded dict itself with the `raw` decode mode
+Decoded = Union[M, Dict[str, Any]]
+
+# Lines printed for each kind of event when the client is `verbose`
+_VERBOSE = {
+    "request": "[XIVAPI] Requesting {url}",
+    "response": "[XIVAPI] Response {status} for {url}",
+    "retry": "[XIVAPI] Retrying {url} (attempt {attempt}) in {delay:.2f}s",
+    "cache_hit": "[XIVAPI] Serving {url} from the {cache} cache",
+    "coalesced": "[XIVAPI] Waiting for an identical request for {url}",
+    "error": "[XIVAPI] Request for {url} failed: {reason}",
+}
+
+def emit(options: Mapping[str, Any], kind: str, path: Optional[str] = None, **fields: Any) -> None:
+    """
+    Report an event to the client's `hooks` (and print it when the client is `verbose`). The endpoint and sheet are derived from
+    `path`, or the path of the `url` field; nothing is built when there is no one to report to.
+    """
+    hooks = options.get("hooks")
+    verbose = options.get("verbose")
+    if hooks is None and not verbose:
+        return
+    if verbose and kind in _VERBOSE and "url" in fields:
+        print(_VERBOSE[kind].format(reason=repr(fields["error"]) if fields.get("error") else fields.get("status"), **fields))
+    if hooks is None:
+        return
+    if path is None and fields.get("url") is not None:
+        path = urlsplit(fields["url"]).path
+        base = urlsplit(endpoint).path.rstrip("/")
+        if path.startswith(base):
+            path = path[len(base):]
+    if path is not None:
+        fields["endpoint"], fields["sheet"] = route(path)
+    hooks.emit(Event(kind, time=time.time(), **fields))
+
+def normalize(params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version")) -> Dict[str, Any]:
+    """Normalise request `params` in place, flattening list values and injecting the client defaults."""
+    params = params if params is not None else {}
+    options = options if options is not None else {}
+
     # Moves the verbose, if provided, to the options dict
     if not options.get("verbose") and "verbose" in params:
         options["verbose"] = bool(params["verbose"])
         params.pop("verbose", None)
-        
+
     # Flattens the dict params
     flattened = { "query": " ", "fields": ",", "transient": "," }
     for key, sep in flattened.items():
         if key in params and isinstance(params[key], list):
             params[key] = sep.join(str(x) for x in params[key])
-        
-    # Inject language/version defaults
-    if "language" not in params and options.get("language"):
-        params["language"] = options["language"]
-    if "version" not in params and options.get("version"):
-        params["version"] = options["version"]
-        
+
+    # Inject language/version defaults (only those the endpoint accepts)
+    for key in defaults:
+        if key not in params and options.get(key):
+            params[key] = options[key]
+    return params
+
+def url_for(path: str, params: Optional[Dict[str, Any]] = None) -> str:
+    """Build the full request URL for `path` and already normalised `params`."""
+    url = urljoin(endpoint, path.lstrip("/"))
     if params:
         url = f"{url}?{urlencode(params)}"
-    
-    if options.get("verbose"):
-        print(f"[XIVAPI] Requesting {url} with params: {params}")
-    
-    response = requests.get(url)
-    
-    if options.get("verbose"):
-        print(f"[XIVAPI] Response {response.status_code} for {url} with params: {params}")    
-    
-    if response.ok:
-        content_type = response.headers.get("content-type", "")
+    return url
+
+def parse(status_code: int, headers: Mapping[str, str], content: bytes) -> Tuple[Dict[str, Any], Optional[list[Any]]]:
+    """Turn a raw response into the `(data, errors)` pair returned by `request`."""
+    if status_code < 400:
+        content_type = headers.get("content-type", "")
         if "application/json" in content_type:
-            return response.json(), None
+            return loads(content), None
         else:
             # Binary data (icons, textures, etc.)
-            return { "data": response.content }, None
-    
+            return { "data": content }, None
+
     try:
-        error_json = response.json()
+        error_json = loads(content)
     except Exception:
-        error_json = { "message": "Unknown error", "code": response.status_code }
-        
-    return {}, [error_json]
\ No newline at end of file
+        error_json = { "message": "Unknown error", "code": status_code }
+
+    return {}, [error_json]
+
+@lru_cache(maxsize=None)
+def _nested(model: Type[BaseModel]) -> Dict[str, Tuple[bool, Type[BaseModel]]]:
+    """Fields of `model` holding other models (or lists of them), along with whether they are lists."""
+    nested: Dict[str, Tuple[bool, Type[BaseModel]]] = {}
+    for name, field in model.model_fields.items():
+        # Optional fields are unwrapped to the model (or list of models) they hold
+        annotation = field.annotation
+        candidates = get_args(annotation) if get_origin(annotation) in (Union, UnionType) else (annotation,)
+        for candidate in candidates:
+            inner = get_args(candidate)
+            if get_origin(candidate) in (list, List) and inner and isinstance(inner[0], type) and issubclass(inner[0], BaseModel):
+                nested[name] = (True, inner[0])
+            elif isinstance(candidate, type) and issubclass(candidate, BaseModel):
+                nested[name] = (False, candidate)
+    return nested
+
+class LazyList(List[Any]):
+    """
+    List of models kept as decoded JSON until read: each item is validated into `model` the first time it is accessed.
+    Serialising the owning model before reading its items dumps the unread items as their raw dicts.
+    """
+    def __init__(self, model: Type[BaseModel], items: List[Any]) -> None:
+        super().__init__(items)
+        self.model = model
+
+    def _validated(self, index: int) -> Any:
+        item = super().__getitem__(index)
+        if isinstance(item, dict):
+            item = self.model.model_validate(item)
+            super().__setitem__(index, item)
+        return item
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._validated(i) for i in range(*index.indices(len(self)))]
+        return self._validated(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self._validated(index)
+
+    def __reversed__(self) -> Iterator[Any]:
+        for index in reversed(range(len(self))):
+            yield self._validated(index)
+
+    def __eq__(self, other: object) -> bool:
+        return list(self) == other
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+def construct(model: Type[M], data: Dict[str, Any]) -> M:
+    """
+    Build `model` from decoded data without validating it up front. Lists of nested models (e.g. `rows`, `results`) are
+    validated item by item on first access, so large pages cost nothing for the rows that are never read.
+    """
+    values = dict(data)
+    for name, (many, inner) in _nested(model).items():
+        value = values.get(name)
+        if value is None:
+            continue
+        values[name] = LazyList(inner, value) if many else inner.model_validate(value)
+    return model.model_construct(**values)
+
+def decode(model: Type[M], data: Dict[str, Any], options: Optional[Mapping[str, Any]] = None) -> Decoded[M]:
+    """
+    Turn decoded response data into a response model, according to the client's `decode` option:
+    fully `validated` models (the default), `lazy` models whose rows are validated on first access, or the `raw` dicts themselves.
+    """
+    options = options or {}
+    mode = options.get("decode", "validated")
+    if mode == "raw":
+        return data
+    started = time.perf_counter()
+    value = construct(model, data) if mode == "lazy" else model(**data)
+    emit(options, "validate", model=model.__name__, validation_time=time.perf_counter() - started)
+    return value
+
+def as_model(model: Type[M], value: M | Dict[str, Any]) -> M:
+    """Model view of a value returned by `decode`, for helpers that need models even when the client decodes to `raw` dicts."""
+    return construct(model, value) if isinstance(value, dict) else value
+
+def _on_retry(options: Mapping[str, Any], url: Optional[str], id: int) -> Optional[Callable[[int, Optional[int], float], None]]:
+    if url is None or (options.get("hooks") is None and not options.get("verbose")):
+        return None
+    return lambda attempt, status, wait: emit(options, "retry", id=id, url=url, attempt=attempt, status=status, delay=wait)
+
+def scheduled(options: Mapping[str, Any], session: Any, call: Callable[[], Any], discard: Optional[Callable[[Any], Any]] = None, expires: Optional[float] = None, url: Optional[str] = None, id: int = 0) -> Any:
+    """Send a request through the client's scheduler (if any), which rate limits and retries it, reporting retries of `url`."""
+    scheduler = options.get("scheduler")
+    if scheduler is None:
+        return call()
+    return scheduler.send(call, session.transient_errors, discard, expires, _on_retry(options, url, id))
+
+async def async_scheduled(options: Mapping[str, Any], session: Any, call: Callable[[], Awaitable[Any]], discard: Optional[Callable[[Any], Awaitable[Any]]] = None, expires: Optional[float] = None, url: Optional[str] = None, id: int = 0) -> Any:
+    """Asynchronous counterpart of `scheduled`."""
+    scheduler = options.get("scheduler")
+    if scheduler is None:
+        return await call()
+    return await scheduler.async_send(call, session.transient_errors, discard, expires, _on_retry(options, url, id))
+
+def _admit(options: Mapping[str, Any]) -> Any:
+    """The client's circuit breaker, after checking that it lets requests through."""
+    breaker = options.get("circuit_breaker")
+    if breaker is not None and not breaker.allow():
+        raise CircuitOpenError("The XIVAPI circuit breaker is open, failing fast while the API is unhealthy")
+    return breaker
+
+def _responded(options: Mapping[str, Any], id: int, url: str, status: int, latency: float, size: Optional[int] = None) -> None:
+    emit(options, "response", id=id, url=url, status=status, latency=latency, bytes=size)
+    if status >= 400:
+        emit(options, "error", id=id, url=url, status=status)
+
+def _failed(options: Mapping[str, Any], breaker: Any, expires: Optional[float], id: int, url: str, started: float, e: Exception) -> Exception:
+    """Record a request that failed with `e` against the circuit breaker, returning the error to raise (timeouts past the deadline become `DeadlineExceeded`)."""
+    if breaker is not None:
+        breaker.failure()
+    error: Exception = e
+    if expires is not None and not isinstance(e, DeadlineExceeded) and (isinstance(e, TimeoutError) or (remaining(expires) or 0) <= 0):
+        error = DeadlineExceeded(f"Deadline exceeded requesting {url}")
+    emit(options, "error", id=id, url=url, error=error, latency=time.monotonic() - started)
+    return error
+
+def _bounded(session: Any, expires: Optional[float], url: str) -> Optional[Tuple[float, float]]:
+    """Session timeouts shortened to the time left before the deadline (`None` without one), raising once it has passed."""
+    left = remaining(expires)
+    if left is None:
+        return None
+    if left <= 0:
+        raise DeadlineExceeded(f"Deadline exceeded before requesting {url}")
+    return min(session.timeout[0], left), min(session.timeout[1], left)
+
+def _chunks(chunks: Iterator[bytes], expires: Optional[float], url: str) -> Iterator[bytes]:
+    """Chunks of a streamed body, raising `DeadlineExceeded` once the deadline passes while they are read."""
+    for chunk in chunks:
+        left = remaining(expires)
+        if left is not None and left <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded reading {url}")
+        yield chunk
+
+async def _async_chunks(chunks: AsyncIterator[bytes], expires: Optional[float], url: str) -> AsyncIterator[bytes]:
+    """Asynchronous counterpart of `_chunks`."""
+    async for chunk in chunks:
+        left = remaining(expires)
+        if left is not None and left <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded reading {url}")
+        yield chunk
+
+def send(url: str, options: Dict[str, Any]) -> CachedResponse:
+    """
+    Send a `GET` request for `url` through the client's session, bypassing any cache.
+    The request is bounded by the current deadline, and hedged and guarded by the client's circuit breaker when configured.
+    """
+    session = options.get("session") or default_session()
+    if session.closed:
+        raise CustomError("Cannot send a request through a closed session")
+    expires = expiry(options)
+    breaker = _admit(options)
+
+    def attempt() -> Any:
+        timeout = _bounded(session, expires, url)
+        return session.get(url) if timeout is None else session.get(url, timeout=timeout)
+
+    id = next_id()
+    emit(options, "request", id=id, url=url)
+    hedge = options.get("hedge")
+
+    def call() -> Any:
+        return scheduled(options, session, attempt, expires=expires, url=url, id=id)
+    started = time.monotonic()
+    try:
+        response = hedge.send(call) if hedge is not None else call()
+    except Exception as e:
+        error = _failed(options, breaker, expires, id, url, started, e)
+        if error is not e:
+            raise error from e
+        raise
+    if breaker is not None:
+        breaker.record(response.status_code)
+
+    _responded(options, id, url, response.status_code, time.monotonic() - started, len(response.content))
+    return response.status_code, response.headers, response.content
+
+async def async_send(url: str, options: Dict[str, Any]) -> CachedResponse:
+    """Asynchronous counterpart of `send`, sent through the client's `AsyncSession`."""
+    session = options.get("session") or default_async_session()
+    if session.closed:
+        raise CustomError("Cannot send a request through a closed session")
+    expires = expiry(options)
+    breaker = _admit(options)
+
+    async def attempt() -> Any:
+        left = remaining(expires)
+        if left is None:
+            return await session.get(url)
+        if left <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before requesting {url}")
+        return await asyncio.wait_for(session.get(url), left)
+
+    id = next_id()
+    emit(options, "request", id=id, url=url)
+    hedge = options.get("hedge")
+
+    async def call() -> Any:
+        return await async_scheduled(options, session, attempt, expires=expires, url=url, id=id)
+    started = time.monotonic()
+    try:
+        response = await (hedge.async_send(call) if hedge is not None else call())
+    except Exception as e:
+        error = _failed(options, breaker, expires, id, url, started, e)
+        if error is not e:
+            raise error from e
+        raise
+    if breaker is not None:
+        breaker.record(response.status_code)
+
+    _responded(options, id, url, response.status_code, time.monotonic() - started, len(response.content))
+    return response.status_code, response.headers, response.content
+
+def fetch(path: str, params: Dict[str, Any], url: str, options: Dict[str, Any]) -> CachedResponse:
+    """Fetch the raw response for a request, going through the persistent cache (if any) before the session."""
+    cache = options.get("cache")
+    if cache is None or not cache.accepts(path):
+        return send(url, options)
+
+    # Game versions are resolved first, so "latest" is keyed on the version it currently points at
+    versions = cache.versions()
+    if versions is None:
+        response = send(url_for("/version"), options)
+        if response[0] != 200:
+            return send(url, options)
+        versions = loads(response[2])
+        cache.update_versions(versions)
+    if path == "/version":
+        return 200, { "content-type": "application/json" }, json.dumps(versions).encode()
+
+    key, pinned = cache.key(path, params, versions)
+    response = cache.get(key)
+    if response is not None:
+        emit(options, "cache_hit", url=url, cache="disk")
+    else:
+        response = send(url, options)
+        if response[0] == 200:
+            cache.set(key, pinned, response)
+    return response
+
+async def async_fetch(path: str, params: Dict[str, Any], url: str, options: Dict[str, Any]) -> CachedResponse:
+    """Asynchronous counterpart of `fetch`."""
+    cache = options.get("cache")
+    if cache is None or not cache.accepts(path):
+        return await async_send(url, options)
+
+    versions = cache.versions()
+    if versions is None:
+        response = await async_send(url_for("/version"), options)
+        if response[0] != 200:
+            return await async_send(url, options)
+        versions = loads(response[2])
+        cache.update_versions(versions)
+    if path == "/version":
+        return 200, { "content-type": "application/json" }, json.dumps(versions).encode()
+
+    key, pinned = cache.key(path, params, versions)
+    response = cache.get(key)
+    if response is not None:
+        emit(options, "cache_hit", url=url, cache="disk")
+    else:
+        response = await async_send(url, options)
+        if response[0] == 200:
+            cache.set(key, pinned, response)
+    return response
+
+def raw_request(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version")) -> CachedResponse:
+    """Send a request through the caches and the session like `request`, returning the raw `(status, headers, body)` response."""
+    options = options if options is not None else {}
+    params = normalize(params, options, defaults)
+    return dispatch(path, params, url_for(path, params), options)
+
+def _served(options: Mapping[str, Any], url: str, outcome: str) -> None:
+    """Report a response the memory cache served without a request of its own: a hit, or one coalesced onto an identical request."""
+    if outcome == HIT:
+        emit(options, "cache_hit", url=url, cache="memory")
+    elif outcome == COALESCED:
+        emit(options, "coalesced", url=url, cache="memory")
+
+def dispatch(path: str, params: Dict[str, Any], url: str, options: Dict[str, Any], key: Optional[str] = None) -> CachedResponse:
+    """
+    Send a request whose `params` are already normalised and `url` already built, through the caches and the session.
+    `key` is its in-memory cache key: the URL with its parameters sorted, computed from `params` when not given.
+    """
+    # Identical concurrent requests share one in-memory cache entry, keyed on the normalised URL
+    memory: Optional[MemoryCache] = options.get("memory_cache")
+    if memory is None:
+        return fetch(path, params, url, options)
+    if key is None:
+        key = url_for(path, dict(sorted(params.items())))
+    response, outcome = memory.fetch_outcome(key, lambda: fetch(path, params, url, options))
+    _served(options, url, outcome)
+    return response
+
+def read(path: str, response: CachedResponse, options: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[list[Any]]]:
+    """`parse` a raw response to a request for `path`, reporting the time spent as a `decode` event."""
+    started = time.perf_counter()
+    result = parse(*response)
+    emit(options or {}, "decode", path=path, decode_time=time.perf_counter() - started, bytes=len(response[2]))
+    return result
+
+def request(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version")) -> Tuple[Dict[str, Any], Optional[list[Any]]]:
+    return read(path, raw_request(path=path, params=params, options=options, defaults=defaults), options)
+
+async def async_raw_request(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version")) -> CachedResponse:
+    """Asynchronous counterpart of `raw_request`."""
+    options = options if options is not None else {}
+    params = normalize(params, options, defaults)
+    return await async_dispatch(path, params, url_for(path, params), options)
+
+async def async_dispatch(path: str, params: Dict[str, Any], url: str, options: Dict[str, Any], key: Optional[str] = None) -> CachedResponse:
+    """Asynchronous counterpart of `dispatch`."""
+    memory: Optional[MemoryCache] = options.get("memory_cache")
+    if memory is None:
+        return await async_fetch(path, params, url, options)
+    if key is None:
+        key = url_for(path, dict(sorted(params.items())))
+    response, outcome = await memory.async_fetch_outcome(key, lambda: async_fetch(path, params, url, options))
+    _served(options, url, outcome)
+    return response
+
+async def async_request(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version")) -> Tuple[Dict[str, Any], Optional[list[Any]]]:
+    """Asynchronous counterpart of `request`."""
+    return read(path, await async_raw_request(path=path, params=params, options=options, defaults=defaults), options)
+
+@contextmanager
+def stream(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version"), headers: Optional[Dict[str, str]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, Mapping[str, str], Iterator[bytes]]]:
+    """
+    Send a `GET` request whose body is read in chunks of `chunk_size` bytes rather than buffered, bypassing every cache.
+    Yields the status code, headers and chunk iterator; error responses are raised as a `CustomError`.
+    """
+    options = options if options is not None else {}
+    params = normalize(params, options, defaults)
+    url = url_for(path, params)
+    session = options.get("session") or default_session()
+    if session.closed:
+        raise CustomError("Cannot send a request through a closed session")
+    expires = expiry(options)
+    breaker = _admit(options)
+
+    def attempt() -> Any:
+        timeout = _bounded(session, expires, url)
+        if timeout is None:
+            return session.get(url, stream=True, headers=headers)
+        return session.get(url, stream=True, headers=headers, timeout=timeout)
+
+    def discard(response: Any) -> None:
+        response.close()
+
+    id = next_id()
+    emit(options, "request", id=id, url=url)
+    started = time.monotonic()
+    try:
+        response = scheduled(options, session, attempt, discard, expires=expires, url=url, id=id)
+    except Exception as e:
+        error = _failed(options, breaker, expires, id, url, started, e)
+        if error is not e:
+            raise error from e
+        raise
+    try:
+        if breaker is not None:
+            breaker.record(response.status_code)
+        _responded(options, id, url, response.status_code, time.monotonic() - started)
+        if response.status_code >= 400:
+            _, errors = parse(response.status_code, response.headers, response.content)
+            assert errors is not None
+            raise CustomError(errors[0]["message"])
+        chunks = response.iter_content(chunk_size)
+        yield response.status_code, response.headers, chunks if expires is None else _chunks(chunks, expires, url)
+    finally:
+        response.close()
+
+@asynccontextmanager
+async def async_stream(*, path: str, params: Optional[Dict[str, Any]] = None, options: Optional[Dict[str, Any]] = None, defaults: Tuple[str, ...] = ("language", "version"), headers: Optional[Dict[str, str]] = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> AsyncIterator[Tuple[int, Mapping[str, str], AsyncIterator[bytes]]]:
+    """Asynchronous counterpart of `stream`."""
+    options = options if options is not None else {}
+    params = normalize(params, options, defaults)
+    url = url_for(path, params)
+    session = options.get("session") or default_async_session()
+    if session.closed:
+        raise CustomError("Cannot send a request through a closed session")
+    expires = expiry(options)
+    breaker = _admit(options)
+
+    async def attempt() -> Any:
+        left = remaining(expires)
+        if left is None:
+            return await session.stream(url, headers=headers)
+        if left <= 0:
+            raise DeadlineExceeded(f"Deadline exceeded before requesting {url}")
+        return await asyncio.wait_for(session.stream(url, headers=headers), left)
+
+    async def discard(response: Any) -> None:
+        await response.aclose()
+
+    id = next_id()
+    emit(options, "request", id=id, url=url)
+    started = time.monotonic()
+    try:
+        response = await async_scheduled(options, session, attempt, discard, expires=expires, url=url, id=id)
+    except Exception as e:
+        error = _failed(options, breaker, expires, id, url, started, e)
+        if error is not e:
+            raise error from e
+        raise
+    try:
+        if breaker is not None:
+            breaker.record(response.status_code)
+        _responded(options, id, url, response.status_code, time.monotonic() - started)
+        if response.status_code >= 400:
+            _, errors = parse(response.status_code, response.headers, await response.aread())
+            assert errors is not None
+            raise CustomError(errors[0]["message"])
+        chunks = response.aiter_bytes(chunk_size)
+        yield response.status_code, response.headers, chunks if expires is None else _async_chunks(chunks, expires, url)
+    finally:
+        await response.aclose()
@@ -0,0 +1,12 @@
+import pytest
+
+import pyxivapi.utils
+from pyxivapi.testing import FakeXIVAPI
+
+@pytest.fixture
+def fake_server(monkeypatch):
+    """Local stand-in for the XIVAPI v2 API, recording every request it receives."""
+    server = FakeXIVAPI().start()
+    monkeypatch.setattr(pyxivapi.utils, "endpoint", server.endpoint)
+    yield server
+    server.stop()
@@ -0,0 +1,124 @@
+import asyncio
+import io
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError, DeadlineExceeded, CircuitOpenError
+from pyxivapi.lib.cache import AssetStore
+from pyxivapi.lib.resilience import CircuitBreaker, deadline
+from pyxivapi.lib.transports import MockSession
+
+ICON = { "path": "ui/icon/000000/000001.tex", "format": "png" }
+
+def asset_requests(server):
+    return [(path, query, headers) for path, query, headers in server.requests if path.startswith("/api/asset")]
+
+def test_download_targets(fake_server, tmp_path):
+    with XIVAPI() as client:
+        assets = client.assets()
+        expected = assets.get(ICON)
+
+        size = assets.download(ICON, tmp_path / "icon.png", chunk_size=4096)
+        assert size == len(expected) and (tmp_path / "icon.png").read_bytes() == expected
+        assert not (tmp_path / "icon.png.part").exists()
+
+        handle = io.BytesIO()
+        assets.download(ICON, handle)
+        assert handle.getvalue() == expected
+
+        buffer = bytearray()
+        assets.download(ICON, buffer)
+        assert buffer == expected
+
+        view = memoryview(bytearray(len(expected) + 10))
+        assert assets.download(ICON, view) == len(expected)
+        assert view[:len(expected)] == expected
+        with pytest.raises(CustomError):
+            assets.download(ICON, memoryview(bytearray(16)))
+
+def test_download_map(fake_server, tmp_path):
+    with XIVAPI() as client:
+        client.assets().download_map({ "territory": "s1d1", "index": "00", "format": "jpg" }, tmp_path / "map.jpg")
+    assert asset_requests(fake_server)[-1][0] == "/api/asset/map/s1d1/00"
+    assert (tmp_path / "map.jpg").read_bytes().startswith(b"\x89PNGmap/s1d1/00")
+
+def test_download_error(fake_server, tmp_path):
+    with XIVAPI() as client:
+        with pytest.raises(CustomError):
+            client.assets().download_map({ "territory": "s1d1" }, tmp_path / "map.jpg")
+    assert not (tmp_path / "map.jpg").exists()
+
+def test_asset_json_response():
+    with XIVAPI(session=MockSession({ "/api/asset": { "unexpected": True } })) as client:
+        with pytest.raises(CustomError, match="binary"):
+            client.assets().get(ICON)
+
+def test_asset_store_dedupes_versions(fake_server, tmp_path):
+    store = AssetStore(str(tmp_path / "assets"))
+    with XIVAPI(asset_store=store) as client:
+        latest = client.assets().get(ICON)
+        assert client.assets().get(ICON) == latest
+
+    # Another version revalidates the stored copy instead of downloading it again
+    with XIVAPI(asset_store=store, version="6.5") as client:
+        assert client.assets().get(ICON) == latest
+
+    sent = asset_requests(fake_server)
+    assert [query["version"] for _, query, _ in sent] == ["7.0", "6.5"]
+    assert "If-None-Match" in sent[1][2]
+    assert store.stats() == { "assets": 2, "objects": 1, "bytes": len(latest) }
+
+def test_async_download(fake_server, tmp_path):
+    store = AssetStore(str(tmp_path / "assets"))
+
+    async def main():
+        async with AsyncXIVAPI(asset_store=store) as client:
+            buffer = bytearray()
+            await client.assets().download(ICON, buffer)
+            stored = await client.assets().get(ICON)
+        async with AsyncXIVAPI() as client:
+            streamed = bytearray()
+            await client.assets().download(ICON, streamed, chunk_size=1024)
+        return buffer, stored, streamed
+
+    buffer, stored, streamed = asyncio.run(main())
+    assert buffer == stored == streamed and stored.startswith(b"\x89PNG")
+    assert len(asset_requests(fake_server)) == 2
+
+def test_download_deadline_and_breaker(fake_server, tmp_path):
+    fake_server.delays = [1.0]
+    with XIVAPI(retries=0) as client:
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0.2):
+                client.assets().download(ICON, bytearray())
+
+    breaker = CircuitBreaker(failures=1, reset_timeout=30)
+    fake_server.failures = [(500, {})]
+    with XIVAPI(circuit_breaker=breaker, retries=0) as client:
+        with pytest.raises(CustomError):
+            client.assets().download(ICON, bytearray())
+        assert breaker.state == "open"
+        fake_server.requests.clear()
+        with pytest.raises(CircuitOpenError):
+            client.assets().download(ICON, bytearray())
+        with pytest.raises(CircuitOpenError):
+            XIVAPI(circuit_breaker=breaker, asset_store=AssetStore(str(tmp_path / "assets"))).assets().get(ICON)
+    assert asset_requests(fake_server) == []
+
+def test_async_download_deadline_and_breaker(fake_server):
+    pytest.importorskip("httpx")
+    breaker = CircuitBreaker(failures=1, reset_timeout=30)
+
+    async def main():
+        async with AsyncXIVAPI(retries=0) as client:
+            fake_server.delays = [1.0]
+            with pytest.raises(DeadlineExceeded):
+                with deadline(0.2):
+                    await client.assets().download(ICON, bytearray())
+        async with AsyncXIVAPI(circuit_breaker=breaker, retries=0) as client:
+            fake_server.failures = [(500, {})]
+            with pytest.raises(CustomError):
+                await client.assets().download(ICON, bytearray())
+            with pytest.raises(CircuitOpenError):
+                await client.assets().download(ICON, bytearray())
+
+    asyncio.run(main())
+    assert breaker.state == "open"
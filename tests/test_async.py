@@ -0,0 +1,50 @@
+import asyncio
+import pytest
+from pyxivapi import AsyncXIVAPI, CustomError
+from pyxivapi.lib.models import RowResponse, SheetResponse
+from pyxivapi.lib.sheets import AsyncSheets
+
+pytest.importorskip("httpx")
+
+def test_async_endpoints(fake_server):
+    async def main():
+        async with AsyncXIVAPI(language="en") as client:
+            row = await client.items.get(1, { "fields": "Name" })
+            rows = await client.sheets().list("Item", { "limit": 5 })
+            versions = await client.versions()
+            asset = await client.assets().get({ "path": "ui/icon/000000/000001.tex", "format": "png" })
+            return row, rows, versions, asset
+
+    row, rows, versions, asset = asyncio.run(main())
+    assert isinstance(row, RowResponse) and row.row_id == 1
+    assert isinstance(rows, SheetResponse) and len(rows.rows) == 5
+    assert versions == ["7.0", "6.5"]
+    assert asset.startswith(b"\x89PNG")
+    assert fake_server.requests[0][1] == { "fields": "Name", "language": "en" }
+
+def test_async_bounded_concurrency(fake_server):
+    fake_server.latency = 0.02
+
+    async def main():
+        async with AsyncXIVAPI(max_concurrency=4) as client:
+            return await asyncio.gather(*(client.items.get(i) for i in range(50)))
+
+    results = asyncio.run(main())
+    assert [r.row_id for r in results] == list(range(50))
+    assert 1 < fake_server.peak_in_flight <= 4
+
+def test_default_session_per_loop(fake_server):
+    async def main():
+        return (await AsyncSheets().get("Item", "1")).row_id
+
+    # Each run has its own event loop, which the default session of the previous run is bound to
+    assert asyncio.run(main()) == 1
+    assert asyncio.run(main()) == 1
+
+def test_async_errors(fake_server):
+    async def main():
+        async with AsyncXIVAPI() as client:
+            await client.sheets().get("Missing", "1", {})
+
+    with pytest.raises(CustomError):
+        asyncio.run(main())
@@ -0,0 +1,42 @@
+import asyncio
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.sheets import batches, MAX_URL_LENGTH
+from pyxivapi.utils import url_for
+
+def test_get_many(fake_server):
+    client = XIVAPI(language="en")
+    ids = [5, 3, 300, 5, 1, "3", 301] + list(range(100, 240))
+    result = client.items.get_many(ids, { "fields": ["Name"] }, batch_size=50)
+    assert [r.row_id for r in result.rows] == [5, 3, 1] + list(range(100, 240))
+    assert result.by_id["3"].fields["Name"] == "Row 3"
+    assert result.missing == ["300", "301"]
+
+    # 145 unique IDs split into batches of at most 50
+    assert len(fake_server.requests) == 3
+    for _, query, _ in fake_server.requests:
+        assert query["fields"] == "Name"
+        assert query["language"] == "en"
+        assert len(query["rows"].split(",")) <= 50
+
+def test_batches_respect_url_length():
+    ids = [str(i) for i in range(100000, 105000)]
+    work = batches("/sheet/Item", { "fields": "Name" }, ids, batch_size=1000)
+    assert sum(len(b) for b in work) == 5000
+    for batch in work:
+        assert len(url_for("/sheet/Item", { "fields": "Name", "rows": ",".join(batch), "limit": len(batch) })) <= MAX_URL_LENGTH
+
+def test_get_many_errors(fake_server):
+    with pytest.raises(CustomError):
+        XIVAPI().sheets().get_many("Missing", [1, 2])
+
+def test_async_get_many(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            return await client.items.get_many(range(260), batch_size=30)
+
+    result = asyncio.run(main())
+    assert [r.row_id for r in result.rows] == list(range(250))
+    assert result.missing == [str(i) for i in range(250, 260)]
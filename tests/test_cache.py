@@ -0,0 +1,114 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pyxivapi import XIVAPI
+from pyxivapi.lib.cache import DiskCache, MemoryCache
+
+def paths(server):
+    return [path for path, _, _ in server.requests]
+
+def test_disk_cache_hits(fake_server, tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"))
+    client = XIVAPI(cache=cache, language="en")
+    first = client.items.get(1, { "fields": "Name" })
+    second = client.items.get(1, { "fields": "Name" })
+    assert first == second
+    assert paths(fake_server) == ["/api/version", "/api/sheet/Item/1"]
+
+    # Persisted between clients, and "latest" shares entries with the version it resolves to
+    client = XIVAPI(cache=DiskCache(str(tmp_path / "cache.sqlite")), language="en", version="7.0")
+    client.items.get(1, { "fields": "Name" })
+    client.versions()
+    assert paths(fake_server) == ["/api/version", "/api/sheet/Item/1"]
+
+def test_disk_cache_latest_invalidated(fake_server, tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), version_ttl=0)
+    latest = XIVAPI(cache=cache)
+    pinned = XIVAPI(cache=cache, version="7.0")
+    latest.items.get(1)
+    pinned.items.get(2)
+
+    fake_server.versions = [["7.1", "latest"], ["7.0"], ["6.5"]]
+    fake_server.requests.clear()
+    latest.items.get(1)
+    pinned.items.get(2)
+    assert paths(fake_server) == ["/api/version", "/api/sheet/Item/1", "/api/version"]
+
+def test_disk_cache_unknown_version(fake_server, tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), version_ttl=0)
+    client = XIVAPI(cache=cache, version="7.1")
+    client.items.get(1)
+
+    # Not in the versions list yet, so the entry is dropped with the list rather than kept like a pinned version
+    fake_server.versions = [["7.1", "latest"], ["7.0"], ["6.5"]]
+    fake_server.requests.clear()
+    client.items.get(1)
+    assert paths(fake_server) == ["/api/version", "/api/sheet/Item/1"]
+
+def test_disk_cache_eviction(fake_server, tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite"), max_bytes=1000)
+    client = XIVAPI(cache=cache)
+    for i in range(50):
+        client.items.get(i)
+    assert 0 < cache._size <= 1000
+
+def test_memory_cache_hits(fake_server):
+    cache = MemoryCache(ttl=60)
+    client = XIVAPI(memory_cache=cache)
+    client.items.get(1, { "fields": ["Name", "Icon"] })
+    client.items.get(1, { "fields": "Name,Icon" })
+    client.items.get(2)
+    assert len(fake_server.requests) == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["bytes"] > 0
+
+def test_memory_cache_bounds(fake_server):
+    cache = MemoryCache(max_entries=5, ttl=0)
+    client = XIVAPI(memory_cache=cache)
+    for i in range(10):
+        client.items.get(i)
+    client.items.get(9)
+    assert cache.stats()["entries"] == 5
+    assert cache.stats()["hits"] == 0
+    assert len(fake_server.requests) == 11
+
+def test_memory_cache_coalesces():
+    cache = MemoryCache()
+    release = threading.Event()
+    calls = []
+
+    def load():
+        calls.append(1)
+        release.wait()
+        return 200, {}, b"{}"
+
+    with ThreadPoolExecutor(8) as pool:
+        futures = [pool.submit(cache.fetch, "key", load) for _ in range(8)]
+        while cache.stats()["coalesced"] < 7:
+            time.sleep(0.01)
+        release.set()
+        assert all(f.result() == (200, {}, b"{}") for f in futures)
+    assert len(calls) == 1
+
+def test_memory_cache_async_flights_per_loop():
+    cache = MemoryCache()
+    started = threading.Barrier(2)
+
+    async def load():
+        await asyncio.sleep(0.1)
+        return 200, {}, b"{}"
+
+    def run():
+        async def main():
+            started.wait()
+            return await asyncio.gather(*(cache.async_fetch("key", load) for _ in range(4)))
+        return asyncio.run(main())
+
+    # Two threads, each running its own loop, share the cache without sharing (or dropping) each other's flights
+    with ThreadPoolExecutor(2) as pool:
+        results = list(pool.map(lambda _: run(), range(2)))
+    assert results == [[(200, {}, b"{}")] * 4] * 2
+    stats = cache.stats()
+    assert stats["misses"] + stats["hits"] == 2 and stats["misses"] >= 1 and stats["coalesced"] == 6
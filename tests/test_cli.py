@@ -0,0 +1,78 @@
+import json
+import sqlite3
+from pyxivapi.cli import main
+
+def lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+def test_export_sheets_jsonl(fake_server, tmp_path, capsys):
+    assert main(["export", "sheets", "Item", "Mount", "-o", str(tmp_path), "--page-size", "100", "--language", "en", "-q"]) == 0
+    assert [row["row_id"] for row in lines(tmp_path / "Item.jsonl")] == list(range(250))
+    assert len(lines(tmp_path / "Mount.jsonl")) == 250
+
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    assert checkpoint["version"] == "7.0" and checkpoint["language"] == "en"
+    assert checkpoint["sheets"]["Item"] == { "after": "249", "position": (tmp_path / "Item.jsonl").stat().st_size, "rows": 250, "done": True }
+    assert all(query.get("version") == "7.0" for path, query, _ in fake_server.requests if path.startswith("/api/sheet"))
+    assert "Exported 500 rows of 2 sheets at version 7.0" in capsys.readouterr().err
+
+def test_export_resumes(fake_server, tmp_path):
+    main(["export", "sheets", "Item", "-o", str(tmp_path), "--page-size", "100", "-q"])
+
+    # Simulate an export interrupted after its first page, with a partial write after the checkpoint
+    path = tmp_path / "Item.jsonl"
+    first = len("".join(line + "\n" for line in path.read_text().splitlines()[:100]).encode())
+    with open(path, "r+b") as file:
+        file.truncate(first + 10)
+    checkpoint = json.loads((tmp_path / "checkpoint.json").read_text())
+    checkpoint["sheets"]["Item"] = { "after": "99", "position": first, "rows": 100, "done": False }
+    (tmp_path / "checkpoint.json").write_text(json.dumps(checkpoint))
+    fake_server.requests.clear()
+
+    assert main(["export", "sheets", "Item", "-o", str(tmp_path), "--page-size", "100", "-q"]) == 0
+    assert [row["row_id"] for row in lines(path)] == list(range(250))
+    sheet_requests = [query for p, query, _ in fake_server.requests if p == "/api/sheet/Item"]
+    assert sheet_requests[0]["after"] == "99"
+
+    # A finished export has nothing left to fetch, and a different version needs --restart
+    fake_server.requests.clear()
+    assert main(["export", "sheets", "Item", "-o", str(tmp_path), "-q"]) == 0
+    assert not [p for p, _, _ in fake_server.requests if p == "/api/sheet/Item"]
+    assert main(["export", "sheets", "Item", "-o", str(tmp_path), "--version", "6.5", "-q"]) == 1
+    assert main(["export", "sheets", "Item", "-o", str(tmp_path), "--version", "6.5", "--restart", "-q"]) == 0
+
+def test_export_sheets_sqlite(fake_server, tmp_path):
+    assert main(["export", "sheets", "Item", "Action", "-o", str(tmp_path), "--format", "sqlite", "--fields", "Name", "-q"]) == 0
+    db = sqlite3.connect(tmp_path / "export.sqlite")
+    assert db.execute('SELECT COUNT(*) FROM "Item"').fetchone() == (250,)
+    assert json.loads(db.execute('SELECT fields FROM "Action" WHERE row_id = 3').fetchone()[0]) == { "Name": "Row 3" }
+
+    # Starting over at another version clears the rows exported before
+    fake_server.patches["7.0"] = { "Item": { 7: None } }
+    assert main(["export", "sheets", "Item", "-o", str(tmp_path), "--format", "sqlite", "--version", "7.0", "--restart", "-q"]) == 0
+    assert db.execute('SELECT COUNT(*) FROM "Item" WHERE row_id = 7').fetchone() == (0,)
+
+def test_export_assets(fake_server, tmp_path):
+    listing = tmp_path / "paths.txt"
+    listing.write_text("ui/icon/000000/000002.tex\nui/icon/000000/000003.tex\n")
+    out = tmp_path / "out"
+    assert main(["export", "assets", "ui/icon/000000/000001.tex", "--from-file", str(listing), "-o", str(out), "-q"]) == 0
+    assert (out / "ui/icon/000000/000001.png").read_bytes().startswith(b"\x89PNG")
+    assert len(json.loads((out / "checkpoint.json").read_text())["assets"]) == 3
+
+    fake_server.requests.clear()
+    assert main(["export", "assets", "ui/icon/000000/000001.tex", "--from-file", str(listing), "-o", str(out), "-q"]) == 0
+    assert not [p for p, _, _ in fake_server.requests if p.startswith("/api/asset")]
+
+    # Assets downloaded since the last save are journaled, and never downloaded again
+    (out / "checkpoint.json.assets").write_text("ui/icon/000000/000004.tex\nui/icon/000000/0000")
+    assert main(["export", "assets", "ui/icon/000000/000004.tex", "-o", str(out), "-q"]) == 0
+    assert not [p for p, _, _ in fake_server.requests if p.startswith("/api/asset")]
+    assert len(json.loads((out / "checkpoint.json").read_text())["assets"]) == 4 and not (out / "checkpoint.json.assets").exists()
+
+def test_export_assets_outside_output(fake_server, tmp_path):
+    out = tmp_path / "out"
+    for path in ("../escaped.tex", str(tmp_path / "absolute.tex")):
+        assert main(["export", "assets", path, "-o", str(out), "-q"]) == 1
+    assert not [p for p, _, _ in fake_server.requests if p.startswith("/api/asset")]
+    assert not (tmp_path / "escaped.png").exists() and not (tmp_path / "absolute.png").exists()
@@ -0,0 +1,42 @@
+import asyncio
+import subprocess
+import sys
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI
+from pyxivapi.lib.sheets import Sheet
+
+def test_lazy_import():
+    code = "import sys, pyxivapi; print(sorted(m for m in ('pyxivapi.client', 'pydantic', 'requests') if m in sys.modules))"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "[]"
+    code = "import sys; from pyxivapi import XIVAPI; XIVAPI(); print('requests' in sys.modules)"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
+
+def test_sheet_registry(fake_server):
+    with XIVAPI() as client:
+        assert client.sheet("Action") is client.sheet("Action")
+        assert client.items is client.items is client.sheet("Item")
+        assert client.sheets() is client.sheets() and client.assets() is client.assets()
+        assert client.items.raw.options["session"] is client.session
+
+        assert isinstance(client.Action, Sheet) and client.Action is client.sheet("Action")
+        assert client.Mount.get(3).row_id == 3
+        with pytest.raises(AttributeError):
+            client.ClassJob
+        with pytest.raises(AttributeError):
+            client.missing
+    # The sheets are listed once, for the first attribute access
+    assert [path for path, _, _ in fake_server.requests] == ["/api/sheet", "/api/sheet/Mount/3"]
+
+def test_async_sheet_registry(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            assert client.Action is client.sheet("Action")
+            row = await client.Companion.get(2)
+            assert "Companion" in await client.sheet_names()
+            with pytest.raises(AttributeError):
+                client.ClassJob
+            return row
+
+    assert asyncio.run(main()).row_id == 2
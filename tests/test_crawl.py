@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from collections import defaultdict
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.crawl import AsyncCrawler, Crawler, WorkUnit, split
+from pyxivapi.testing import DEFAULT_SHEETS
+
+def collect():
+    rows = defaultdict(list)
+    return rows, lambda sheet, page: rows[sheet].extend(row.row_id for row in page)
+
+def test_split():
+    assert split("Item", [200, 100]) == [WorkUnit("Item", None, 100), WorkUnit("Item", "99", 200), WorkUnit("Item", "199", None)]
+
+def test_crawl_all_sheets(fake_server):
+    rows, sink = collect()
+    with XIVAPI() as client:
+        stats = Crawler(workers=4, page_size=100, **client.options).run(sink)
+    assert sorted(rows) == sorted(DEFAULT_SHEETS)
+    assert all(sorted(ids) == list(range(250)) for ids in rows.values())
+    # Three pages of rows per sheet, then the empty page ending it
+    assert stats["units"] == 5 and stats["rows"] == 1250 and stats["pages"] == 5 * 4
+
+def test_crawl_ranges(fake_server):
+    rows, sink = collect()
+    with XIVAPI() as client:
+        stats = Crawler(page_size=60, **client.options).run(sink, split("Item", [100, 200]) + [("Mount", "239")])
+    assert sorted(rows["Item"]) == list(range(250))
+    assert rows["Mount"] == list(range(240, 250))
+    assert stats["rows"] == 260
+
+def test_crawl_processes(fake_server):
+    rows, sink = collect()
+    with XIVAPI() as client:
+        Crawler(page_size=100, processes=2, **client.options).run(sink, ["Item", "Action"], { "fields": "Name" })
+    assert sorted(rows["Item"]) == sorted(rows["Action"]) == list(range(250))
+    assert all(query.get("fields") == "Name" for path, query, _ in fake_server.requests)
+
+def test_crawl_error(fake_server):
+    with XIVAPI() as client:
+        with pytest.raises(CustomError):
+            Crawler(**client.options).run(lambda sheet, page: None, ["Item", "Unknown"])
+
+def test_async_crawl(fake_server):
+    rows = defaultdict(list)
+
+    async def sink(sheet, page):
+        rows[sheet].extend(row.row_id for row in page)
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            return await AsyncCrawler(workers=3, page_size=100, **client.options).run(sink, ["Item", "Mount", WorkUnit("Action", "199")])
+
+    stats = asyncio.run(main())
+    assert sorted(rows["Item"]) == sorted(rows["Mount"]) == list(range(250))
+    assert rows["Action"] == list(range(200, 250)) and stats["rows"] == 550
@@ -0,0 +1,38 @@
+import pytest
+from pydantic import ValidationError
+from pyxivapi import XIVAPI
+from pyxivapi.lib.models import RowResult, SearchResponse, SearchResult, SheetResponse
+from pyxivapi.utils import construct, decode
+
+DATA = { "schema": "test", "next": None, "results": [{ "score": 1, "sheet": "Item", "row_id": 1, "fields": { "Name": "Gil" } }] }
+
+def test_decode_modes():
+    validated = decode(SearchResponse, DATA)
+    lazy = decode(SearchResponse, DATA, { "decode": "lazy" })
+    raw = decode(SearchResponse, DATA, { "decode": "raw" })
+    assert isinstance(lazy, SearchResponse) and isinstance(lazy.results[0], SearchResult)
+    assert lazy.results[0].fields == validated.results[0].fields
+    assert lazy.results[0].subrow_id is None
+    assert raw is DATA
+
+def test_construct_defers_validation():
+    # Lazy models only validate results when they are read
+    response = construct(SearchResponse, { **DATA, "results": [{ **DATA["results"][0], "row_id": "1" }, { "row_id": "invalid" }] })
+    assert response.results[0].row_id == 1
+    with pytest.raises(ValidationError):
+        response.results[1]
+
+@pytest.mark.parametrize("mode", ["validated", "lazy", "raw"])
+def test_client_decode_option(fake_server, mode):
+    client = XIVAPI(decode=mode)
+    page = client.sheets().list("Item", { "limit": 3 })
+    row = client.items.get(1)
+    if mode == "raw":
+        assert page["rows"][0]["row_id"] == 0 and row["row_id"] == 1
+    else:
+        assert isinstance(page, SheetResponse) and page.rows[0].row_id == 0 and row.row_id == 1
+
+    # Helpers always produce models
+    assert all(isinstance(r, RowResult) for r in client.items.iter_rows(page_size=100))
+    assert client.items.get_many([1, 2]).by_id["2"].row_id == 2
+    assert client.versions() == ["7.0", "6.5"]
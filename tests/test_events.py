@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.cache import DiskCache, MemoryCache
+from pyxivapi.lib.events import Hooks, Metrics, Tracer, route
+
+def test_route():
+    assert route("/sheet/Item/12") == ("/sheet/{sheet}/{row}", "Item")
+    assert route("/sheet/Item") == ("/sheet/{sheet}", "Item")
+    assert route("/asset/map/s1d1/00") == ("/asset/map/{territory}/{index}", None)
+    assert route("/search") == ("/search", None)
+
+def test_request_events(fake_server):
+    hooks = Hooks()
+    events = []
+    hooks.on("*", events.append)
+    with XIVAPI(hooks=hooks) as client:
+        client.items.get(1)
+    kinds = [event.kind for event in events]
+    assert kinds == ["request", "response", "decode", "validate"]
+    request, response = events[0], events[1]
+    assert request.id == response.id and request.endpoint == "/sheet/{sheet}/{row}" and request.sheet == "Item"
+    assert response.status == 200 and response.latency > 0 and response.bytes > 0
+    assert events[3].model == "RowResponse" and events[3].validation_time > 0
+
+def test_retry_and_error_events(fake_server):
+    hooks = Hooks()
+    retries, errors = [], []
+    hooks.on("retry", retries.append)
+    hooks.on("error", errors.append)
+    fake_server.failures = [(503, {})]
+    with XIVAPI(hooks=hooks) as client:
+        client.scheduler.backoff = 0.01
+        client.items.get(1)
+        with pytest.raises(CustomError):
+            client.sheets().get("Unknown", 1)
+    assert [(event.attempt, event.status) for event in retries] == [(1, 503)]
+    assert [event.status for event in errors] == [404]
+
+def test_cache_hit_events(fake_server, tmp_path):
+    hooks = Hooks()
+    hits = []
+    hooks.on("cache_hit", lambda event: hits.append(event.cache))
+    with XIVAPI(hooks=hooks, memory_cache=MemoryCache(ttl=60)) as client:
+        client.items.get(1)
+        client.items.get(1)
+    with XIVAPI(hooks=hooks, cache=DiskCache(str(tmp_path / "cache.sqlite"))) as client:
+        client.items.get(1)
+        client.items.get(1)
+    assert hits == ["memory", "disk"]
+
+def test_coalesced_events(fake_server):
+    fake_server.latency = 0.2
+    hooks = Hooks()
+    events = []
+    hooks.on("*", lambda event: events.append(event.kind) if event.kind in ("request", "cache_hit", "coalesced") else None)
+    metrics = hooks.on("*", Metrics())
+    with XIVAPI(hooks=hooks, memory_cache=MemoryCache(ttl=60)) as client:
+        with ThreadPoolExecutor(4) as pool:
+            assert [row.row_id for row in pool.map(lambda _: client.items.get(1), range(4))] == [1] * 4
+        client.items.get(1)
+    # Callers that waited for the request in flight are told apart from later hits
+    assert sorted(events) == ["cache_hit", "coalesced", "coalesced", "coalesced", "request"]
+    assert metrics.snapshot()["counters"]['xivapi_coalesced_total{endpoint="/sheet/{sheet}/{row}",sheet="Item"}'] == 3
+
+    async def main():
+        async with AsyncXIVAPI(hooks=hooks, memory_cache=MemoryCache(ttl=60)) as client:
+            await asyncio.gather(*(client.items.get(2) for _ in range(4)))
+
+    events.clear()
+    pytest.importorskip("httpx")
+    asyncio.run(main())
+    assert sorted(events) == ["coalesced", "coalesced", "coalesced", "request"]
+
+def test_failing_hooks_warn(fake_server):
+    hooks = Hooks()
+    hooks.on("response", lambda event: 1 / 0)
+    with XIVAPI(hooks=hooks) as client:
+        with pytest.warns(RuntimeWarning):
+            assert client.items.get(1).row_id == 1
+    with pytest.raises(ValueError):
+        hooks.on("responses", print)
+
+def test_verbose(fake_server, capsys):
+    with XIVAPI(verbose=True) as client:
+        client.items.get(1)
+    out = capsys.readouterr().out
+    assert "[XIVAPI] Requesting" in out and "[XIVAPI] Response 200" in out
+
+def test_metrics(fake_server):
+    hooks = Hooks()
+    metrics = hooks.on("*", Metrics())
+    with XIVAPI(hooks=hooks) as client:
+        for row in range(3):
+            client.items.get(row)
+        client.sheets().list("Action", { "limit": 5 })
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]['xivapi_requests_total{endpoint="/sheet/{sheet}/{row}",sheet="Item",status="200"}'] == 3
+    assert snapshot["latency"]['{endpoint="/sheet/{sheet}",sheet="Action"}']["count"] == 1
+    text = metrics.prometheus()
+    assert "# TYPE xivapi_request_duration_seconds histogram" in text
+    assert 'xivapi_request_duration_seconds_bucket{endpoint="/sheet/{sheet}/{row}",sheet="Item",le="+Inf"} 3' in text
+    assert 'xivapi_validation_seconds_total{model="RowResponse"}' in text
+
+def test_tracer(fake_server):
+    hooks = Hooks()
+    exported = []
+    tracer = hooks.on("*", Tracer(export=exported.append))
+    with XIVAPI(hooks=hooks) as client:
+        client.items.get(1)
+        with pytest.raises(CustomError):
+            client.sheets().get("Unknown", 1)
+    ok, failed = tracer.spans()
+    assert exported == [ok, failed]
+    assert ok["name"] == "GET /sheet/{sheet}/{row}" and ok["status"]["code"] == "OK"
+    assert ok["attributes"]["xivapi.sheet"] == "Item" and ok["attributes"]["http.response.status_code"] == 200
+    assert ok["end_time_unix_nano"] >= ok["start_time_unix_nano"]
+    assert failed["status"]["code"] == "ERROR" and len(failed["trace_id"]) == 32
+
+def test_async_events(fake_server):
+    pytest.importorskip("httpx")
+    hooks = Hooks()
+    metrics = hooks.on("*", Metrics())
+
+    async def main():
+        async with AsyncXIVAPI(hooks=hooks) as client:
+            await asyncio.gather(*(client.items.get(i) for i in range(5)))
+
+    asyncio.run(main())
+    assert metrics.snapshot()["latency"]['{endpoint="/sheet/{sheet}/{row}",sheet="Item"}']["count"] == 5
@@ -0,0 +1,50 @@
+import asyncio
+from itertools import islice
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI
+from pyxivapi.lib.models import SearchHit
+
+def searches(fake_server):
+    return [query for path, query, _ in fake_server.requests if path == "/api/search"]
+
+def test_search_many(fake_server):
+    queries = [{ "query": 'Name~"Row"', "sheets": "Item" }, { "query": 'Name~"Row"', "sheets": "Mount", "version": "6.5" }]
+    with XIVAPI() as client:
+        top = list(client.search_many(queries, top_k=5))
+        assert all(isinstance(hit, SearchHit) for hit in top)
+        assert [(hit.query, hit.result.sheet, hit.result.row_id) for hit in top] == [(0, "Item", 0), (1, "Mount", 0), (0, "Item", 1), (1, "Mount", 1), (0, "Item", 2)]
+        # Each query is asked for no more than `top_k` results, in a single page
+        assert sorted((query["sheets"], query["limit"], query.get("version")) for query in searches(fake_server)) == [("Item", "5", None), ("Mount", "5", "6.5")]
+
+        fake_server.requests.clear()
+        hits = list(islice(client.search_many(queries, page_size=10), 25))
+        assert [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+        assert len(searches(fake_server)) == 4
+        assert len(list(client.search_many(queries, page_size=50))) == 200
+
+        fake_server.requests.clear()
+        assert list(client.search_many(queries, top_k=0)) == []
+        assert list(client.search_many(queries, top_k=-1)) == []
+        assert searches(fake_server) == []
+
+def test_async_search_many(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            queries = [{ "query": 'Name~"Row"', "sheets": sheet } for sheet in ("Item", "Mount", "Action")]
+            return [hit async for hit in client.search_many(queries, top_k=30, page_size=10)]
+
+    hits = asyncio.run(main())
+    assert len(hits) == 30 and [hit.score for hit in hits] == sorted((hit.score for hit in hits), reverse=True)
+    assert { hit.query for hit in hits } == { 0, 1, 2 }
+    # Every sheet scores alike, so the 10th results of the last two queries are only ranked once the first two have paged on
+    assert len(searches(fake_server)) == 5
+
+    async def none():
+        async with AsyncXIVAPI() as client:
+            return [hit async for hit in client.search_many([{ "query": 'Name~"Row"', "sheets": "Item" }], top_k=-1)]
+
+    fake_server.requests.clear()
+    assert asyncio.run(none()) == []
+    assert searches(fake_server) == []
@@ -0,0 +1,58 @@
+import asyncio
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI
+from pyxivapi.lib.languages import LANGUAGES, Localized, MultilingualSheet, merge
+from pyxivapi.lib.transports import MockSession
+
+def test_merge():
+    icon = { "id": 1, "path": "ui/icon/000000/000001.tex" }
+    category = lambda name: { "row_id": 3, "sheet": "ItemUICategory", "fields": { "Name": name, "Order": 2 } }
+    merged = merge({
+        "en": { "Name": "Gil", "Icon": icon, "Level": 1, "Category": category("Currency"), "Tags": ["a", "b"] },
+        "ja": { "Name": "ギル", "Icon": dict(icon), "Level": 1, "Category": category("通貨"), "Tags": ["a", "c"] },
+    })
+    assert merged["Name"] == Localized(en="Gil", ja="ギル") and isinstance(merged["Name"], Localized)
+    assert merged["Icon"] is icon and merged["Level"] == 1
+    assert merged["Category"]["fields"] == { "Name": Localized(en="Currency", ja="通貨"), "Order": 2 }
+    assert merged["Tags"] == ["a", Localized(en="b", ja="c")]
+    assert merge({ "en": 1, "de": "1" }) == Localized(en=1, de="1")
+
+def test_multilingual_sheet(fake_server):
+    with XIVAPI() as client:
+        mounts = client.mounts.multilingual(["en", "ja", "de"])
+        assert isinstance(mounts, MultilingualSheet)
+        row = mounts.get(4)
+        assert row.row_id == 4 and row.languages == ("en", "ja", "de")
+        assert row.fields["Name"] == { "en": "Row 4", "ja": "Row 4 (ja)", "de": "Row 4 (de)" }
+        assert row.in_language("ja") == { "Name": "Row 4 (ja)" }
+        with pytest.raises(KeyError):
+            row.in_language("fr")
+
+        found = mounts.get_many([1, 2, 999])
+        assert [row.row_id for row in found.rows] == [1, 2] and found.missing == ["999"]
+        assert [row.fields["Name"]["de"] for row in mounts.list({ "limit": 3 })] == ["Row 0 (de)", "Row 1 (de)", "Row 2 (de)"]
+        assert client.items.multilingual().languages == LANGUAGES
+    languages = sorted(query.get("language") for path, query, _ in fake_server.requests if path == "/api/sheet/Mount/4")
+    assert languages == ["de", "en", "ja"]
+
+def test_shared_fields():
+    def row(url):
+        language = url.split("language=")[1].split("&")[0]
+        return { "schema": "mock", "row_id": 1, "fields": { "Name": f"Name {language}", "Level": 50, "Icon": { "id": 7 } } }
+
+    with XIVAPI(session=MockSession({ "/api/sheet/Item/1": row })) as client:
+        merged = client.items.multilingual().get(1)
+    assert merged.fields["Level"] == 50 and merged.fields["Icon"] == { "id": 7 }
+    assert sorted(merged.fields["Name"]) == sorted(LANGUAGES)
+
+def test_async_multilingual_sheet(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            mounts = client.mounts.multilingual(["en", "fr"])
+            return await mounts.get(2), await mounts.get_many(range(3)), await mounts.list({ "limit": 2 })
+
+    row, found, listed = asyncio.run(main())
+    assert row.fields["Name"] == { "en": "Row 2", "fr": "Row 2 (fr)" }
+    assert list(found.by_id) == ["0", "1", "2"] and len(listed) == 2
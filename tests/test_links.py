@@ -0,0 +1,87 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI
+from pyxivapi.lib.links import Resolver, AsyncResolver
+from pyxivapi.lib.transports import MockSession, AsyncMockSession
+
+def link(sheet, row_id, **fields):
+    return { "value": row_id, "sheet": sheet, "row_id": row_id, **({ "fields": fields } if fields else {}) }
+
+def sheet_rows(url):
+    """Rows of the mock sheets: every ItemUICategory links to an ItemSortCategory; row 99 does not exist."""
+    sheet = urlsplit(url).path.split("/")[-1]
+    ids = [int(i) for i in parse_qs(urlsplit(url).query)["rows"][0].split(",")]
+    rows = []
+    for i in ids:
+        if i == 99:
+            continue
+        fields = { "Name": f"{sheet} {i}" }
+        if sheet == "ItemUICategory":
+            fields["ItemSortCategory"] = link("ItemSortCategory", i % 2)
+        rows.append({ "row_id": i, "fields": fields })
+    return { "schema": "mock", "rows": rows }
+
+def search_page():
+    results = [
+        { "score": 1, "sheet": "Item", "row_id": i, "fields": {
+            "Name": f"Item {i}",
+            "ItemUICategory": link("ItemUICategory", i % 3),
+            "BaseParam": [link("BaseParam", 1), link("BaseParam", 2 + i % 2), link("BaseParam", 99)],
+            "ClassJobCategory": link("ClassJobCategory", 7, Name="Expanded"),
+        } }
+        for i in range(10)
+    ]
+    return { "schema": "mock", "results": results }
+
+def routes():
+    return { f"/api/sheet/{sheet}": sheet_rows for sheet in ("ItemUICategory", "ItemSortCategory", "BaseParam", "ClassJobCategory") } | { "/api/search": search_page() }
+
+def test_resolve_search():
+    session = MockSession(routes())
+    with XIVAPI(session=session) as client:
+        page = client.search({ "query": 'Name~"Item"', "sheets": "Item" })
+        resolver = Resolver(["ItemUICategory.ItemSortCategory", "BaseParam[]", "ClassJobCategory"], fields={ "BaseParam": ["Name"] }, **client.options)
+        assert resolver.resolve(page) is page
+    fields = page.results[4].fields
+    assert fields["ItemUICategory"]["fields"]["Name"] == "ItemUICategory 1"
+    assert fields["ItemUICategory"]["fields"]["ItemSortCategory"]["fields"] == { "Name": "ItemSortCategory 1" }
+    assert [param.get("fields") for param in fields["BaseParam"]] == [{ "Name": "BaseParam 1" }, { "Name": "BaseParam 2" }, None]
+    assert fields["ClassJobCategory"]["fields"] == { "Name": "Expanded" }
+
+    # One batched request per sheet and level: ItemUICategory and BaseParam, then ItemSortCategory
+    requested = [url for url in session.requests if "/sheet/" in url]
+    assert len(requested) == 3 and "fields=Name" in next(url for url in requested if "BaseParam" in url)
+    stats = resolver.stats()
+    assert (stats["requests"], stats["rows"], stats["unresolved"]) == (3, 3 + 3 + 2, 10)
+    assert stats["references"] == 10 + 30 + 10 + 10
+
+def test_resolve_limits():
+    session = MockSession(routes())
+    with XIVAPI(session=session) as client:
+        page = client.search({ "query": 'Name~"Item"', "sheets": "Item" })
+        Resolver(["ItemUICategory.ItemSortCategory"], depth=1, **client.options).resolve(page)
+        assert "fields" not in page.results[0].fields["ItemUICategory"]["fields"]["ItemSortCategory"]
+
+        memo = {}
+        resolver = Resolver(["BaseParam[]"], max_rows=2, **client.options)
+        resolver.resolve(client.search({ "query": 'Name~"Item"', "sheets": "Item" }), memo)
+        assert sorted(memo) == [("BaseParam", 1), ("BaseParam", 2)]
+        requests = len(session.requests)
+        raw = XIVAPI(session=session, decode="raw").search({ "query": 'Name~"Item"', "sheets": "Item" })
+        resolver.resolve(raw, { ("BaseParam", row_id): {} for row_id in (1, 2, 3, 99) })
+        assert len(session.requests) == requests + 1
+    assert resolver.stats()["rows"] == 2
+
+def test_async_resolve():
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI(session=AsyncMockSession(routes())) as client:
+            page = await client.search({ "query": 'Name~"Item"', "sheets": "Item" })
+            resolver = AsyncResolver(["ItemUICategory.ItemSortCategory", "BaseParam[]"], **client.options)
+            return await resolver.resolve(page), resolver.stats()
+
+    page, stats = asyncio.run(main())
+    assert page.results[2].fields["ItemUICategory"]["fields"]["ItemSortCategory"]["fields"]["Name"] == "ItemSortCategory 0"
+    assert stats["requests"] == 3
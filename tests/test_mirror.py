@@ -0,0 +1,58 @@
+import pytest
+from pyxivapi import CustomError
+from pyxivapi.lib.mirror import Mirror
+from pyxivapi.lib.models import RowResult
+
+ROWS = [
+    RowResult(row_id=2, fields={ "Name": "Two", "Level": 20, "Price": 2.5, "Unique": True, "Icon": { "id": 2 } }),
+    RowResult(row_id=1, fields={ "Name": "Gil", "Level": 1, "Price": 1.0, "Unique": False, "Icon": { "id": 1 } }),
+    RowResult(row_id=3, subrow_id=0, fields={ "Name": "Three", "Level": 30, "Price": 3, "Unique": False, "Icon": None }),
+    RowResult(row_id=3, subrow_id=1, fields={ "Name": "Três", "Level": 31, "Price": 3, "Unique": True, "Icon": None }),
+]
+
+def test_mirror_roundtrip(tmp_path):
+    path = tmp_path / "Item.xivm"
+    Mirror.write(path, ROWS, sheet="Item", version="7.0", language="en")
+
+    with Mirror(path) as mirror:
+        assert (mirror.sheet, mirror.version, mirror.language, len(mirror)) == ("Item", "7.0", "en", 4)
+        assert mirror.types == { "Name": "str", "Level": "int", "Price": "float", "Unique": "bool", "Icon": "json" }
+        assert list(mirror.row_ids) == [1, 2, 3, 3]
+        assert list(mirror.column("Level")) == [1, 20, 30, 31]
+
+        row = mirror.get(2)
+        assert row.fields == ROWS[0].fields
+        assert mirror.get(3, 1).fields["Name"] == "Três"
+        assert mirror.get(3, 1, columns=["Level"]).fields == { "Level": 31 }
+        assert mirror.get(4) is None
+        assert [r.row_id for r in mirror.rows(["Name"])] == [1, 2, 3, 3]
+
+        with pytest.raises(CustomError):
+            mirror.column("Missing")
+
+def test_mirror_download(fake_server, tmp_path):
+    with Mirror.download(tmp_path / "Item.xivm", "Item", language="en") as mirror:
+        assert mirror.version == "7.0"
+        assert len(mirror) == 250
+        assert mirror.get(249).fields["Name"] == "Row 249"
+
+def test_mirror_invalid_file(tmp_path):
+    path = tmp_path / "invalid"
+    path.write_bytes(b"\0" * 64)
+    with pytest.raises(CustomError):
+        Mirror(path)
+
+def test_mirror_wide_integers(tmp_path):
+    path = tmp_path / "Wide.xivm"
+    rows = [
+        RowResult(row_id=1, fields={ "Big": 2**70, "Mixed": 1, "Nested": { "id": -2**64 } }),
+        RowResult(row_id=2, fields={ "Big": 1, "Mixed": 2.5, "Nested": { "id": 1 } }),
+    ]
+    Mirror.write(path, rows, sheet="Wide", version="7.0")
+
+    with Mirror(path) as mirror:
+        assert mirror.types == { "Big": "json", "Mixed": "float", "Nested": "json" }
+        assert list(mirror.column("Big")) == [2**70, 1]
+        assert type(mirror.column("Big")[1]) is int
+        assert mirror.get(1).fields["Nested"] == { "id": -2**64 }
+        assert list(mirror.column("Mixed")) == [1.0, 2.5]
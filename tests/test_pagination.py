@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+import threading
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.pagination import prefetch, async_prefetch
+
+def test_iter_rows(fake_server):
+    client = XIVAPI()
+    rows = list(client.items.iter_rows(page_size=40, prefetch=2))
+    assert [r.row_id for r in rows] == list(range(250))
+    # 8 pages, the last of which is empty
+    assert [q.get("after") for _, q, _ in fake_server.requests] == [None, "39", "79", "119", "159", "199", "239", "249"]
+
+def test_iter_rows_after_and_early_exit(fake_server):
+    client = XIVAPI()
+    rows = client.sheets().iter_rows("Item", { "after": "99" }, page_size=10)
+    assert [next(rows).row_id for _ in range(3)] == [100, 101, 102]
+    rows.close()
+
+def test_iter_rows_errors(fake_server):
+    client = XIVAPI()
+    with pytest.raises(CustomError):
+        list(client.sheets().iter_rows("Missing"))
+
+def test_iter_search(fake_server):
+    client = XIVAPI()
+    results = list(client.iter_search({ "query": 'Name~"a"', "sheets": "Item" }, page_size=30))
+    assert len(results) == 100
+    assert [q.get("cursor") for _, q, _ in fake_server.requests] == [None, "30", "60", "90"]
+
+def test_async_iterators(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            rows = [row async for row in client.items.iter_rows(page_size=100, prefetch=1)]
+            results = [r async for r in client.iter_search({ "query": 'Name~"a"', "sheets": "Item" })]
+            return rows, results
+
+    rows, results = asyncio.run(main())
+    assert [r.row_id for r in rows] == list(range(250))
+    assert len(results) == 100
+
+def test_prefetch_closes_pages():
+    closed = threading.Event()
+
+    def pages():
+        try:
+            for page in range(100):
+                yield page
+        finally:
+            closed.set()
+
+    # The pages stay referenced, so only an explicit close runs their cleanup
+    source = pages()
+    stream = prefetch(source, depth=2)
+    assert next(stream) == 0
+    stream.close()
+    assert closed.wait(1)
+
+    async def main():
+        closed = asyncio.Event()
+
+        async def pages():
+            try:
+                for page in range(100):
+                    yield page
+            finally:
+                closed.set()
+
+        source = pages()
+        stream = async_prefetch(source, depth=2)
+        assert await stream.__anext__() == 0
+        await stream.aclose()
+        await asyncio.wait_for(closed.wait(), 1)
+
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.cache import MemoryCache
+from pyxivapi.lib.models import SearchQuery
+from pyxivapi.lib.prepared import literal
+from pyxivapi.lib.transports import MockSession
+from pyxivapi.utils import normalize, url_for
+
+def test_literal():
+    assert literal("gil") == '"gil"'
+    assert literal('say "hi" \\o/') == '"say \\"hi\\" \\\\o/"'
+    assert (literal(True), literal(50), literal(1.5)) == ("true", "50", "1.5")
+
+def test_prepared_urls():
+    client = XIVAPI(language="en", version="7.0")
+    get = client.items.prepare_get(fields=["Name", "Icon"])
+    path, url = get.bind(3)
+    assert path == "/sheet/Item/3"
+    assert url == url_for(path, dict(sorted(normalize({ "fields": ["Name", "Icon"] }, client.options).items())))
+    assert get.bind("1:2")[1].startswith(url_for("/sheet/Item/1:2?"))
+
+    search = client.prepare_search("Name~{term} +LevelItem>={level}", { "sheets": "Item" }, fields="Name", limit=5)
+    query, params, url = search.bind({ "term": 'a "b" & c', "level": 50 })
+    assert query == 'Name~"a \\"b\\" & c" +LevelItem>=50'
+    assert url == url_for("/search", dict(sorted(normalize(SearchQuery(**params).model_dump(exclude_none=True), client.options).items())))
+    with pytest.raises(CustomError):
+        search.bind({ "term": "gil" })
+
+def test_prepared_requests(fake_server):
+    memory = MemoryCache()
+    with XIVAPI(memory_cache=memory) as client:
+        get = client.items.prepare_get(fields="Name")
+        assert get(4) == client.items.get(4, { "fields": "Name" })
+        assert memory.stats()["hits"] == 1
+
+        search = client.prepare_search("Name~{term}", sheets="Item", limit=3)
+        assert len(search(term="Row").results) == 3
+        with pytest.raises(CustomError):
+            client.sheet("Missing").prepare_get()(1)
+    assert fake_server.requests[-2][1]["query"] == 'Name~"Row"'
+
+def test_prepared_backend():
+    session = MockSession({})
+    backend = type("Backend", (), { "search": lambda self, params: params })()
+    with XIVAPI(session=session, search_backend=backend) as client:
+        params = client.prepare_search("Name~{term}", sheets="Item", fields=["Name"])(term="gil")
+    assert (params.query, params.sheets, params.fields) == ('Name~"gil"', "Item", ["Name"])
+    assert session.requests == []
+
+def test_async_prepared_backend():
+    pytest.importorskip("httpx")
+    backend = type("Backend", (), { "search": lambda self, params: (params, threading.get_ident()) })()
+
+    async def main():
+        async with AsyncXIVAPI(search_backend=backend) as client:
+            return await client.prepare_search("Name~{term}", sheets="Item")(term="gil"), threading.get_ident()
+
+    (params, thread), loop_thread = asyncio.run(main())
+    # The backend runs off the event loop's thread
+    assert params.query == 'Name~"gil"' and thread != loop_thread
+
+def test_async_prepared(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            get = client.mounts.prepare_get(fields=["Name"])
+            rows = await asyncio.gather(*(get(i) for i in range(1, 4)))
+            results = await client.prepare_search("Name~{term}", sheets="Mount", limit=2)(term="Row")
+            return rows, results
+
+    rows, results = asyncio.run(main())
+    assert [row.row_id for row in rows] == [1, 2, 3]
+    assert len(results.results) == 2
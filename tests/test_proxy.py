@@ -0,0 +1,84 @@
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+from pyxivapi.lib.cache import DiskCache
+from pyxivapi.lib.mirror import Mirror
+from pyxivapi.lib.models import RowResult
+from pyxivapi.lib.proxy import CachingProxy
+from pyxivapi.lib.transports import MockSession
+
+def upstream(fake_server, prefix):
+    return [path for path, _, _ in fake_server.requests if path.startswith(prefix)]
+
+@pytest.fixture
+def proxy(fake_server):
+    with CachingProxy().serve() as proxy:
+        yield proxy
+
+def test_read_through(fake_server, proxy):
+    fake_server.latency = 0.2
+    url = f"{proxy.endpoint}sheet/Item/3?version=7.0&language=en"
+    with ThreadPoolExecutor(8) as pool:
+        responses = list(pool.map(lambda _: requests.get(url), range(8)))
+    assert all(r.status_code == 200 and r.json()["fields"] == { "Name": "Row 3" } for r in responses)
+    # Concurrent misses are coalesced into a single upstream request, and later requests are hits
+    assert upstream(fake_server, "/api/sheet/Item/3") == ["/api/sheet/Item/3"]
+    assert requests.get(f"{proxy.endpoint}sheet/Item/3?language=en&version=7.0").status_code == 200
+    assert len(upstream(fake_server, "/api/sheet/Item/3")) == 1
+    stats = proxy.stats()
+    assert stats["requests"] == 9 and stats["misses"] == 1 and stats["coalesced"] + stats["hits"] == 8
+
+    assert requests.get(f"{proxy.endpoint}version").json()["versions"][0]["names"] == ["7.0", "latest"]
+    assert requests.get(f"{proxy.endpoint}search?query=Name~\"Row\"&sheets=Mount&limit=2").json()["results"][0]["sheet"] == "Mount"
+    missing = requests.get(f"{proxy.endpoint}sheet/Missing/1")
+    assert missing.status_code == 404 and missing.json()["message"] == "Unknown sheet Missing"
+    assert requests.get(f"{proxy.endpoint}unknown").status_code == 404
+
+def test_conditional_requests(fake_server, proxy):
+    first = requests.get(f"{proxy.endpoint}sheet/Item/1")
+    tag = first.headers["ETag"]
+    cached = requests.get(f"{proxy.endpoint}sheet/Item/1", headers={ "If-None-Match": tag })
+    assert cached.status_code == 304 and cached.content == b"" and cached.headers["ETag"] == tag
+    assert requests.get(f"{proxy.endpoint}sheet/Item/1", headers={ "If-None-Match": '"other"' }).status_code == 200
+    assert requests.get(f"{proxy.endpoint}sheet/Item/2", headers={ "If-None-Match": tag }).status_code == 200
+
+    # Upstream entity tags are kept, so clients of the API and of the proxy agree
+    asset = f"{proxy.endpoint}asset?path=ui/icon/000000/000001.tex&format=png"
+    direct = requests.get(f"{fake_server.endpoint}asset?path=ui/icon/000000/000001.tex&format=png")
+    assert requests.get(asset).headers["ETag"] == direct.headers["ETag"]
+    assert requests.get(asset, headers={ "If-None-Match": f"W/{direct.headers['ETag']}" }).status_code == 304
+    assert proxy.stats()["not_modified"] == 2
+
+def test_conditional_requests_disk_cache(tmp_path):
+    session = MockSession({
+        "/api/version": { "versions": [{ "names": ["7.0", "latest"] }] },
+        "/api/sheet/Item/1": (200, { "content-type": "application/json", "ETag": '"upstream"' }, b'{"row_id":1,"fields":{}}'),
+    })
+    tags = []
+    # Each proxy starts with an empty memory cache, so the second one is answered from the persistent cache
+    for _ in range(2):
+        with CachingProxy(session=session, cache=DiskCache(str(tmp_path / "cache.sqlite"))).serve() as proxy:
+            tags.append(requests.get(f"{proxy.endpoint}sheet/Item/1?version=7.0").headers["ETag"])
+            assert requests.get(f"{proxy.endpoint}sheet/Item/1?version=7.0", headers={ "If-None-Match": '"upstream"' }).status_code == 304
+    assert tags == ['"upstream"', '"upstream"']
+    assert sum("/sheet/" in url for url in session.requests) == 1
+
+def test_mirror(fake_server, tmp_path):
+    rows = [RowResult(row_id=i, fields={ "Name": f"Mirrored {i}", "Level": i }) for i in range(10)]
+    Mirror.write(tmp_path / "Item.xivm", rows, sheet="Item", version="7.0")
+    with Mirror(tmp_path / "Item.xivm") as mirror, CachingProxy([mirror]).serve() as proxy:
+        assert requests.get(f"{proxy.endpoint}sheet/Item/4?version=7.0").json() == { "schema": "mirror", "row_id": 4, "fields": { "Name": "Mirrored 4", "Level": 4 } }
+        assert requests.get(f"{proxy.endpoint}sheet/Item/4?fields=Level").json()["fields"] == { "Level": 4 }
+        page = requests.get(f"{proxy.endpoint}sheet/Item?after=2&limit=3").json()
+        assert [row["row_id"] for row in page["rows"]] == [3, 4, 5]
+        assert [row["row_id"] for row in requests.get(f"{proxy.endpoint}sheet/Item?rows=1,9,20").json()["rows"]] == [1, 9]
+        assert requests.get(f"{proxy.endpoint}sheet/Item/20?version=7.0").status_code == 404
+        # `latest` is resolved through the versions list; nothing else reaches the API
+        assert upstream(fake_server, "/api/sheet") == [] and upstream(fake_server, "/api/version") == ["/api/version"]
+
+        # Other versions, languages and parameters are read through
+        assert requests.get(f"{proxy.endpoint}sheet/Item/4?version=6.5").json()["fields"] == { "Name": "Row 4" }
+        assert requests.get(f"{proxy.endpoint}sheet/Item/4?language=ja").json()["fields"] == { "Name": "Row 4 (ja)" }
+        assert requests.get(f"{proxy.endpoint}sheet/Item/4?fields=Name.Singular").json()["schema"] == "test"
+        assert len(upstream(fake_server, "/api/sheet")) == 3
+        assert proxy.stats()["mirror"] == 5
@@ -0,0 +1,73 @@
+import asyncio
+import threading
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.mirror import Mirror
+from pyxivapi.lib.models import RowResult
+from pyxivapi.lib.query import Clause, Group, LocalSearch, parse_query
+
+ITEMS = [
+    RowResult(row_id=1, fields={ "Name": "Gil", "LevelItem": 1, "ClassJobCategory": { "value": 0, "sheet": "ClassJobCategory", "row_id": 0, "fields": { "Name": "" } } }),
+    RowResult(row_id=2, fields={ "Name": "Iron Sword", "LevelItem": 10, "ClassJobCategory": { "value": 2, "sheet": "ClassJobCategory", "row_id": 2, "fields": { "Name": "GLA" } } }),
+    RowResult(row_id=3, fields={ "Name": "Bronze Sword", "LevelItem": 5, "ClassJobCategory": { "value": 2, "sheet": "ClassJobCategory", "row_id": 2, "fields": { "Name": "GLA" } } }),
+    RowResult(row_id=4, fields={ "Name": "Swordfish", "LevelItem": 50, "ClassJobCategory": None }),
+]
+
+def test_parse_query():
+    assert parse_query('Name~"gil" +LevelItem>=5 -(A=1 B="x\\"y")') == [
+        Clause("", "Name", "~", "gil"),
+        Clause("+", "LevelItem", ">=", 5),
+        Group("-", [Clause("", "A", "=", 1), Clause("", "B", "=", 'x"y')]),
+    ]
+    for invalid in ["Name", 'Name="x', "(A=1", "A=1)", "A~1"]:
+        with pytest.raises(CustomError):
+            parse_query(invalid)
+
+def search(engine, query, **kwargs):
+    return [r.row_id for r in engine.search({ "query": query, "sheets": "Item", **kwargs }).results]
+
+def test_local_search():
+    engine = LocalSearch({ "Item": ITEMS })
+    assert sorted(search(engine, 'Name~"sword"')) == [2, 3, 4]
+    # Must clauses filter, should clauses only score once a must clause is present
+    assert search(engine, 'Name~"sword" +LevelItem<=10') == [2, 3, 1]
+    assert search(engine, 'Name~"sword" -LevelItem>20') == [2, 3]
+    assert search(engine, 'Name="Gil"') == [1]
+    assert sorted(search(engine, "ClassJobCategory=2")) == [2, 3]
+    assert sorted(search(engine, 'ClassJobCategory.Name="GLA"')) == [2, 3]
+    assert sorted(search(engine, '+(LevelItem=1 LevelItem=50)')) == [1, 4]
+    assert search(engine, 'Name~"zz"') == []
+
+    # Closer matches score higher
+    assert search(engine, 'Name~"swordf"')[0] == 4
+    assert engine.search({ "query": 'Name~"gil"', "sheets": "Item" }).results[0].score == 1.0
+
+def test_local_search_pagination():
+    engine = LocalSearch({ "Item": ITEMS })
+    client = XIVAPI(search_backend=engine)
+    page = client.search({ "query": "LevelItem>0", "sheets": "Item", "limit": 3 })
+    assert len(page.results) == 3 and page.next
+    assert len(list(client.iter_search({ "query": "LevelItem>0", "sheets": "Item" }, page_size=1))) == 4
+
+def test_async_local_search():
+    pytest.importorskip("httpx")
+    engine = LocalSearch({ "Item": ITEMS })
+    threads = []
+    search = engine.search
+    engine.search = lambda params: threads.append(threading.get_ident()) or search(params)
+
+    async def main():
+        async with AsyncXIVAPI(search_backend=engine) as client:
+            return await client.search({ "query": 'Name~"sword"', "sheets": "Item" }), threading.get_ident()
+
+    page, loop_thread = asyncio.run(main())
+    # The scan runs off the event loop's thread
+    assert len(page.results) == 3 and threads and loop_thread not in threads
+
+def test_local_search_mirror(tmp_path):
+    Mirror.write(tmp_path / "Item.xivm", ITEMS, sheet="Item", version="7.0")
+    with Mirror(tmp_path / "Item.xivm") as mirror:
+        engine = LocalSearch({ "Item": mirror })
+        assert sorted(search(engine, 'Name~"iron" ClassJobCategory.Name="GLA"')) == [2, 3]
+        with pytest.raises(CustomError):
+            engine.search({ "query": "Name=1", "sheets": "Action" })
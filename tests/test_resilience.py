@@ -0,0 +1,87 @@
+import asyncio
+import time
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError, DeadlineExceeded, CircuitOpenError
+from pyxivapi.lib.resilience import CircuitBreaker, Hedger, deadline
+
+def test_deadline_context(fake_server):
+    fake_server.delays = [1.0]
+    with XIVAPI() as client:
+        start = time.monotonic()
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0.2):
+                client.items.get(1)
+        assert time.monotonic() - start < 0.8
+        # Outside the block requests are unbounded again
+        assert client.items.get(1).row_id == 1
+
+def test_deadline_option(fake_server):
+    fake_server.delays = [1.0]
+    with XIVAPI(deadline=0.2) as client:
+        with pytest.raises(TimeoutError):
+            client.search({ "query": 'Name~"a"', "sheets": "Item" })
+
+def test_deadline_reaches_worker_threads(fake_server):
+    fake_server.delays = [1.0, 1.0]
+    with XIVAPI() as client:
+        with pytest.raises(DeadlineExceeded):
+            with deadline(0.2):
+                client.items.get_many(range(4), batch_size=1)
+
+def test_deadline_stops_retries(fake_server):
+    fake_server.failures = [(503, { "Retry-After": "5" })]
+    with XIVAPI() as client:
+        with pytest.raises(CustomError):
+            with deadline(1.0):
+                client.items.get(1)
+    assert len(fake_server.requests) == 1
+
+def test_hedging(fake_server):
+    hedge = Hedger(percentile=0.9, min_samples=5)
+    for _ in range(5):
+        hedge.record(0.05)
+    fake_server.delays = [1.0]
+    with XIVAPI(hedge=hedge) as client:
+        start = time.monotonic()
+        assert client.items.get(1).row_id == 1
+        assert time.monotonic() - start < 0.8
+    assert hedge.hedged == 1 and len(fake_server.requests) == 2
+    hedge.close()
+
+def test_circuit_breaker(fake_server):
+    breaker = CircuitBreaker(failures=2, reset_timeout=0.2)
+    fake_server.failures = [(500, {}), (500, {})]
+    with XIVAPI(circuit_breaker=breaker, retries=0) as client:
+        for _ in range(2):
+            with pytest.raises(CustomError):
+                client.items.get(1)
+        assert breaker.state == "open"
+        with pytest.raises(CircuitOpenError):
+            client.items.get(1)
+        assert len(fake_server.requests) == 2
+
+        # A trial request is let through once the reset timeout has passed
+        time.sleep(0.25)
+        assert breaker.state == "half-open"
+        assert client.items.get(1).row_id == 1
+        assert breaker.state == "closed"
+
+def test_async_deadline_and_hedging(fake_server):
+    hedge = Hedger(percentile=0.9, min_samples=5)
+    for _ in range(5):
+        hedge.record(0.05)
+
+    async def main():
+        async with AsyncXIVAPI(hedge=hedge) as client:
+            fake_server.delays = [1.0]
+            row = await client.items.get(1)
+            fake_server.delays = [1.0, 1.0]
+            with pytest.raises(DeadlineExceeded):
+                with deadline(0.2):
+                    await client.items.get(2)
+            return row
+
+    start = time.monotonic()
+    assert asyncio.run(main()).row_id == 1
+    assert time.monotonic() - start < 1.5
+    assert hedge.hedged >= 1
@@ -0,0 +1,78 @@
+import asyncio
+import sys
+from typing import Any, Dict, List, Optional
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.rows import Row, Rows, TypedSheet, row_model
+from pyxivapi.lib.transports import MockSession
+
+class Category(Row, sheet="ItemUICategory"):
+    Name: str
+
+class Item(Row, sheet="Item"):
+    Name: str
+    LevelEquip: int = 1
+    Icon: Dict[str, Any]
+    ItemUICategory: Optional[Category]
+    BaseParam: List[Category]
+
+class Named(Row, sheet="Mount"):
+    Name: str
+
+def test_row_declaration():
+    assert Item.sheet == "Item" and Item.columns == ("Name", "LevelEquip", "Icon", "ItemUICategory", "BaseParam")
+    assert Item.projection() == ["Name", "LevelEquip", "Icon", "ItemUICategory.Name", "BaseParam[].Name"]
+    row = Item.from_row({
+        "row_id": 5,
+        "fields": { "Name": "Sword", "ItemUICategory": { "value": 1, "sheet": "ItemUICategory", "row_id": 1, "fields": { "Name": "Arm" } }, "BaseParam": [] },
+    })
+    assert (row.row_id, row.Name, row.LevelEquip, row.Icon, row.BaseParam) == (5, "Sword", 1, None, [])
+    assert row.ItemUICategory == Category(1, Name="Arm")
+    assert row.as_dict()["ItemUICategory"] == { "Name": "Arm" }
+    assert not hasattr(row, "__dict__")
+    with pytest.raises(AttributeError):
+        row.Description = "..."  # type: ignore[attr-defined]
+
+    generated = row_model("Action", { "Name": str, "ClassJobLevel": int })
+    assert generated.sheet == "Action" and generated.projection() == ["Name", "ClassJobLevel"]
+    assert sys.getsizeof(Named(1, Name="a")) < sys.getsizeof({ "row_id": 1, "fields": { "Name": "a" } })
+
+def test_typed_sheet(fake_server):
+    fake_server.row_size = 512
+    with XIVAPI() as client:
+        mounts = client.sheet(Named)
+        assert isinstance(mounts, TypedSheet) and mounts is client.sheet(Named)
+        assert mounts.get(3) == Named(3, Name="Row 3")
+        assert [row.row_id for row in mounts.list({ "limit": 3 })] == [0, 1, 2]
+        assert [row.Name for row in mounts.iter_rows(page_size=40)] == [f"Row {i}" for i in range(250)]
+        found = mounts.get_many([1, 2, 2, 999])
+        assert isinstance(found, Rows) and [row.row_id for row in found.rows] == [1, 2] and found.missing == ["999"]
+        # Explicit fields replace the declared ones
+        assert mounts.get(4, { "fields": "Description" }).Name is None
+        assert client.sheet(Item).get(1).Name == "Row 1"
+        with pytest.raises(CustomError):
+            client.sheet(row_model("Missing", ["Name"])).get(1)
+    fields = [query.get("fields") for path, query, _ in fake_server.requests]
+    assert fields[:-3] == ["Name"] * (len(fields) - 3)
+    assert fields[-3:] == ["Description", "Name,LevelEquip,Icon,ItemUICategory.Name,BaseParam[].Name", "Name"]
+
+def test_typed_sheet_mocked():
+    row = { "row_id": 1, "fields": { "Name": "Gil", "LevelEquip": 1, "BaseParam": [{ "row_id": 2, "fields": { "Name": "Strength" } }] } }
+    with XIVAPI(session=MockSession({ "/api/sheet/Item/1": row }), decode="raw") as client:
+        item = client.sheet(Item).get(1)
+    assert item.BaseParam == [Category(2, Name="Strength")] and item.ItemUICategory is None
+
+def test_async_typed_sheet(fake_server):
+    pytest.importorskip("httpx")
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            mounts = client.sheet(Named)
+            row = await mounts.get(2)
+            rows = [row async for row in mounts.iter_rows(page_size=100)]
+            found = await mounts.get_many(range(5), batch_size=2)
+            return row, rows, found
+
+    row, rows, found = asyncio.run(main())
+    assert row == Named(2, Name="Row 2") and len(rows) == 250
+    assert list(found.by_id) == ["0", "1", "2", "3", "4"]
@@ -0,0 +1,102 @@
+import asyncio
+import time
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.scheduler import Scheduler, retry_after
+
+def test_retry_after():
+    assert retry_after({ "retry-after": "1.5" }) == 1.5
+    assert retry_after({ "retry-after": "Wed, 21 Oct 2015 07:28:00 GMT" }) == 0
+    assert retry_after({ "retry-after": "soon" }) is None
+    assert retry_after({}) is None
+
+def test_shared_by_endpoints():
+    with XIVAPI(rate_limit=5) as client:
+        assert client.scheduler.rate_limit == 5
+        assert client.items.options["scheduler"] is client.scheduler
+        assert client.assets().options["scheduler"] is client.scheduler
+        assert client.sheets().options["scheduler"] is client.scheduler
+
+def test_retries_and_backs_off(fake_server):
+    fake_server.failures = [(503, {}), (500, {})]
+    with XIVAPI(max_concurrency=8) as client:
+        client.scheduler.backoff = 0.01
+        assert client.items.get(1).row_id == 1
+        stats = client.scheduler.stats()
+    assert len(fake_server.requests) == 3
+    assert stats["retries"] == 2 and stats["throttled"] == 1
+    assert 4 <= stats["limit"] < 8 and stats["in_flight"] == 0
+
+def test_gives_up(fake_server):
+    fake_server.failures = [(500, {})] * 3
+    with XIVAPI(retries=1) as client:
+        client.scheduler.backoff = 0.01
+        with pytest.raises(CustomError):
+            client.items.get(1)
+    assert len(fake_server.requests) == 2
+
+def test_client_errors_are_not_retried(fake_server):
+    with XIVAPI() as client:
+        with pytest.raises(CustomError):
+            client.sheets().get("Unknown", 1)
+    assert len(fake_server.requests) == 1
+
+def test_honours_retry_after(fake_server):
+    fake_server.failures = [(429, { "Retry-After": "0.3" })]
+    with XIVAPI() as client:
+        client.scheduler.backoff = 0.01
+        start = time.monotonic()
+        client.items.get(1)
+    assert time.monotonic() - start >= 0.3
+
+def test_rate_limit(fake_server):
+    with XIVAPI(rate_limit=20, burst=1) as client:
+        start = time.monotonic()
+        client.items.get_many(range(10), batch_size=1)
+    assert time.monotonic() - start >= 0.4
+
+def test_concurrency_limit():
+    scheduler = Scheduler(max_concurrency=2)
+    scheduler.acquire(), scheduler.acquire()
+    assert scheduler.in_flight == 2
+    scheduler.limit = 1.0
+    started = time.monotonic()
+    scheduler.release(started, 200)
+    scheduler.release(started, 200)
+    scheduler.acquire()
+    assert scheduler.in_flight == 1
+
+def test_async_waits_for_released_slots():
+    scheduler = Scheduler(max_concurrency=1)
+    admissions = []
+    admit = scheduler._admit
+    scheduler._admit = lambda: admissions.append(1) or admit()
+
+    async def hold(seconds):
+        started = await scheduler.async_acquire()
+        await asyncio.sleep(seconds)
+        scheduler.release(started, 200)
+        return time.monotonic()
+
+    async def main():
+        return await asyncio.gather(hold(0.3), hold(0))
+
+    released, admitted = asyncio.run(main())
+    # The waiting task sleeps until the slot is released, instead of polling for it
+    assert admitted >= released and len(admissions) <= 4
+
+    scheduler = Scheduler(max_concurrency=1)
+    scheduler.acquire()
+    with pytest.raises(TimeoutError):
+        asyncio.run(scheduler.async_acquire(time.monotonic() + 0.1))
+
+def test_async_retries(fake_server):
+    fake_server.failures = [(503, { "Retry-After": "0" }), (502, {})]
+
+    async def main():
+        async with AsyncXIVAPI() as client:
+            client.scheduler.backoff = 0.01
+            return await client.items.get(1), client.scheduler.stats()
+
+    row, stats = asyncio.run(main())
+    assert row.row_id == 1 and stats["retries"] == 2
@@ -0,0 +1,31 @@
+import pytest
+from pyxivapi import XIVAPI, CustomError
+
+def test_session_shared_between_endpoints(fake_server):
+    with XIVAPI() as client:
+        assert client.items.options["session"] is client.session
+        assert client.sheets().options["session"] is client.session
+        assert client.assets().options["session"] is client.session
+
+        client.items.get(1)
+        client.versions()
+        client.assets().get({ "path": "ui/icon/000000/000001.tex", "format": "png" })
+
+    assert len(fake_server.requests) == 3
+    for _, _, headers in fake_server.requests:
+        assert "gzip" in headers["Accept-Encoding"]
+        assert headers["Connection"] == "keep-alive"
+
+def test_session_options(fake_server):
+    client = XIVAPI(pool_size=2, connect_timeout=1.5, read_timeout=4, keep_alive=False, compression=False)
+    assert client.session.timeout == (1.5, 4)
+    client.items.get(1)
+    _, _, headers = fake_server.requests[0]
+    assert headers["Accept-Encoding"] == "identity"
+    assert headers["Connection"] == "close"
+
+def test_closed_session(fake_server):
+    client = XIVAPI()
+    client.close()
+    with pytest.raises(CustomError):
+        client.items.get(1)
@@ -0,0 +1,77 @@
+import json
+import pytest
+from pyxivapi import CustomError
+from pyxivapi.cli import main
+from pyxivapi.lib.mirror import Mirror
+from pyxivapi.lib.models import RowResult
+from pyxivapi.lib.sync import HashStore, Sync, row_hash
+
+def sheet_requests(fake_server):
+    return [query for path, query, _ in fake_server.requests if path.startswith("/api/sheet/")]
+
+def test_row_hash():
+    assert row_hash(RowResult(row_id=1, fields={ "Name": "Gil", "Level": 1 })) == row_hash(RowResult(row_id=2, fields={ "Level": 1, "Name": "Gil" }))
+    assert row_hash(RowResult(row_id=1, fields={ "Name": "Gil" })) != row_hash(RowResult(row_id=1, fields={ "Name": "Gil " }))
+    assert len(row_hash(RowResult(row_id=1, fields={}))) == 8
+
+def test_sync_versions(fake_server, tmp_path):
+    with HashStore(tmp_path / "hashes.sqlite") as store:
+        sync = Sync(store, page_size=100, version="6.5", language="en")
+        first = sync.run(["Item", "Mount"])
+        assert first["Item"].previous is None and len(first["Item"].added) == 250 and first["Item"].version == "6.5"
+        assert store.version("Item", "en") == "6.5" and len(store.hashes("Item", "en")) == 250
+
+        # Sheets already synced to the version are skipped
+        fake_server.requests.clear()
+        assert sync.run(["Item", "Mount"]) == {} and not sheet_requests(fake_server)
+
+        fake_server.patches["7.0"] = { "Item": { 3: { "Name": "Gil" }, 7: None, 250: { "Name": "New" } } }
+        sync = Sync(store, page_size=100, language="en")
+        assert sync.latest() == "7.0" and sync.stale(["Item", "Mount"]) == ["Item", "Mount"]
+        deltas = sync.run(["Item", "Mount"])
+        item, mount = deltas["Item"], deltas["Mount"]
+        assert (item.previous, item.version) == ("6.5", "7.0")
+        assert [row.row_id for row in item.added] == [250] and [row.fields for row in item.changed] == [{ "Name": "Gil" }]
+        assert item.removed == [(7, -1)] and item.unchanged == 248
+        assert not mount and mount.unchanged == 250
+        assert all(query["version"] == "7.0" for query in sheet_requests(fake_server)[-6:])
+        assert store.version("Item", "en") == "7.0" and (7, -1) not in store.hashes("Item", "en")
+
+        # Hashes are kept per language
+        assert Sync(store, language="ja").stale(["Item"]) == ["Item"]
+
+def test_delta_write_apply(fake_server, tmp_path):
+    with HashStore(tmp_path / "hashes.sqlite") as store:
+        first = Sync(store, version="6.5").run(["Item"])["Item"]
+        first.apply(tmp_path / "Item.xivm")
+        fake_server.patches["7.0"] = { "Item": { 0: { "Name": "Zero" }, 1: None, 300: { "Name": "New" } } }
+        delta = Sync(store).run(["Item"])["Item"]
+
+    delta.write(tmp_path / "Item.jsonl")
+    records = [json.loads(line) for line in (tmp_path / "Item.jsonl").read_text().splitlines()]
+    assert records == [
+        { "op": "add", "row_id": 300, "subrow_id": None, "fields": { "Name": "New" } },
+        { "op": "change", "row_id": 0, "subrow_id": None, "fields": { "Name": "Zero" } },
+        { "op": "remove", "row_id": 1, "subrow_id": None },
+    ]
+
+    delta.apply(tmp_path / "Item.xivm")
+    with Mirror(tmp_path / "Item.xivm") as mirror:
+        assert mirror.version == "7.0" and len(mirror) == 250
+        assert mirror.get(0).fields["Name"] == "Zero" and mirror.get(1) is None and mirror.get(300).fields["Name"] == "New"
+        assert mirror.get(2).fields["Name"] == "Row 2"
+    with pytest.raises(CustomError):
+        delta.apply(tmp_path / "Item.xivm")
+
+def test_sync_cli(fake_server, tmp_path, capsys):
+    out, mirrors = tmp_path / "sync", tmp_path / "mirrors"
+    assert main(["sync", "Item", "Mount", "-o", str(out), "--mirrors", str(mirrors), "--version", "6.5", "-q"]) == 0
+    with Mirror(mirrors / "Item.xivm") as mirror:
+        assert (mirror.version, len(mirror)) == ("6.5", 250)
+
+    fake_server.patches["7.0"] = { "Mount": { 5: { "Name": "Changed" } } }
+    assert main(["sync", "Item", "Mount", "-o", str(out), "--mirrors", str(mirrors), "-q"]) == 0
+    assert [path.name for path in (out / "7.0").iterdir()] == ["Mount.jsonl"]
+    with Mirror(mirrors / "Mount.xivm") as mirror:
+        assert mirror.version == "7.0" and mirror.get(5).fields["Name"] == "Changed"
+    assert "Mount: +0 ~1 -0 (249 unchanged)" in capsys.readouterr().err
@@ -0,0 +1,18 @@
+import json
+import pyxivapi.utils
+from pyxivapi import XIVAPI
+from pyxivapi.testing import FakeXIVAPI
+
+def test_serve():
+    recorded = json.dumps({ "schema": "recorded", "row_id": 7, "fields": { "Name": "Recorded" } }).encode()
+    server = FakeXIVAPI(sheets={ "Item": 1200 }, row_size=64, recordings={ "/sheet/Item/7": (200, "application/json", recorded) })
+    endpoint = pyxivapi.utils.endpoint
+    with server.serve():
+        assert pyxivapi.utils.endpoint == server.endpoint
+        with XIVAPI() as client:
+            rows = list(client.sheets().iter_rows("Item", page_size=500))
+            row = client.items.get(7)
+    assert pyxivapi.utils.endpoint == endpoint
+    assert len(rows) == 1200 and len(rows[0].fields["Description"]) == 64
+    assert row.fields == { "Name": "Recorded" }
+    assert len(server.requests) == 5
@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+from pyxivapi import XIVAPI, AsyncXIVAPI, CustomError
+from pyxivapi.lib.session import Session, AsyncSession, Http2Session
+from pyxivapi.lib.transports import MockSession, AsyncMockSession, RecordingSession, AsyncRecordingSession
+
+def test_mock_session():
+    session = MockSession({
+        "/api/sheet/Item/1": { "schema": "mock", "row_id": 1, "fields": { "Name": "Mocked" } },
+        "/api/asset": lambda url: (200, { "Content-Type": "image/png" }, b"\x89PNG mocked"),
+    })
+    with XIVAPI(session=session) as client:
+        assert client.items.get(1).fields == { "Name": "Mocked" }
+        assert client.assets().get({ "path": "ui/icon/000000/000001.tex", "format": "png" }) == b"\x89PNG mocked"
+        with pytest.raises(CustomError):
+            client.items.get(2)
+    assert len(session.requests) == 3
+
+def test_record_and_replay(fake_server, tmp_path):
+    cassette = str(tmp_path / "cassette.jsonl")
+    asset = { "path": "ui/icon/000000/000001.tex", "format": "png" }
+    with XIVAPI(session=RecordingSession(Session(), cassette)) as client:
+        recorded = (client.items.get(3), client.sheets().list("Action", { "limit": 5 }), client.assets().get(asset), client.versions())
+    requests = len(fake_server.requests)
+
+    with XIVAPI(session=MockSession.replay(cassette)) as client:
+        replayed = (client.items.get(3), client.sheets().list("Action", { "limit": 5 }), client.assets().get(asset), client.versions())
+        with pytest.raises(CustomError, match="No response recorded"):
+            client.items.get(4)
+    assert replayed == recorded
+    assert len(fake_server.requests) == requests
+
+def test_recording_session_closes_cassette(tmp_path):
+    cassette = tmp_path / "cassette.jsonl"
+    with RecordingSession(MockSession({ "/api/version": { "versions": [] } }), str(cassette)) as session:
+        assert not cassette.exists()
+        session.get("https://v2.xivapi.com/api/version")
+        assert session._file is not None
+    assert session._file is None and session.closed
+    assert len(cassette.read_text().splitlines()) == 1
+
+def test_async_record_and_replay(fake_server, tmp_path):
+    pytest.importorskip("httpx")
+    cassette = str(tmp_path / "cassette.jsonl")
+    target = tmp_path / "icon.png"
+
+    async def main(session):
+        async with AsyncXIVAPI(session=session) as client:
+            row = await client.items.get(3)
+            size = await client.assets().download({ "path": "ui/icon/000000/000001.tex", "format": "png" }, str(target))
+            return row, size
+
+    recorded = asyncio.run(main(AsyncRecordingSession(AsyncSession(), cassette)))
+    assert asyncio.run(main(AsyncMockSession.replay(cassette))) == recorded
+    assert target.read_bytes().startswith(b"\x89PNG")
+
+def test_transport_option(fake_server):
+    with pytest.raises(ValueError):
+        XIVAPI(transport="http3")
+    pytest.importorskip("h2")
+    with XIVAPI(transport="http2") as client:
+        assert isinstance(client.session, Http2Session)
+        assert sorted(row.row_id for row in client.items.get_many(range(20), batch_size=1).rows) == list(range(20))